@@ -9,6 +9,7 @@ LOG_DIR = BASE_DIR / "log"
 VIDEO_LINKS_FILE = DATA_DIR / "hearing_video_links.json"
 MINUTES_LINKS_FILE = DATA_DIR / "voting_minutes_links.json"
 URL_EXCLUDE_LIST_FILE = DATA_DIR / "url_exclude_list.json"
+DOWNLOAD_MANIFEST_FILE = DATA_DIR / "download_manifest.json"
 STATS_LOG_FILE = DATA_DIR / "link_stats_log.csv"
 DOWNLOAD_DIR = DATA_DIR / "voting_minutes_pdfs"
 EXCEPTION_PDFS = DATA_DIR / "exception_pdfs"
@@ -20,3 +21,17 @@ BASE_URL = "https://www.boston.gov"
 
 # Defaults
 DEFAULT_TIMEOUT = 30
+
+# Downloading
+DOWNLOAD_WORKERS = 4  # concurrent downloads
+PER_HOST_CONCURRENCY = 2  # requests in flight per host
+POLITENESS_DELAY = 0.25  # seconds between request starts to one host
+
+# Archive crawling (--crawl-archives)
+ARCHIVE_URLS = [TARGET_URL]  # index pages the crawl starts from
+# Links matching this are archive pages to crawl (not minutes links)
+ARCHIVE_PAGE_PATTERN = r"^https?://www\.boston\.gov/departments/licensing-board/(?!.*\.pdf$).*(?:archive|minutes|(?:19|20)\d{2})"
+ARCHIVE_MAX_DEPTH = 2  # links followed away from the start pages
+ARCHIVE_MAX_PAGES = 100
+ARCHIVE_WORKERS = 4  # concurrent page fetches
+ARCHIVE_CACHE_DIR = DATA_DIR / "archive_pages"
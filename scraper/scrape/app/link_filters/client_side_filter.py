@@ -3,10 +3,8 @@ class ClientSideFilter:
 
     LOCAL_PREFIXES = ("tel:", "mailto:", "#", "javascript:")
 
+    def keep(self, link: dict) -> bool:
+        return not link.get("href", "").lower().startswith(self.LOCAL_PREFIXES)
+
     def process(self, links: list[dict]) -> list[dict]:
-        cleaned = []
-        for link in links:
-            href = link.get("href", "").lower()
-            if not href.startswith(self.LOCAL_PREFIXES):
-                cleaned.append(link)
-        return cleaned
+        return [link for link in links if self.keep(link)]
@@ -1,37 +1,43 @@
-import json
 from pathlib import Path
 
+from app.storage.json_store import JsonStore
+
 
 class ExcludeListFilter:
-    """Filters out links present in an exclude list."""
+    """
+    Filters out links present in an exclude list.
+
+    URLs added with add_url() are excluded immediately but only written to
+    the file by flush(), so a run rewrites the list once, not once per URL.
+    """
 
-    def __init__(self, exclude_file_path: Path):
+    def __init__(self, exclude_file_path: Path, json_io: JsonStore | None = None):
         self.exclude_file_path = exclude_file_path
-        self.exclude_items = self._load()
+        self.json_io = json_io or JsonStore()
+        self._saved = self._load()  # file order, new URLs are appended
+        self.exclude_items = set(self._saved)
+        self._pending: list[str] = []
 
-    def _load(self) -> set:
-        if not self.exclude_file_path.exists():
-            return set()
+    def _load(self) -> list:
+        data = self.json_io.load(self.exclude_file_path)
+        return list(dict.fromkeys(data)) if isinstance(data, list) else []
 
-        try:
-            with open(self.exclude_file_path, encoding="utf-8") as f:
-                data = json.load(f)
-                return set(data) if isinstance(data, list) else set()
-        except json.JSONDecodeError:
-            return set()
+    def keep(self, link: dict) -> bool:
+        return link.get("href", "") not in self.exclude_items
 
     def process(self, links: list[dict]) -> list[dict]:
-        return [
-            link for link in links if link.get("href", "") not in self.exclude_items
-        ]
+        return [link for link in links if self.keep(link)]
 
     def add_url(self, url: str):
-        """Adds a URL to the exclude list and saves it."""
+        """Adds a URL to the exclude list; call flush() to save it."""
         if url not in self.exclude_items:
             self.exclude_items.add(url)
-            self._save()
-
-    def _save(self):
-        self.exclude_file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.exclude_file_path, "w", encoding="utf-8") as f:
-            json.dump(list(self.exclude_items), f, indent=4)
+            self._pending.append(url)
+
+    def flush(self):
+        """Saves the URLs added since the last flush, if any."""
+        if not self._pending:
+            return
+        self.json_io.save(self._saved + self._pending, self.exclude_file_path)
+        self._saved += self._pending
+        self._pending = []
@@ -11,20 +11,26 @@ class VideoLinkFilter:
     def __init__(self, json_io: JsonStore, file_path):
         self.json_io = json_io
         self.file_path = file_path
+        self.video_links: list[dict] = []
+
+    def keep(self, link: dict) -> bool:
+        """Set video links aside (saved by finalize()) and drop them."""
+        href = link.get("href", "").lower()
+        if "youtube.com" in href or "youtu.be" in href:
+            self.video_links.append(link)
+            return False
+        return True
+
+    def finalize(self):
+        """Save the video links collected by keep()."""
+        if self.video_links:
+            logger.info(
+                f"Saving {len(self.video_links)} video links to {self.file_path}..."
+            )
+            self.json_io.save(self.video_links, self.file_path)
 
     def process(self, links: list[dict]) -> list[dict]:
-        video_links = []
-        other_links = []
-
-        for link in links:
-            href = link.get("href", "").lower()
-            if "youtube.com" in href or "youtu.be" in href:
-                video_links.append(link)
-            else:
-                other_links.append(link)
-
-        if video_links:
-            logger.info(f"Saving {len(video_links)} video links to {self.file_path}...")
-            self.json_io.save(video_links, self.file_path)
-
+        self.video_links = []
+        other_links = [link for link in links if self.keep(link)]
+        self.finalize()
         return other_links
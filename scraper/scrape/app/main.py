@@ -19,6 +19,17 @@ def main():
         default=const.DOWNLOAD_DIR,
         help=f"Directory to download PDFs to (default: {const.DOWNLOAD_DIR})",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=const.DOWNLOAD_WORKERS,
+        help=f"Concurrent PDF downloads (default: {const.DOWNLOAD_WORKERS})",
+    )
+    parser.add_argument(
+        "--crawl-archives",
+        action="store_true",
+        help="Also collect minutes links from the Licensing Board archive pages",
+    )
     args = parser.parse_args()
 
     logger = setup_logging(__name__)
@@ -35,13 +46,15 @@ def main():
         scraper.add_filter(VideoLinkFilter(JsonStore(), const.VIDEO_LINKS_FILE))
 
         # Execute
-        scraper.run()
+        scraper.run(crawl_archives=args.crawl_archives)
 
         # 2. Run Downloader
         logger.info(
             f"Initializing Downloader Service with download_dir: {args.download_dir}"
         )
-        downloader = DownloaderService(download_dir=args.download_dir)
+        downloader = DownloaderService(
+            download_dir=args.download_dir, workers=args.workers
+        )
         downloader.run()
 
         logger.info("Application finished successfully.")
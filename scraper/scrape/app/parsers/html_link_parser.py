@@ -1,4 +1,185 @@
-from bs4 import BeautifulSoup
+import html.entities
+import re
+from collections import deque
+from collections.abc import Callable, Iterator
+from html.parser import HTMLParser
+
+# Elements that never have content (closed as soon as they open), as in
+# BeautifulSoup's html.parser tree builder.
+VOID_ELEMENTS = frozenset(
+    [
+        "area", "base", "basefont", "bgsound", "br", "col", "command", "embed",
+        "frame", "hr", "image", "img", "input", "isindex", "keygen", "link",
+        "menuitem", "meta", "nextid", "param", "source", "spacer", "track", "wbr",
+    ]
+)  # fmt: skip
+# Text inside these is not part of a link's text (BeautifulSoup stores it as
+# Script / Stylesheet / TemplateString / Ruby strings, which get_text skips).
+STRING_CONTAINERS = frozenset(["script", "style", "template", "rt", "rp"])
+
+# How much of the document is fed to the parser between yields
+FEED_CHUNK_SIZE = 64 * 1024
+
+_DECIMAL_REF_RE = re.compile("^([0-9]+)(.*)")
+_HEX_REF_RE = re.compile("^([0-9a-f]+)(.*)")
+
+
+def _numeric_reference(name: str) -> str:
+    """Decode the body of a &#...; reference the way BeautifulSoup does
+    (HTML spec numeric character reference rules)."""
+    base, pattern = 10, _DECIMAL_REF_RE
+    if name[:1] in ("x", "X"):
+        name, base, pattern = name[1:], 16, _HEX_REF_RE
+    extra = ""
+    try:
+        number = int(name, base)
+    except ValueError:
+        match = pattern.search(name)
+        if match is None:
+            return name
+        number, extra = int(match.group(1), base), match.group(2)
+
+    if number == 0 or number > 0x10FFFF or 0xD800 <= number <= 0xDFFF:
+        return "�" + extra
+    if 0x80 <= number <= 0x9F:
+        # Windows-1252 bytes mistakenly written as code points
+        try:
+            return bytes([number]).decode("cp1252") + extra
+        except UnicodeDecodeError:
+            pass
+    return chr(number) + extra
+
+
+class _Link:
+    __slots__ = ("href", "parts", "closed")
+
+    def __init__(self, href: str):
+        self.href = href
+        self.parts: list[str] = []
+        self.closed = False
+
+
+class _LinkCollector(HTMLParser):
+    """
+    Collects <a href> links and their text in one pass, matching
+    BeautifulSoup(html, "html.parser").find_all("a", href=True) with
+    get_text(strip=True): nested links, implicitly closed tags, entities and
+    which strings count as text all follow BeautifulSoup's rules.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        # Open elements: (tag, link or None)
+        self._stack: list[tuple[str, _Link | None]] = []
+        self._open_links: list[_Link] = []
+        self._containers = 0  # open STRING_CONTAINERS elements
+        self._text: list[str] = []
+        # Void elements opened as <br>; a later </br> is dropped, not a
+        # tag boundary.
+        self._closed_voids: list[str] = []
+        # Links not handed out yet, in document (start tag) order
+        self._pending: deque[_Link] = deque()
+        # HTMLParser gave up on a "&#" that isn't a character reference and
+        # stopped this pass; see HtmlLinkParser.iter_links.
+        self.stalled = False
+
+    def finished_links(self) -> Iterator[_Link]:
+        """Hand out the links whose text is complete, in document order."""
+        while self._pending and self._pending[0].closed:
+            yield self._pending.popleft()
+
+    def _end_string(self, include: bool | None = None) -> None:
+        """Finish the current string; like BeautifulSoup, each string is
+        stripped on its own and the pieces are concatenated."""
+        if not self._text:
+            return
+        text = "".join(self._text)
+        self._text = []
+        if include is None:
+            include = self._containers == 0
+        stripped = text.strip()
+        if include and stripped:
+            for link in self._open_links:
+                link.parts.append(stripped)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, explicit_end=True)
+        self._close(tag)
+
+    def handle_starttag(self, tag, attrs, explicit_end=False):
+        self._end_string()
+        if tag in VOID_ELEMENTS:
+            if not explicit_end:
+                self._closed_voids.append(tag)
+            return
+        link = None
+        if tag == "a":
+            href = None
+            for key, value in attrs:
+                if key == "href":
+                    href = "" if value is None else value  # last one wins
+            if href is not None:
+                link = _Link(href)
+                self._pending.append(link)
+                self._open_links.append(link)
+        if tag in STRING_CONTAINERS:
+            self._containers += 1
+        self._stack.append((tag, link))
+
+    def handle_endtag(self, tag):
+        if tag in self._closed_voids:
+            self._closed_voids.remove(tag)
+        else:
+            self._close(tag)
+
+    def _close(self, tag):
+        self._end_string()
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                break
+        else:
+            return  # nothing to close
+        for name, link in self._stack[i:]:
+            if name in STRING_CONTAINERS:
+                self._containers -= 1
+            if link is not None:
+                link.closed = True
+                self._open_links.remove(link)
+        del self._stack[i:]
+
+    def handle_data(self, data):
+        if data == "&#" and self.cdata_elem is None:
+            # Outside <script>/<style>, HTMLParser splits text at "&", so
+            # this is the "&#" it consumed before stopping the pass.
+            self.stalled = True
+        self._text.append(data)
+
+    def handle_entityref(self, name):
+        self._text.append(html.entities.html5.get(name + ";", "&" + name))
+
+    def handle_charref(self, name):
+        self._text.append(_numeric_reference(name))
+
+    def unknown_decl(self, data):
+        self._end_string()
+        if data.upper().startswith("CDATA["):
+            self._text.append(data[len("CDATA[") :])
+            self._end_string(include=True)  # CDATA always counts as text
+
+    def handle_comment(self, data):
+        self._end_string()
+
+    def handle_decl(self, decl):
+        self._end_string()
+
+    def handle_pi(self, data):
+        self._end_string()
+
+    def close(self):
+        super().close()
+        self._end_string()
+        for link in self._open_links:
+            link.closed = True
 
 
 class HtmlLinkParser:
@@ -6,18 +187,44 @@ class HtmlLinkParser:
     Extracts raw links from HTML content.
     """
 
+    def __init__(self, chunk_size: int = FEED_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
     def extract_links(self, html_content: str) -> list[dict]:
         """
         Parses HTML and returns a list of dicts with 'href' and 'body'.
         """
-        soup = BeautifulSoup(html_content, "html.parser")
-        links_data = []
+        return list(self.iter_links(html_content))
 
-        links = soup.find_all("a", href=True)
+    def iter_links(
+        self, html_content: str, keep: Callable[[dict], bool] | None = None
+    ) -> Iterator[dict]:
+        """
+        Yields {'href', 'body'} dicts in document order from a single parse,
+        without building a document tree. If `keep` is given, each link is
+        passed to it once and only links it returns True for are yielded.
 
-        for link in links:
-            href = link["href"]
-            body = link.get_text(strip=True)
-            links_data.append({"href": href, "body": body})
+        The document is fed to the parser in chunks and each link is yielded
+        as soon as it (and every link before it) is closed. When HTMLParser
+        stalls on a dangling "&#", a one-piece feed leaves the rest of the
+        document to the final pass in close(), so the rest is handed to that
+        pass unparsed; the output matches a single feed exactly.
+        """
+        collector = _LinkCollector()
+        pos = 0
+        while pos < len(html_content) and not collector.stalled:
+            collector.feed(html_content[pos : pos + self.chunk_size])
+            pos += self.chunk_size
+            yield from self._drain(collector, keep)
+        collector.rawdata += html_content[pos:]
+        collector.close()
+        yield from self._drain(collector, keep)
 
-        return links_data
+    @staticmethod
+    def _drain(
+        collector: _LinkCollector, keep: Callable[[dict], bool] | None
+    ) -> Iterator[dict]:
+        for link in collector.finished_links():
+            item = {"href": link.href, "body": "".join(link.parts)}
+            if keep is None or keep(item):
+                yield item
@@ -0,0 +1,124 @@
+import logging
+import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urldefrag, urljoin
+
+import requests
+
+from app import constants as const
+from app.parsers.html_link_parser import HtmlLinkParser
+from app.storage.page_cache import PageCache
+from app.utils.http import HostLimiter, build_session
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveCrawler:
+    """
+    Follows the Licensing Board's archive/index pages (links matching
+    `page_pattern`) breadth first from a set of start pages, and yields every
+    other link it finds on them.
+
+    Pages are fetched `workers` at a time (politely, per host), each URL at
+    most once per run, and kept in a PageCache so unchanged archive pages
+    cost a 304 on the next run.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = const.ARCHIVE_CACHE_DIR,
+        page_pattern: str = const.ARCHIVE_PAGE_PATTERN,
+        max_depth: int = const.ARCHIVE_MAX_DEPTH,
+        max_pages: int = const.ARCHIVE_MAX_PAGES,
+        workers: int = const.ARCHIVE_WORKERS,
+        limiter: HostLimiter | None = None,
+        html_parser: HtmlLinkParser | None = None,
+    ):
+        self.cache = PageCache(cache_dir)
+        self.page_pattern = re.compile(page_pattern)
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.workers = max(1, workers)
+        self.session = build_session(self.workers)
+        self.limiter = limiter or HostLimiter()
+        self.html_parser = html_parser or HtmlLinkParser()
+        self.visited: set[str] = set()
+
+    def crawl(
+        self, start_urls: Iterable[str], pages: dict[str, str] | None = None
+    ) -> Iterator[dict]:
+        """
+        Yield {'href', 'body'} for the non-archive links on every page
+        reached, in breadth-first page order and document order within a
+        page. Relative hrefs are resolved against their page. `pages` maps
+        URLs to HTML the caller already has, which is used instead of
+        fetching them again.
+        """
+        pages = pages or {}
+        level = self._unvisited(start_urls)
+        depth = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while level:
+                results = executor.map(
+                    lambda url: pages[url] if url in pages else self._fetch(url),
+                    level,
+                )
+                next_level = []
+                for page_url, html in zip(level, results, strict=True):
+                    if html is None:
+                        continue
+                    for link in self.html_parser.iter_links(html):
+                        href = _resolve(page_url, link["href"])
+                        if self.page_pattern.search(urldefrag(href).url):
+                            if depth < self.max_depth:
+                                next_level.append(href)
+                        else:
+                            yield {"href": href, "body": link["body"]}
+                level = self._unvisited(next_level)
+                depth += 1
+        self.cache.save()
+        logger.info(f"Crawled {len(self.visited)} archive page(s).")
+
+    def _unvisited(self, urls: Iterable[str]) -> list[str]:
+        """Mark and return the URLs not seen yet, up to max_pages overall."""
+        new = []
+        for url in urls:
+            url = urldefrag(url).url
+            if url in self.visited:
+                continue
+            if len(self.visited) >= self.max_pages:
+                logger.warning(f"Archive crawl stopped at {self.max_pages} pages.")
+                break
+            self.visited.add(url)
+            new.append(url)
+        return new
+
+    def _fetch(self, url: str) -> str | None:
+        validators = self.cache.validators(url)
+        try:
+            with self.limiter.slot(url):
+                resp = self.session.get(
+                    url, headers=validators, timeout=const.DEFAULT_TIMEOUT
+                )
+            if resp.status_code == 304 and validators:
+                return self.cache.get(url)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            logger.error(f"Failed to fetch archive page {url}: {e}")
+            return None
+        self.cache.put(
+            url,
+            resp.text,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+        return resp.text
+
+
+def _resolve(page_url: str, href: str) -> str:
+    # In-page anchors stay as written so the client-side filter still sees them
+    if not href or href.startswith("#"):
+        return href
+    return urljoin(page_url, href)
@@ -1,38 +1,91 @@
+import hashlib
 import logging
+import os
 import shutil
-from io import BytesIO
+import tempfile
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 from urllib.parse import urljoin
 
-import pikepdf
 import requests
 
 from app import constants as const
 from app.link_filters.exclude_list_filter import ExcludeListFilter
+from app.storage.download_manifest import DownloadManifest
 from app.storage.json_store import JsonStore
-from app.storage.pdf_store import PdfStore
+from app.storage.pdf_store import TEMP_PREFIX, TEMP_SUFFIX, PdfStore
+from app.utils.http import HostLimiter, build_session
+from app.utils.pdf_validation import is_valid_pdf
 
 logger = logging.getLogger(__name__)
 
 
+CHUNK_SIZE = 64 * 1024
+
+
+class Download(NamedTuple):
+    """Outcome of fetching one link: the PDF streamed to a temp file (with
+    its SHA-256, size and the response's validators), `not_modified` on a
+    304, or `invalid` if the URL answered with something that isn't a PDF."""
+
+    temp_path: Path | None = None
+    sha256: str | None = None
+    size: int = 0
+    invalid: bool = False
+    not_modified: bool = False
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def _ordered_map(
+    executor: ThreadPoolExecutor,
+    fn: Callable,
+    items: Iterable,
+    window: int,
+) -> Iterator:
+    """Like executor.map, but with at most `window` calls pending, so
+    finished downloads don't pile up behind a slow one."""
+    pending: deque = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
 class DownloaderService:
     """Orchestrates the downloading of voting minute PDFs."""
 
-    def __init__(self, download_dir: Path | str | None = None):
+    def __init__(
+        self,
+        download_dir: Path | str | None = None,
+        workers: int = const.DOWNLOAD_WORKERS,
+        limiter: HostLimiter | None = None,
+    ):
         self.storage = JsonStore()
         self.download_dir = Path(download_dir) if download_dir else const.DOWNLOAD_DIR
         self.pdf_repo = PdfStore(self.download_dir)
         # We use the exclude filter here primarily to ADD bad URLs
         self.exclude_filter = ExcludeListFilter(const.URL_EXCLUDE_LIST_FILE)
+        self.manifest = DownloadManifest(const.DOWNLOAD_MANIFEST_FILE)
+        self.workers = max(1, workers)
+        self.session = build_session(self.workers)
+        self.limiter = limiter or HostLimiter()
 
     def run(self):
         logger.info("Starting download process...")
+        self.pdf_repo.remove_stale_temp_files()
         links = self.storage.load(const.MINUTES_LINKS_FILE)
 
         if not links:
             logger.warning(f"No links found in {const.MINUTES_LINKS_FILE}")
             return
 
+        items = []
         for item in links:
             href = item.get("href")
             date_str = item.get("date")
@@ -44,31 +97,104 @@ class DownloaderService:
             if href in self.exclude_filter.exclude_items:
                 continue
 
-            content = self._download_pdf(href)
-            if content:
-                self.pdf_repo.save_pdf(content, date_str)
+            validators = self.manifest.validators(href, date_str, self.download_dir)
+            items.append((href, date_str, validators))
+
+        # Fetch concurrently, but save and update the exclude list here, in
+        # link order, exactly as a serial run would. Whatever was done is
+        # written out even if the run fails part way.
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = _ordered_map(
+                    executor,
+                    lambda item: self._download_pdf(item[0], item[2]),
+                    items,
+                    window=self.workers * 4,
+                )
+                for (href, date_str, _), download in zip(items, results, strict=True):
+                    if download.invalid:
+                        self.exclude_filter.add_url(href)
+                    elif download.not_modified:
+                        logger.info(f"Not modified - {self.manifest.get(href)['file']}")
+                    elif download.temp_path:
+                        path = self.pdf_repo.save_pdf_file(
+                            download.temp_path, date_str, download.sha256
+                        )
+                        self.manifest.record(
+                            href,
+                            {
+                                "date": date_str,
+                                "etag": download.etag,
+                                "last_modified": download.last_modified,
+                                "content_length": download.size,
+                                "file": path.name,
+                                "sha256": download.sha256,
+                            },
+                        )
+        finally:
+            self.exclude_filter.flush()
+            self.manifest.save()
+            self.pdf_repo.flush()
+
+        logger.info(f"{len(self.pdf_repo.saved)} new PDF(s) saved.")
 
         self._copy_exception_pdfs(const.EXCEPTION_PDFS, self.download_dir)
 
         logger.info("Download process completed.")
 
-    def _download_pdf(self, href: str) -> bytes | None:
+    def _download_pdf(self, href: str, validators: dict | None = None) -> Download:
+        """Stream `href` to a temp file in the download directory, hashing as
+        it goes; `validators` are conditional request headers from the
+        download manifest."""
         url = self._prepare_url(href)
+        temp_path = None
         try:
-            resp = requests.get(url, timeout=const.DEFAULT_TIMEOUT)
-            resp.raise_for_status()
-            content = resp.content
-
-            if self._is_valid_pdf(content):
-                return content
+            # The slot is held until the body is read, so PER_HOST_CONCURRENCY
+            # bounds whole transfers, not just the requests.
+            with self.limiter.slot(url):
+                resp = self.session.get(
+                    url,
+                    headers=validators,
+                    timeout=const.DEFAULT_TIMEOUT,
+                    stream=True,
+                )
+                with resp:
+                    if resp.status_code == 304 and validators:
+                        return Download(not_modified=True)
+                    resp.raise_for_status()
+
+                    fd, name = tempfile.mkstemp(
+                        dir=self.download_dir, prefix=TEMP_PREFIX, suffix=TEMP_SUFFIX
+                    )
+                    temp_path = Path(name)
+                    h = hashlib.sha256()
+                    size = 0
+                    with os.fdopen(fd, "wb") as f:
+                        for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                            f.write(chunk)
+                            h.update(chunk)
+                            size += len(chunk)
+
+            if self._is_valid_pdf(temp_path):
+                download = Download(
+                    temp_path=temp_path,
+                    sha256=h.hexdigest(),
+                    size=size,
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                )
+                temp_path = None  # now owned by the caller
+                return download
             else:
                 logger.warning(f"Invalid PDF at {url}. Adding to exclude list.")
-                self.exclude_filter.add_url(href)
-                return None
+                return Download(invalid=True)
 
-        except requests.RequestException as e:
+        except (requests.RequestException, OSError) as e:
             logger.error(f"Failed to download {url}: {e}")
-            return None
+            return Download()
+        finally:
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
 
     def _prepare_url(self, href: str) -> str:
         if "drive.google.com" in href and "/file/d/" in href:
@@ -76,12 +202,8 @@ class DownloaderService:
             return f"https://drive.google.com/uc?export=download&id={file_id}"
         return urljoin(const.BASE_URL, href)
 
-    def _is_valid_pdf(self, content: bytes) -> bool:
-        try:
-            with pikepdf.open(BytesIO(content)):
-                return True
-        except pikepdf.PdfError:
-            return False
+    def _is_valid_pdf(self, path: Path) -> bool:
+        return is_valid_pdf(path)
 
     def _copy_exception_pdfs(self, source_dir: str, destination_dir: str) -> int:
         """
@@ -1,30 +1,44 @@
 import logging
+from typing import Protocol
+from urllib.parse import urljoin
 
 import requests
 
 from app import constants as const
 from app.parsers.date_parser import DateParser
 from app.parsers.html_link_parser import HtmlLinkParser
+from app.services.archive_crawler import ArchiveCrawler
 from app.storage.json_store import JsonStore
 from app.storage.stats_logger import StatsLogger
 
 logger = logging.getLogger(__name__)
 
 
+class LinkFilter(Protocol):
+    def keep(self, link: dict) -> bool: ...
+
+
 class ScraperService:
     """Orchestrates the scraping of licensing board links."""
 
-    def __init__(self):
+    def __init__(self, archive_crawler: ArchiveCrawler | None = None):
         self.html_parser = HtmlLinkParser()
+        self.archive_crawler = archive_crawler
         self.date_parser = DateParser()
         self.json_io = JsonStore()
         self.stats_logger = StatsLogger(const.STATS_LOG_FILE)
-        self.filters = []  # List of filters with .process()
+        self.filters: list[LinkFilter] = []
 
-    def add_filter(self, filter_obj):
+    def add_filter(self, filter_obj: LinkFilter):
         self.filters.append(filter_obj)
 
-    def run(self):
+    def run(self, crawl_archives: bool = False):
+        """
+        Scrape the minutes links from the Licensing Board page. With
+        crawl_archives, links found on the archive pages (const.ARCHIVE_URLS
+        and the archive pages they lead to) go through the same filters,
+        skipping any already seen.
+        """
         logger.info(f"Fetching {const.TARGET_URL}...")
         # 1. Fetch HTML and extract all links
         try:
@@ -34,18 +48,46 @@ class ScraperService:
             return
 
         logger.info("Parsing links...")
-        links = self.html_parser.extract_links(html)
+        # 2. Apply filters (e.g. ClientSide, ExcludeList, VideoLink) to each
+        # link as it is parsed; a link stops at the first filter rejecting it.
+        total_links = 0
+        removed = [0] * len(self.filters)
+        seen = set()  # absolute URLs of every link parsed
+
+        def keep(link: dict) -> bool:
+            nonlocal total_links
+            total_links += 1
+            seen.add(urljoin(const.BASE_URL, link["href"]))
+            for i, f in enumerate(self.filters):
+                if not f.keep(link):
+                    removed[i] += 1
+                    return False
+            return True
+
+        minutes_links = list(self.html_parser.iter_links(html, keep))
+
+        if crawl_archives:
+            logger.info("Crawling archive pages...")
+            crawler = self.archive_crawler or ArchiveCrawler(
+                html_parser=self.html_parser
+            )
+            for link in crawler.crawl(
+                const.ARCHIVE_URLS, pages={const.TARGET_URL: html}
+            ):
+                if urljoin(const.BASE_URL, link["href"]) in seen:
+                    continue
+                if keep(link):
+                    minutes_links.append(link)
 
-        stats = {"total_links": len(links)}
-
-        # 2. Apply filters sequentially (e.g. ClientSide, ExcludeList, VideoLink)
-        filtered_links = links
         for f in self.filters:
-            prev_len = len(filtered_links)
-            filtered_links = f.process(filtered_links)
+            finalize = getattr(f, "finalize", None)
+            if finalize is not None:
+                finalize()
+
+        stats = {"total_links": total_links}
+        for f, removed_count in zip(self.filters, removed, strict=True):
             # Rough logic to attribute stats to the filter class name
             filter_name = f.__class__.__name__
-            removed_count = prev_len - len(filtered_links)
             # This mapping mirrors the old script's specific stat keys for compatibility
             if "ClientSide" in filter_name:
                 stats["client_side_links"] = removed_count
@@ -54,7 +96,6 @@ class ScraperService:
             elif "Video" in filter_name:
                 stats["video_links"] = removed_count
 
-        minutes_links = filtered_links
         stats["minutes_links"] = len(minutes_links)
 
         # 3. Extract dates from minutes links and save to JSON
@@ -0,0 +1,50 @@
+import logging
+from pathlib import Path
+
+from app.storage.json_store import JsonStore
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadManifest:
+    """
+    Per-URL record of the last successful download: the server's validators
+    (ETag, Last-Modified), the content length, and the file and SHA-256 it
+    was saved as. Lets the downloader send conditional requests, so an
+    unchanged PDF costs a 304 instead of a full download.
+    """
+
+    def __init__(self, path: Path, json_io: JsonStore | None = None):
+        self.path = path
+        self.json_io = json_io or JsonStore()
+        data = self.json_io.load(path)
+        self.entries: dict[str, dict] = data if isinstance(data, dict) else {}
+        self._dirty = False
+
+    def validators(self, href: str, date_str: str, download_dir: Path) -> dict:
+        """Conditional request headers for `href`, or {} if there is no usable
+        entry (different date, file no longer on disk, no validators)."""
+        entry = self.entries.get(href)
+        if not entry or entry.get("date") != date_str:
+            return {}
+        if not (download_dir / entry.get("file", "")).is_file():
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get(self, href: str) -> dict | None:
+        return self.entries.get(href)
+
+    def record(self, href: str, entry: dict) -> None:
+        if self.entries.get(href) != entry:
+            self.entries[href] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        if self._dirty:
+            self.json_io.save(self.entries, self.path)
+            self._dirty = False
@@ -1,5 +1,7 @@
 import json
 import logging
+import os
+import tempfile
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -9,14 +11,21 @@ class JsonStore:
     """Handles JSON file I/O."""
 
     def save(self, data: list | dict, path: Path):
-        """Saves data to a JSON file."""
+        """Saves data to a JSON file. The file is written to a temp file and
+        renamed into place, so a failed write never leaves it truncated."""
         path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
         try:
-            with open(path, "w", encoding="utf-8") as f:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=4)
+            # mkstemp creates the file 0600; keep it readable like open() would
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
             logger.info(f"Saved data to {path}")
         except OSError as e:
             logger.error(f"Failed to save {path}: {e}")
+        finally:
+            Path(tmp_path).unlink(missing_ok=True)
 
     def load(self, path: Path) -> list:
         """Loads data from a JSON file. Returns empty list if missing."""
@@ -0,0 +1,75 @@
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from app.storage.json_store import JsonStore
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "index.json"
+
+
+class PageCache:
+    """
+    On-disk copy of fetched HTML pages, with the validators (ETag,
+    Last-Modified) they were served with, so a page can be re-requested
+    conditionally and a 304 answered from disk.
+    """
+
+    def __init__(self, cache_dir: Path, json_io: JsonStore | None = None):
+        self.cache_dir = Path(cache_dir)
+        self.json_io = json_io or JsonStore()
+        data = self.json_io.load(self.cache_dir / INDEX_NAME)
+        self.entries: dict[str, dict] = data if isinstance(data, dict) else {}
+        self._dirty = False
+
+    def validators(self, url: str) -> dict:
+        """Conditional request headers for `url`, or {} if it isn't cached."""
+        entry = self.entries.get(url)
+        if not entry or not (self.cache_dir / entry["file"]).is_file():
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get(self, url: str) -> str | None:
+        entry = self.entries.get(url)
+        if not entry:
+            return None
+        try:
+            return (self.cache_dir / entry["file"]).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def put(
+        self,
+        url: str,
+        html: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()[:24] + ".html"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(html)
+            os.replace(tmp_path, self.cache_dir / name)
+        except OSError as e:
+            logger.warning(f"Failed to cache {url}: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+            return
+        entry = {"file": name, "etag": etag, "last_modified": last_modified}
+        if self.entries.get(url) != entry:
+            self.entries[url] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        if self._dirty:
+            self.json_io.save(self.entries, self.cache_dir / INDEX_NAME)
+            self._dirty = False
@@ -1,63 +1,163 @@
 import hashlib
 import logging
+import os
+import tempfile
 from pathlib import Path
 
+from app.storage.json_store import JsonStore
+
 logger = logging.getLogger(__name__)
 
+MANIFEST_NAME = "pdf_manifest.json"
+# In-progress downloads live next to the PDFs so they can be renamed in.
+TEMP_PREFIX = ".download-"
+TEMP_SUFFIX = ".part"
+
 
 class PdfStore:
-    """Handles saving PDF content with versioning and deduplication."""
+    """
+    Handles saving PDF content with versioning and deduplication.
+
+    Hashes of the stored files are kept in a manifest next to them
+    (date -> versions with sha256 and size). A manifest entry is trusted
+    while the file's size still matches, so deduplication doesn't re-read
+    every version on every save. Stored files are only ever renamed into
+    place, never edited, and mtimes don't survive a git checkout, so the
+    size is the check. Files the manifest doesn't know about (or whose size
+    changed) are hashed and recorded.
+    """
 
-    def __init__(self, download_dir: Path):
+    def __init__(self, download_dir: Path, json_io: JsonStore | None = None):
         self.download_dir = download_dir
         self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.json_io = json_io or JsonStore()
+        self.manifest_path = self.download_dir / MANIFEST_NAME
+        self._entries = self._load_manifest()
+        self._dirty = False
+        # Files written by this PdfStore (i.e. new content), in save order.
+        self.saved: list[Path] = []
 
     def save_pdf(self, content: bytes, date_str: str) -> Path:
         """
         Saves PDF content. Creates versioned filename if content differs
         from existing file for that date.
         """
-        base_name = f"voting_minutes_{date_str}.pdf"
-        base_path = self.download_dir / base_name
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.download_dir, prefix=TEMP_PREFIX, suffix=TEMP_SUFFIX
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+        except OSError as e:
+            logger.error(f"Failed to write PDF for {date_str}: {e}")
+            Path(tmp_name).unlink(missing_ok=True)
+            return self._version_path(date_str, 1)
+        return self.save_pdf_file(
+            Path(tmp_name), date_str, hashlib.sha256(content).hexdigest()
+        )
 
-        incoming_hash = hashlib.sha256(content).digest()
+    def save_pdf_file(self, temp_path: Path, date_str: str, sha256: str) -> Path:
+        """
+        Like save_pdf, for content already written to `temp_path` (in the
+        download directory) with its SHA-256 computed while streaming. The
+        file is renamed into place, so a stored PDF is never partially
+        written; if the content is already stored it is deleted.
+        """
+        index = 1
+        try:
+            while True:
+                candidate = self._version_path(date_str, index)
+                existing_hash = self._file_hash(candidate)
 
-        # Case 1: base file exists
-        if base_path.exists():
-            if self._calculate_hash(base_path) == incoming_hash:
-                logger.info(f"No change - {base_path.name} is up to date")
-                return base_path
+                if existing_hash is None:
+                    if self._move_into_place(temp_path, candidate):
+                        self._record(candidate, sha256)
+                        self.saved.append(candidate)
+                    return candidate
 
-        # Case 2: versioning
-        index = 1
-        while True:
-            candidate = (
-                base_path
-                if index == 1
-                else self.download_dir / f"voting_minutes_{date_str}_v{index}.pdf"
-            )
+                if existing_hash == sha256:
+                    if index == 1:
+                        logger.info(f"No change - {candidate.name} is up to date")
+                    else:
+                        logger.info(f"Duplicate content - matches {candidate.name}")
+                    return candidate
 
-            if not candidate.exists():
-                self._write_file(candidate, content)
-                return candidate
+                index += 1
+        finally:
+            temp_path.unlink(missing_ok=True)
 
-            if self._calculate_hash(candidate) == incoming_hash:
-                logger.info(f"Duplicate content - matches {candidate.name}")
-                return candidate
+    def remove_stale_temp_files(self) -> int:
+        """Delete partial downloads left behind by an interrupted run."""
+        stale = list(self.download_dir.glob(f"{TEMP_PREFIX}*{TEMP_SUFFIX}"))
+        for path in stale:
+            path.unlink(missing_ok=True)
+        return len(stale)
 
-            index += 1
+    def flush(self) -> None:
+        """Write the manifest if it changed."""
+        if not self._dirty:
+            return
+        by_date: dict[str, list[dict]] = {}
+        for entry in sorted(
+            self._entries.values(), key=lambda e: (e["date"], e["version"])
+        ):
+            by_date.setdefault(entry["date"], []).append(entry)
+        self.json_io.save(by_date, self.manifest_path)
+        self._dirty = False
 
-    def _write_file(self, path: Path, content: bytes):
+    def _version_path(self, date_str: str, index: int) -> Path:
+        if index == 1:
+            return self.download_dir / f"voting_minutes_{date_str}.pdf"
+        return self.download_dir / f"voting_minutes_{date_str}_v{index}.pdf"
+
+    def _file_hash(self, path: Path) -> str | None:
+        """SHA-256 of a stored file from the manifest if its size is
+        unchanged, otherwise from disk. None if the file doesn't exist."""
         try:
-            with path.open("wb") as f:
-                f.write(content)
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        entry = self._entries.get(path.name)
+        if entry and entry["size"] == st.st_size:
+            return entry["sha256"]
+        digest = self._calculate_hash(path)
+        self._record(path, digest)
+        return digest
+
+    def _record(self, path: Path, digest: str) -> None:
+        name = path.stem.removeprefix("voting_minutes_")
+        date_str, _, version = name.partition("_v")
+        self._entries[path.name] = {
+            "date": date_str,
+            "version": int(version) if version.isdigit() else 1,
+            "file": path.name,
+            "sha256": digest,
+            "size": path.stat().st_size,
+        }
+        self._dirty = True
+
+    def _load_manifest(self) -> dict[str, dict]:
+        data = self.json_io.load(self.manifest_path)
+        if not isinstance(data, dict):
+            return {}
+        return {
+            entry["file"]: entry for versions in data.values() for entry in versions
+        }
+
+    def _move_into_place(self, temp_path: Path, path: Path) -> bool:
+        try:
+            # mkstemp files are owner-only; stored PDFs are world-readable.
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
             logger.info(f"Saved {path.name}")
+            return True
         except OSError as e:
             logger.error(f"Failed to write PDF {path}: {e}")
+            return False
 
-    def _calculate_hash(self, path: Path) -> bytes:
+    def _calculate_hash(self, path: Path) -> str:
         h = hashlib.sha256()
         with path.open("rb") as f:
             while chunk := f.read(8192):
                 h.update(chunk)
-        return h.digest()
+        return h.hexdigest()
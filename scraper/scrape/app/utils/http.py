@@ -0,0 +1,55 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app import constants as const
+
+
+def build_session(pool_size: int = const.DOWNLOAD_WORKERS) -> requests.Session:
+    """A Session whose connection pool is large enough for `pool_size`
+    concurrent requests, so connections (and TLS handshakes) are reused."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class HostLimiter:
+    """
+    Per-host politeness for concurrent requests: at most `max_per_host`
+    requests in flight to one host, and at least `delay` seconds between the
+    starts of two requests to the same host.
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = const.PER_HOST_CONCURRENCY,
+        delay: float = const.POLITENESS_DELAY,
+    ):
+        self.max_per_host = max_per_host
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.Semaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.setdefault(
+                host, threading.Semaphore(self.max_per_host)
+            )
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
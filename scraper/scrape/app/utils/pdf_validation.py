@@ -0,0 +1,48 @@
+import logging
+import re
+from pathlib import Path
+
+import pikepdf
+
+logger = logging.getLogger(__name__)
+
+HEAD_BYTES = 1024  # the header may follow up to 1 KiB of junk
+TAIL_BYTES = 2048
+STARTXREF_RE = re.compile(rb"startxref\s+(\d+)\s+%%EOF")
+XREF_AT_OFFSET_RE = re.compile(rb"\s*(?:xref|\d+\s+\d+\s+obj)")
+
+
+def looks_like_pdf(path: Path) -> bool:
+    """
+    Cheap structural check that reads only the head and tail of the file:
+    a %PDF- header, and a trailing `startxref <offset> %%EOF` whose offset
+    lands on a cross-reference table or stream.
+    """
+    with path.open("rb") as f:
+        head = f.read(HEAD_BYTES)
+        if b"%PDF-" not in head:
+            return False
+        size = f.seek(0, 2)
+        f.seek(max(0, size - TAIL_BYTES))
+        matches = list(STARTXREF_RE.finditer(f.read()))
+        if not matches:
+            return False
+        offset = int(matches[-1].group(1))
+        if not 0 < offset < size:
+            return False
+        f.seek(offset)
+        return XREF_AT_OFFSET_RE.match(f.read(32)) is not None
+
+
+def is_valid_pdf(path: Path) -> bool:
+    """True if the file is a PDF. Files that pass looks_like_pdf are
+    accepted as-is; anything suspicious gets a full pikepdf open, which can
+    still recover damaged but usable files."""
+    if looks_like_pdf(path):
+        return True
+    try:
+        with pikepdf.open(path):
+            logger.info(f"{path.name} failed the quick check but opens with pikepdf")
+            return True
+    except pikepdf.PdfError:
+        return False
@@ -0,0 +1,9 @@
+import pytest
+
+from tests.fake_site import FakeSite, serve
+
+
+@pytest.fixture
+def fake_site():
+    with serve(FakeSite()) as site:
+        yield site
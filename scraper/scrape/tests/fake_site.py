@@ -0,0 +1,78 @@
+"""A local HTTP stand-in for boston.gov / Google Drive, used by the tests."""
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pikepdf
+
+
+class FakeSite:
+    """Routes path -> (status, headers, body) and records every request."""
+
+    def __init__(self):
+        self.routes: dict[str, tuple[int, dict, bytes]] = {}
+        self.requests: list[tuple[str, dict]] = []
+        # Paths whose body is sent in two halves, the second once the event
+        # is set
+        self.holds: dict[str, threading.Event] = {}
+        self.url = ""
+
+    def add(self, path: str, body: bytes, status: int = 200, headers=None):
+        self.routes[path] = (status, headers or {}, body)
+
+    def hits(self, path: str) -> int:
+        return sum(1 for p, _ in self.requests if p == path)
+
+    def respond(self, path: str, headers: dict) -> tuple[int, dict, bytes]:
+        status, response_headers, body = self.routes.get(path, (404, {}, b""))
+        etag = response_headers.get("ETag")
+        if status == 200 and etag and headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return status, response_headers, body
+
+
+@contextmanager
+def serve(site: FakeSite) -> Iterator[FakeSite]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802 (http.server API)
+            headers = dict(self.headers)
+            site.requests.append((self.path, headers))
+            status, response_headers, body = site.respond(self.path, headers)
+            self.send_response(status)
+            for key, value in response_headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            hold = site.holds.get(self.path)
+            if hold is not None:
+                self.wfile.write(body[: len(body) // 2])
+                self.wfile.flush()
+                hold.wait(timeout=10)
+                body = body[len(body) // 2 :]
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    site.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield site
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def make_pdf(text: str = "minutes") -> bytes:
+    """A small valid PDF whose bytes differ per `text`."""
+    pdf = pikepdf.new()
+    pdf.add_blank_page()
+    pdf.docinfo["/Title"] = text
+    buf = BytesIO()
+    pdf.save(buf, deterministic_id=True)
+    return buf.getvalue()
@@ -0,0 +1,116 @@
+"""Tests for app.services.archive_crawler.ArchiveCrawler."""
+
+import json
+
+import pytest
+
+from app import constants as const
+from app.link_filters.client_side_filter import ClientSideFilter
+from app.services.archive_crawler import ArchiveCrawler
+from app.services.scraper_service import ScraperService
+from app.utils.http import HostLimiter
+
+PATTERN = r"/archive/\d{4}(?:/[a-z]+)?$"
+
+BOARD = """<a href="/minutes/2025-01-09.pdf">Voting Minutes January 9, 2025</a>
+<a href="/archive/2019">2019 minutes</a> <a href="/archive/2020#list">2020</a>
+<a href="mailto:board@example.com">Email</a>"""
+ARCHIVE_2019 = """<a href="VM-3-14-19.pdf">March 14, 2019</a>
+<a href="/archive/2019/more">Older</a> <a href="/archive/2019">2019 again</a>
+<a href="/board">Back to the board</a> <a href="#top">Top</a>"""
+ARCHIVE_2019_MORE = """<a href="/files/January%2010%202019.pdf">Minutes</a>
+<a href="/archive/2018">2018</a>"""
+ARCHIVE_2020 = """<a href="https://drive.google.com/file/d/abc/view">February 6, 2020</a>
+<a href="/minutes/2025-01-09.pdf">Voting Minutes January 9, 2025</a>"""
+
+
+@pytest.fixture
+def site(fake_site):
+    fake_site.add("/board", BOARD.encode())
+    fake_site.add("/archive/2019", ARCHIVE_2019.encode(), headers={"ETag": '"a"'})
+    fake_site.add("/archive/2019/more", ARCHIVE_2019_MORE.encode())
+    fake_site.add("/archive/2020", ARCHIVE_2020.encode())
+    fake_site.add("/archive/2018", b"<a href='/files/2018.pdf'>2018</a>")
+    return fake_site
+
+
+def _crawler(tmp_path, **kwargs):
+    kwargs.setdefault("max_depth", 5)
+    return ArchiveCrawler(
+        cache_dir=tmp_path / "pages",
+        page_pattern=PATTERN,
+        workers=4,
+        limiter=HostLimiter(max_per_host=4, delay=0),
+        **kwargs,
+    )
+
+
+def test_crawl_follows_archive_pages_once_in_breadth_first_order(site, tmp_path):
+    url = site.url
+    links = list(_crawler(tmp_path).crawl([f"{url}/board"]))
+
+    assert [link["href"] for link in links] == [
+        f"{url}/minutes/2025-01-09.pdf",
+        "mailto:board@example.com",
+        f"{url}/archive/VM-3-14-19.pdf",
+        f"{url}/board",
+        "#top",
+        "https://drive.google.com/file/d/abc/view",
+        f"{url}/minutes/2025-01-09.pdf",
+        f"{url}/files/January%2010%202019.pdf",
+        f"{url}/files/2018.pdf",
+    ]
+    for path in ["/board", "/archive/2019", "/archive/2020", "/archive/2018"]:
+        assert site.hits(path) == 1
+
+
+def test_crawl_limits_depth_and_pages(site, tmp_path):
+    links = list(_crawler(tmp_path, max_depth=1).crawl([f"{site.url}/board"]))
+    assert site.hits("/archive/2019/more") == 0
+    assert f"{site.url}/archive/VM-3-14-19.pdf" in [link["href"] for link in links]
+
+    crawler = _crawler(tmp_path, max_pages=2)
+    list(crawler.crawl([f"{site.url}/board"]))
+    assert len(crawler.visited) == 2
+
+
+def test_cached_pages_are_requested_conditionally(site, tmp_path):
+    first = list(_crawler(tmp_path).crawl([f"{site.url}/board"]))
+    second = list(_crawler(tmp_path).crawl([f"{site.url}/board"]))
+
+    assert second == first
+    requests_2019 = [h for p, h in site.requests if p == "/archive/2019"]
+    assert "If-None-Match" not in requests_2019[0]
+    assert requests_2019[1]["If-None-Match"] == '"a"'
+
+
+def test_given_pages_are_not_fetched(site, tmp_path):
+    url = site.url
+    links = list(_crawler(tmp_path).crawl([f"{url}/board"], pages={f"{url}/board": ""}))
+    assert links == []
+    assert site.hits("/board") == 0
+
+
+def test_scraper_adds_unseen_archive_links(site, tmp_path, monkeypatch):
+    monkeypatch.setattr(const, "TARGET_URL", f"{site.url}/board")
+    monkeypatch.setattr(const, "BASE_URL", site.url)
+    monkeypatch.setattr(const, "ARCHIVE_URLS", [f"{site.url}/board"])
+    monkeypatch.setattr(const, "MINUTES_LINKS_FILE", tmp_path / "links.json")
+    monkeypatch.setattr(const, "STATS_LOG_FILE", tmp_path / "stats.csv")
+
+    scraper = ScraperService(archive_crawler=_crawler(tmp_path))
+    scraper.add_filter(ClientSideFilter())
+    scraper.run(crawl_archives=True)
+
+    saved = json.loads((tmp_path / "links.json").read_text(encoding="utf-8"))
+    assert [(link["href"], link["date"]) for link in saved] == [
+        ("/minutes/2025-01-09.pdf", "2025-01-09"),
+        ("/archive/2019", "yyyy-mm-dd"),
+        ("/archive/2020#list", "yyyy-mm-dd"),
+        (f"{site.url}/archive/VM-3-14-19.pdf", "2019-03-14"),
+        (f"{site.url}/board", "yyyy-mm-dd"),
+        ("https://drive.google.com/file/d/abc/view", "2020-02-06"),
+        (f"{site.url}/files/January%2010%202019.pdf", "2019-01-10"),
+        (f"{site.url}/files/2018.pdf", "yyyy-mm-dd"),
+    ]
+    assert site.hits("/board") == 1
@@ -0,0 +1,152 @@
+"""Tests for app.services.downloader_service.DownloaderService."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from app import constants as const
+from app.services.downloader_service import DownloaderService
+from app.utils.http import HostLimiter
+from tests.fake_site import make_pdf
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the service's data files at a temp dir."""
+    monkeypatch.setattr(const, "MINUTES_LINKS_FILE", tmp_path / "links.json")
+    monkeypatch.setattr(const, "URL_EXCLUDE_LIST_FILE", tmp_path / "exclude.json")
+    monkeypatch.setattr(const, "DOWNLOAD_MANIFEST_FILE", tmp_path / "manifest.json")
+    exceptions = tmp_path / "exception_pdfs"
+    exceptions.mkdir()
+    monkeypatch.setattr(const, "EXCEPTION_PDFS", exceptions)
+    return tmp_path
+
+
+def _write_links(data_dir, links):
+    (data_dir / "links.json").write_text(json.dumps(links), encoding="utf-8")
+
+
+def _run(data_dir, workers):
+    downloader = DownloaderService(
+        download_dir=data_dir / "pdfs",
+        workers=workers,
+        limiter=HostLimiter(max_per_host=workers, delay=0),
+    )
+    downloader.run()
+    return downloader
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_downloads_save_and_exclude_like_a_serial_run(fake_site, data_dir, workers):
+    fake_site.add("/a.pdf", make_pdf("a"))
+    fake_site.add("/a2.pdf", make_pdf("a revised"))
+    fake_site.add("/b.pdf", make_pdf("b"))
+    fake_site.add("/page.html", b"<html>not a pdf</html>")
+    _write_links(
+        data_dir,
+        [
+            {"href": f"{fake_site.url}/a.pdf", "date": "2025-01-02"},
+            {"href": f"{fake_site.url}/page.html", "date": "2025-01-03"},
+            {"href": f"{fake_site.url}/missing.pdf", "date": "2025-01-04"},
+            {"href": f"{fake_site.url}/a2.pdf", "date": "2025-01-02"},
+            {"href": f"{fake_site.url}/b.pdf", "date": "2025-01-05"},
+            {"href": f"{fake_site.url}/b.pdf"},  # malformed: no date
+        ],
+    )
+
+    _run(data_dir, workers)
+
+    pdfs = data_dir / "pdfs"
+    assert sorted(p.name for p in pdfs.glob("*.pdf")) == [
+        "voting_minutes_2025-01-02.pdf",
+        "voting_minutes_2025-01-02_v2.pdf",
+        "voting_minutes_2025-01-05.pdf",
+    ]
+    assert not list(pdfs.glob("*.part"))
+    # Versions follow link order, not completion order.
+    assert (pdfs / "voting_minutes_2025-01-02.pdf").read_bytes() == make_pdf("a")
+    excluded = json.loads((data_dir / "exclude.json").read_text(encoding="utf-8"))
+    assert excluded == [f"{fake_site.url}/page.html"]
+
+
+def test_excluded_links_are_not_fetched(fake_site, data_dir):
+    fake_site.add("/page.html", b"<html></html>")
+    href = f"{fake_site.url}/page.html"
+    (data_dir / "exclude.json").write_text(json.dumps([href]), encoding="utf-8")
+    _write_links(data_dir, [{"href": href, "date": "2025-01-03"}])
+
+    _run(data_dir, workers=2)
+
+    assert fake_site.hits("/page.html") == 0
+
+
+def test_unchanged_pdf_is_not_downloaded_again(fake_site, data_dir):
+    fake_site.add("/a.pdf", make_pdf("a"), headers={"ETag": '"v1"'})
+    href = f"{fake_site.url}/a.pdf"
+    _write_links(data_dir, [{"href": href, "date": "2025-01-02"}])
+
+    _run(data_dir, workers=1)
+    manifest = json.loads((data_dir / "manifest.json").read_text(encoding="utf-8"))
+    assert manifest[href]["etag"] == '"v1"'
+    assert manifest[href]["file"] == "voting_minutes_2025-01-02.pdf"
+
+    _run(data_dir, workers=1)
+    assert fake_site.requests[-1][1].get("If-None-Match") == '"v1"'
+
+    # A changed ETag means new content: downloaded and versioned.
+    fake_site.add("/a.pdf", make_pdf("a revised"), headers={"ETag": '"v2"'})
+    _run(data_dir, workers=1)
+    assert (data_dir / "pdfs" / "voting_minutes_2025-01-02_v2.pdf").exists()
+
+
+def test_missing_file_forces_unconditional_download(fake_site, data_dir):
+    fake_site.add("/a.pdf", make_pdf("a"), headers={"ETag": '"v1"'})
+    _write_links(data_dir, [{"href": f"{fake_site.url}/a.pdf", "date": "2025-01-02"}])
+    _run(data_dir, workers=1)
+    (data_dir / "pdfs" / "voting_minutes_2025-01-02.pdf").unlink()
+
+    _run(data_dir, workers=1)
+    assert "If-None-Match" not in fake_site.requests[-1][1]
+    assert (data_dir / "pdfs" / "voting_minutes_2025-01-02.pdf").exists()
+
+
+def test_host_limiter_spaces_requests_to_one_host():
+    limiter = HostLimiter(max_per_host=1, delay=0.05)
+    start = time.monotonic()
+    for _ in range(3):
+        with limiter.slot("http://example.test/x"):
+            pass
+    assert time.monotonic() - start >= 0.1
+
+
+def test_host_slot_is_held_until_the_body_is_read(fake_site, data_dir):
+    fake_site.add("/a.pdf", make_pdf("a" * 5000))
+    fake_site.add("/b.pdf", make_pdf("b"))
+    release = fake_site.holds["/a.pdf"] = threading.Event()
+    downloader = DownloaderService(
+        download_dir=data_dir / "pdfs",
+        workers=2,
+        limiter=HostLimiter(max_per_host=1, delay=0),
+    )
+    results = {}
+
+    def download(path):
+        results[path] = downloader._download_pdf(f"{fake_site.url}{path}")
+
+    first = threading.Thread(target=download, args=("/a.pdf",))
+    first.start()
+    deadline = time.monotonic() + 5
+    while not fake_site.hits("/a.pdf") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    second = threading.Thread(target=download, args=("/b.pdf",))
+    second.start()
+    time.sleep(0.3)
+    assert fake_site.hits("/b.pdf") == 0
+
+    release.set()
+    first.join(timeout=5)
+    second.join(timeout=5)
+    assert fake_site.hits("/b.pdf") == 1
+    assert all(result.temp_path is not None for result in results.values())
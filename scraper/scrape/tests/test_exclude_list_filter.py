@@ -0,0 +1,90 @@
+"""Tests for app.link_filters.exclude_list_filter.ExcludeListFilter."""
+
+import json
+import stat
+
+import pytest
+
+from app.link_filters.exclude_list_filter import ExcludeListFilter
+from app.storage.json_store import JsonStore
+
+
+def _write(path, urls):
+    path.write_text(json.dumps(urls), encoding="utf-8")
+
+
+def test_added_urls_are_excluded_at_once_but_saved_on_flush(tmp_path):
+    path = tmp_path / "exclude.json"
+    _write(path, ["/b", "/a"])
+    exclude = ExcludeListFilter(path)
+
+    exclude.add_url("/c")
+    exclude.add_url("/a")
+    exclude.add_url("/c")
+    assert exclude.process([{"href": "/a"}, {"href": "/c"}, {"href": "/d"}]) == [
+        {"href": "/d"}
+    ]
+    assert json.loads(path.read_text()) == ["/b", "/a"]
+
+    exclude.flush()
+    assert json.loads(path.read_text()) == ["/b", "/a", "/c"]
+    assert ExcludeListFilter(path).exclude_items == {"/a", "/b", "/c"}
+
+
+def test_flushed_list_is_world_readable(tmp_path):
+    path = tmp_path / "exclude.json"
+    exclude = ExcludeListFilter(path)
+    exclude.add_url("/a")
+    exclude.flush()
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+def test_list_is_read_and_written_through_the_json_store(tmp_path):
+    class RecordingStore(JsonStore):
+        def __init__(self):
+            self.calls = []
+
+        def load(self, path):
+            self.calls.append(("load", path))
+            return super().load(path)
+
+        def save(self, data, path):
+            self.calls.append(("save", path))
+            super().save(data, path)
+
+    path = tmp_path / "exclude.json"
+    store = RecordingStore()
+    exclude = ExcludeListFilter(path, store)
+    exclude.add_url("/a")
+    exclude.flush()
+    assert store.calls == [("load", path), ("save", path)]
+
+
+def test_flush_without_new_urls_does_not_write(tmp_path):
+    path = tmp_path / "exclude.json"
+    ExcludeListFilter(path).flush()
+    assert not path.exists()
+
+
+def test_failed_flush_leaves_the_list_intact(tmp_path, monkeypatch):
+    path = tmp_path / "exclude.json"
+    _write(path, ["/a"])
+    exclude = ExcludeListFilter(path)
+    exclude.add_url("/b")
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(json, "dump", fail)
+    exclude.flush()
+    monkeypatch.undo()
+
+    assert json.loads(path.read_text()) == ["/a"]
+    assert [p.name for p in tmp_path.iterdir()] == ["exclude.json"]
+
+
+@pytest.mark.parametrize("content", ["", "{not json", '{"a": 1}'])
+def test_unreadable_list_loads_empty(tmp_path, content):
+    path = tmp_path / "exclude.json"
+    path.write_text(content, encoding="utf-8")
+    assert ExcludeListFilter(path).exclude_items == set()
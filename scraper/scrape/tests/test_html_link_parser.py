@@ -0,0 +1,156 @@
+"""Tests for app.parsers.html_link_parser and the single-pass filter chain."""
+
+import csv
+import json
+import random
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app import constants as const
+from app.link_filters.client_side_filter import ClientSideFilter
+from app.link_filters.exclude_list_filter import ExcludeListFilter
+from app.link_filters.video_link_filter import VideoLinkFilter
+from app.parsers import html_link_parser
+from app.parsers.html_link_parser import HtmlLinkParser
+from app.services.scraper_service import ScraperService
+from app.storage.json_store import JsonStore
+
+# Markup fragments, well-formed and not, that the fuzz test strings together.
+FRAGMENTS = [
+    "<a href='x'>", "<a href=\"y\" href='z'>", "<a>", "<A HREF=Q>", "<a href>",
+    "</a>", "</A>", "<a href=s/>", "</a", "<p>", "</p>", "<b>", "</b>", "<div",
+    "<br>", "</br>", "<br/>", "<img src=x>", "<script>", "</script>", "<style>",
+    "</style>", "<template>", "</template>", "<rt>", "</rt>", "<rp>", "</rp>",
+    "<textarea>", "</textarea>", "<title>", "</title>", "<pre>", "</pre>",
+    "<!-- c -->", "<!DOCTYPE html>", "<?pi?>", "<![CDATA[cd ]]>", " ", "\n",
+    "text", " t2 ", "&amp;", "&copy", "&notit;", "&lt", "&", "<", ">", "&#",
+    "&#x", "&#65;", "&#x41;", "&#128;", "&#129;", "&#0;", "&#1;", "&#xD800;",
+    "&#x110000;", "&#xFFFE;", "&#x1F600;", "&#65abc;",
+]  # fmt: skip
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>Licensing Board</title><script>var a = "<a href='no'>";</script>
+</head><body>
+<ul>
+  <li><a href="https://www.boston.gov/sites/default/files/file/2025/01/VM%201-9-25.pdf">
+      Voting Minutes &ndash; January 9,<br> 2025</a></li>
+  <li><a href="/minutes/feb.pdf"><span>February</span> 13, 2025</a></li>
+  <li><a href="https://youtu.be/abc">Hearing video</a></li>
+  <li><a href="https://www.youtube.com/watch?v=1">Hearing video 2</a></li>
+  <li><a href="mailto:board@boston.gov">Email</a> <a href="tel:617">Call</a></li>
+  <li><a href="#top">Top</a> <a href="javascript:void(0)">Menu</a></li>
+  <li><a href="/excluded.pdf">Old&nbsp;notice</a></li>
+  <li><a name="anchor">no href</a></li>
+</ul></body></html>
+"""
+
+
+def _bs4_links(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [
+        {"href": link["href"], "body": link.get_text(strip=True)}
+        for link in soup.find_all("a", href=True)
+    ]
+
+
+def test_page_links_match_beautifulsoup():
+    links = HtmlLinkParser().extract_links(PAGE)
+    assert links == _bs4_links(PAGE)
+    assert links[0]["body"] == "Voting Minutes – January 9,2025"
+
+
+def test_nested_and_unclosed_links_match_beautifulsoup():
+    html = "<a href=1>one <a href=2>two</a> rest<p><a href=3>three</p>after"
+    assert HtmlLinkParser().extract_links(html) == _bs4_links(html)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_fuzzed_markup_matches_beautifulsoup(seed):
+    rng = random.Random(seed)
+    parser = HtmlLinkParser()
+    for _ in range(2000):
+        html = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 25)))
+        assert parser.extract_links(html) == _bs4_links(html), html
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_chunked_feeds_match_beautifulsoup(seed):
+    rng = random.Random(seed)
+    for _ in range(1000):
+        html = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 40)))
+        parser = HtmlLinkParser(chunk_size=rng.randint(1, 40))
+        assert parser.extract_links(html) == _bs4_links(html), html
+
+
+def test_iter_links_yields_before_the_whole_page_is_parsed(monkeypatch):
+    fed = []
+    feed = html_link_parser._LinkCollector.feed
+
+    def recording_feed(self, data):
+        fed.append(data)
+        feed(self, data)
+
+    monkeypatch.setattr(html_link_parser._LinkCollector, "feed", recording_feed)
+    html = "".join(f"<p><a href={i}>link {i}</a></p>" for i in range(100))
+    links = HtmlLinkParser(chunk_size=64).iter_links(html)
+
+    assert next(links) == {"href": "0", "body": "link 0"}
+    assert len("".join(fed)) < len(html)
+    assert len(list(links)) == 99
+
+
+def test_iter_links_applies_keep_in_order():
+    seen = []
+
+    def keep(link):
+        seen.append(link["href"])
+        return link["href"] != "b"
+
+    html = "<a href=a>A</a><a href=b>B</a><a href=c>C</a>"
+    links = list(HtmlLinkParser().iter_links(html, keep))
+    assert [link["href"] for link in links] == ["a", "c"]
+    assert seen == ["a", "b", "c"]
+
+
+def test_scraper_filters_in_one_pass_like_process_chain(
+    fake_site, tmp_path, monkeypatch
+):
+    fake_site.add("/board", PAGE.encode(), headers={"Content-Type": "text/html"})
+    monkeypatch.setattr(const, "TARGET_URL", f"{fake_site.url}/board")
+    monkeypatch.setattr(const, "MINUTES_LINKS_FILE", tmp_path / "links.json")
+    monkeypatch.setattr(const, "STATS_LOG_FILE", tmp_path / "stats.csv")
+    exclude_file = tmp_path / "exclude.json"
+    exclude_file.write_text(json.dumps(["/excluded.pdf"]), encoding="utf-8")
+
+    def filters(videos_file):
+        return [
+            ClientSideFilter(),
+            ExcludeListFilter(exclude_file),
+            VideoLinkFilter(JsonStore(), videos_file),
+        ]
+
+    # Reference: one process() pass per filter over the BeautifulSoup links
+    expected = _bs4_links(PAGE)
+    for f in filters(tmp_path / "expected_videos.json"):
+        expected = f.process(expected)
+
+    scraper = ScraperService()
+    for f in filters(tmp_path / "videos.json"):
+        scraper.add_filter(f)
+    scraper.run()
+
+    saved = json.loads((tmp_path / "links.json").read_text(encoding="utf-8"))
+    assert [{"href": s["href"], "body": s["body"]} for s in saved] == expected
+    assert (tmp_path / "videos.json").read_text() == (
+        tmp_path / "expected_videos.json"
+    ).read_text()
+    with open(tmp_path / "stats.csv", encoding="utf-8") as f:
+        row = next(csv.DictReader(f))
+    assert {k: v for k, v in row.items() if k != "run_date"} == {
+        "total_links": "9",
+        "client_side_links": "4",
+        "excluded_links": "1",
+        "video_links": "2",
+        "minutes_links": "2",
+    }
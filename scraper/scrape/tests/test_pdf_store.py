@@ -0,0 +1,88 @@
+"""Tests for app.storage.pdf_store.PdfStore."""
+
+import hashlib
+import json
+import os
+
+from app.storage.pdf_store import MANIFEST_NAME, PdfStore
+
+
+def test_versions_and_duplicates(tmp_path):
+    store = PdfStore(tmp_path)
+    first = store.save_pdf(b"%PDF-a", "2025-01-02")
+    second = store.save_pdf(b"%PDF-b", "2025-01-02")
+    assert store.save_pdf(b"%PDF-a", "2025-01-02") == first
+    assert store.save_pdf(b"%PDF-b", "2025-01-02") == second
+    assert (first.name, second.name) == (
+        "voting_minutes_2025-01-02.pdf",
+        "voting_minutes_2025-01-02_v2.pdf",
+    )
+    assert store.saved == [first, second]
+
+
+def test_manifest_avoids_rehashing(tmp_path, monkeypatch):
+    store = PdfStore(tmp_path)
+    store.save_pdf(b"%PDF-a", "2025-01-02")
+    store.save_pdf(b"%PDF-b", "2025-01-02")
+    store.flush()
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert [v["version"] for v in manifest["2025-01-02"]] == [1, 2]
+
+    reopened = PdfStore(tmp_path)
+    monkeypatch.setattr(
+        reopened, "_calculate_hash", lambda path: (_ for _ in ()).throw(AssertionError)
+    )
+    assert reopened.save_pdf(b"%PDF-b", "2025-01-02").name.endswith("_v2.pdf")
+
+
+def test_changed_file_is_rehashed(tmp_path):
+    store = PdfStore(tmp_path)
+    path = store.save_pdf(b"%PDF-a", "2025-01-02")
+    store.flush()
+    path.write_bytes(b"%PDF-replaced")
+
+    reopened = PdfStore(tmp_path)
+    assert reopened.save_pdf(b"%PDF-replaced", "2025-01-02") == path
+
+
+def test_files_unknown_to_the_manifest_are_hashed(tmp_path):
+    (tmp_path / "voting_minutes_2025-01-02.pdf").write_bytes(b"%PDF-old")
+    store = PdfStore(tmp_path)
+    assert store.save_pdf(b"%PDF-old", "2025-01-02").name == (
+        "voting_minutes_2025-01-02.pdf"
+    )
+    assert store.saved == []
+
+
+def test_new_mtime_alone_does_not_rehash(tmp_path, monkeypatch):
+    # A fresh checkout resets every mtime
+    store = PdfStore(tmp_path)
+    path = store.save_pdf(b"%PDF-a", "2025-01-02")
+    store.flush()
+    os.utime(path, ns=(1, 1))
+
+    reopened = PdfStore(tmp_path)
+    monkeypatch.setattr(
+        reopened, "_calculate_hash", lambda path: (_ for _ in ()).throw(AssertionError)
+    )
+    assert reopened.save_pdf(b"%PDF-a", "2025-01-02") == path
+
+
+def test_save_pdf_file_moves_or_discards_the_temp_file(tmp_path):
+    store = PdfStore(tmp_path)
+    first = tmp_path / ".download-1.part"
+    first.write_bytes(b"%PDF-a")
+    saved = store.save_pdf_file(
+        first, "2025-01-02", hashlib.sha256(b"%PDF-a").hexdigest()
+    )
+    assert saved.read_bytes() == b"%PDF-a"
+    assert not first.exists()
+
+    again = tmp_path / ".download-2.part"
+    again.write_bytes(b"%PDF-a")
+    assert (
+        store.save_pdf_file(again, "2025-01-02", hashlib.sha256(b"%PDF-a").hexdigest())
+        == saved
+    )
+    assert not again.exists()
+    assert store.remove_stale_temp_files() == 0
@@ -0,0 +1,35 @@
+"""Tests for app.utils.pdf_validation."""
+
+from app.utils.pdf_validation import is_valid_pdf, looks_like_pdf
+from tests.fake_site import make_pdf
+
+
+def test_well_formed_pdf_passes_quick_check(tmp_path):
+    path = tmp_path / "a.pdf"
+    path.write_bytes(make_pdf("a"))
+    assert looks_like_pdf(path)
+    assert is_valid_pdf(path)
+
+
+def test_html_is_rejected(tmp_path):
+    path = tmp_path / "page.pdf"
+    path.write_bytes(b"<!DOCTYPE html><html><body>Not found</body></html>")
+    assert not looks_like_pdf(path)
+    assert not is_valid_pdf(path)
+
+
+def test_bad_xref_offset_falls_back_to_pikepdf(tmp_path):
+    content = make_pdf("a")
+    start = content.rindex(b"startxref")
+    broken = content[:start] + b"startxref\n999999999\n%%EOF\n"
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(broken)
+    assert not looks_like_pdf(path)
+    # pikepdf reconstructs the cross-reference table, so it's still usable.
+    assert is_valid_pdf(path)
+
+
+def test_truncated_download_is_rejected(tmp_path):
+    path = tmp_path / "truncated.pdf"
+    path.write_bytes(make_pdf("a")[:40])
+    assert not is_valid_pdf(path)
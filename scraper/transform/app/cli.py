@@ -3,10 +3,101 @@ import json
 import logging
 import os
 import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
 
-from app.pipeline.pipeline import run_pipeline
+from app import constants as const
+from app.pipeline.extraction import sam_index
+from app.pipeline.pipeline import run_pipeline, step_names
+from app.pipeline.text_engines import (
+    DEFAULT_TEXT_ENGINE,
+    TEXT_ENGINES,
+    get_text_engine,
+)
+from app.state.checkpoint_store import CheckpointStore
+from app.state.kv_store import KVStore
+from app.state.text_cache import TextCache
+from app.state.transform_cache import TransformCache
 from app.utils.logger import setup_logging
 from app.utils.pdf_selection import select_latest_versions
+from app.utils.profiler import Profiler
+
+
+def _process_file(
+    pdf_path: str,
+    cache: TransformCache | None = None,
+    text_cache: TextCache | None = None,
+    lazy_text: bool = False,
+    text_engine: str = DEFAULT_TEXT_ENGINE,
+    checkpoints: CheckpointStore | None = None,
+    from_step: str | None = None,
+    until_step: str | None = None,
+) -> tuple[list, str | None, dict]:
+    """
+    Runs the pipeline on a single PDF with its own KVStore and Profiler.
+
+    Returns (results, error, profile). Exceptions are caught and returned as
+    a message so a failing file never takes down a worker process.
+    """
+    profiler = Profiler()
+    try:
+        results = run_pipeline(
+            pdf_path,
+            kv_store=KVStore(),
+            cache=cache,
+            text_cache=text_cache,
+            profiler=profiler,
+            lazy_text=lazy_text,
+            text_engine=text_engine,
+            checkpoints=checkpoints,
+            from_step=from_step,
+            until_step=until_step,
+        )
+        return results, None, profiler.as_dict()
+    except Exception as e:
+        return [], str(e), profiler.as_dict()
+
+
+def _process_files(
+    pdf_paths: list[str],
+    workers: int,
+    cache: TransformCache | None = None,
+    text_cache: TextCache | None = None,
+    lazy_text: bool = False,
+    text_engine: str = DEFAULT_TEXT_ENGINE,
+    checkpoints: CheckpointStore | None = None,
+    from_step: str | None = None,
+    until_step: str | None = None,
+) -> Iterator[tuple[list, str | None, dict]]:
+    """
+    Yields (results, error, profile) for each PDF in the order given.
+
+    With workers > 1 the files are processed in a process pool; results are
+    still yielded in input order so the output matches a serial run.
+    """
+    process = partial(
+        _process_file,
+        cache=cache,
+        text_cache=text_cache,
+        lazy_text=lazy_text,
+        text_engine=text_engine,
+        checkpoints=checkpoints,
+        from_step=from_step,
+        until_step=until_step,
+    )
+    if workers <= 1:
+        yield from map(process, pdf_paths)
+        return
+
+    # Check the SAM index against its snapshot here, once, not in each worker
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=sam_index.use_checked_db,
+        initargs=(sam_index.checked_db_path(),),
+    ) as executor:
+        yield from executor.map(process, pdf_paths)
 
 
 def main():
@@ -26,19 +117,94 @@ def main():
         default="all_licenses.json",
         help="Path to the output JSON file (default: all_licenses.json)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for --dir runs (default: 1, serial)",
+    )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the transform and PDF text caches for --dir runs",
+    )
+    cache_group.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore cached results and text for --dir runs and repopulate the caches",
+    )
+    parser.add_argument(
+        "--lazy-text",
+        action="store_true",
+        help="Extract PDF pages on demand and stop after the hearing section "
+        "when the rest of the minutes isn't needed",
+    )
+    parser.add_argument(
+        "--text-engine",
+        choices=list(TEXT_ENGINES),
+        default=DEFAULT_TEXT_ENGINE,
+        help=f"PDF text-extraction engine (default: {DEFAULT_TEXT_ENGINE}); "
+        "compare them with `python -m benchmarks.text_engines`",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Snapshot each PDF's KVStore after every pipeline step "
+        f"(in {const.CHECKPOINT_PATH.relative_to(const.BASE_DIR)})",
+    )
+    parser.add_argument(
+        "--from-step",
+        choices=step_names(),
+        help="Resume from this step, using the checkpoints of an earlier "
+        "--checkpoint run (implies --checkpoint)",
+    )
+    parser.add_argument(
+        "--until-step",
+        choices=step_names(),
+        help="Stop after this step (implies --checkpoint)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the slowest pipeline steps and extractors after the run",
+    )
 
     args = parser.parse_args()
+    try:
+        get_text_engine(args.text_engine)
+    except ImportError as e:
+        parser.error(f"text engine {args.text_engine!r} is not installed: {e}")
+    if (
+        args.from_step
+        and args.until_step
+        and step_names().index(args.until_step) < step_names().index(args.from_step)
+    ):
+        parser.error(f"--until-step {args.until_step} runs before {args.from_step}")
+
+    checkpoints = None
+    if args.checkpoint or args.from_step or args.until_step:
+        checkpoints = CheckpointStore(const.CHECKPOINT_PATH)
 
     all_results = []
+    # Step/extractor timings are always collected and written next to --output
+    profiler = Profiler()
 
     # if the user provided a single file, process it directly
     if args.file:
         logging.getLogger().setLevel(logging.DEBUG)
         logger.info(f"Processing single file: {args.file}")
-        from app.state.kv_store import KVStore
-
         store = KVStore()
-        results = run_pipeline(args.file, kv_store=store)
+        results = run_pipeline(
+            args.file,
+            kv_store=store,
+            profiler=profiler,
+            lazy_text=args.lazy_text,
+            text_engine=args.text_engine,
+            checkpoints=checkpoints,
+            from_step=args.from_step,
+            until_step=args.until_step,
+        )
         all_results.extend(results)
         logger.debug(f"Results: {results}")
         logger.debug(f"All results: {store.dump()}")
@@ -52,24 +218,78 @@ def main():
         files = [f for f in os.listdir(args.dir) if f.endswith(".pdf")]
         files = select_latest_versions(files)
         logger.info(f"Found {len(files)} PDF files in {args.dir}")
+        if args.workers > 1:
+            logger.info(f"Processing with {args.workers} worker processes")
 
-        for index, filename in enumerate(files, 1):
-            pdf_path = os.path.join(args.dir, filename)
+        cache = None
+        text_cache = None
+        if not args.no_cache:
+            cache = TransformCache(
+                const.TRANSFORM_CACHE_DIR,
+                rebuild=args.rebuild,
+                text_engine=args.text_engine,
+            )
+            if cache.prune():
+                logger.info("Pipeline changed; discarded stale transform cache")
+            text_cache = TextCache(
+                const.TEXT_CACHE_PATH,
+                rebuild=args.rebuild,
+                text_engine=args.text_engine,
+            )
+            if text_cache.prune():
+                logger.info("Text extractor changed; discarded stale PDF text")
+
+        pdf_paths = [os.path.join(args.dir, filename) for filename in files]
+        outcomes = _process_files(
+            pdf_paths,
+            args.workers,
+            cache,
+            text_cache,
+            args.lazy_text,
+            args.text_engine,
+            checkpoints,
+            args.from_step,
+            args.until_step,
+        )
+
+        for index, pdf_path in enumerate(pdf_paths, 1):
             logger.info(f"[{index}/{len(files)}] Processing: {pdf_path}")
-            try:
-                results = run_pipeline(pdf_path)
-                all_results.extend(results)
-            except Exception as e:
-                logger.error(f"Failed to process {pdf_path}: {e}")
+            # Serial runs process each file here, after its log line
+            results, error, profile = next(outcomes)
+            profiler.merge(profile)
+            if error is not None:
+                logger.error(f"Failed to process {pdf_path}: {error}")
+                continue
+            all_results.extend(results)
+
+    # A run stopped before the last step has no complete records; keep the
+    # previous output, report and spreadsheet
+    stopped_early = args.until_step not in (None, step_names()[-1])
 
     # Output results
     try:
-        with open(args.output, "w", encoding="utf-8") as f:
-            json.dump(all_results, f, indent=2, ensure_ascii=False)
-        logger.info(f"Successfully wrote {len(all_results)} licenses to {args.output}")
+        if stopped_early:
+            logger.info(
+                f"Stopped after {args.until_step}; not writing {args.output}, "
+                "the stats report or the spreadsheet"
+            )
+        else:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(all_results, f, indent=2, ensure_ascii=False)
+            logger.info(
+                f"Successfully wrote {len(all_results)} licenses to {args.output}"
+            )
+
+        profile_base = Path(args.output).with_suffix("")
+        profile_json = profile_base.with_name(f"{profile_base.name}_profile.json")
+        profile_csv = profile_base.with_name(f"{profile_base.name}_profile.csv")
+        profiler.write(profile_json, profile_csv)
+        logger.info(f"Timing profile written to {profile_json} and {profile_csv}")
+        if args.profile:
+            logger.info(f"Top pipeline offenders:\n{profiler.format_top()}")
 
         # Generate stats report for directory runs
-        if args.dir:
+        if args.dir and not stopped_early:
             from app.utils.licenses_to_excel import json_excel
             from app.utils.stats_report import process_data
 
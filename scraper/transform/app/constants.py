@@ -6,8 +6,15 @@ PDF_TEXT = "pdf_text"
 HEARING_SECTION = "hearing_section"
 LICENSE_TEXT_DATA = "license_text_data"
 LICENSE_JSON_DATA = "license_json_data"
+PDF_HASH = "pdf_hash"
+SECTION_OFFSETS = "section_offsets"
 
 # Paths
-BASE_DIR = Path(__file__).resolve().parent.parent
+APP_DIR = Path(__file__).resolve().parent
+BASE_DIR = APP_DIR.parent
 DATA_DIR = BASE_DIR / "data"
 LOG_DIR = BASE_DIR / "log"
+CACHE_DIR = BASE_DIR / "cache"
+TRANSFORM_CACHE_DIR = CACHE_DIR / "transform"
+TEXT_CACHE_PATH = CACHE_DIR / "pdf_text.sqlite"
+CHECKPOINT_PATH = CACHE_DIR / "checkpoints.sqlite"
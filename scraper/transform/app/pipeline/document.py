@@ -0,0 +1,89 @@
+"""
+A text buffer with a line-offset index, shared by the text steps.
+
+The hearing, license and JSON steps used to split their text into a list of
+lines, join it back, and split it again. A Document keeps the text as one
+string, normalized the way "\\n".join(text.splitlines()) would, and hands
+out lines and runs of lines by offset: the license step slices each chunk
+out of the hearing section's buffer, and each ExtractionContext carries the
+Document of its chunk. join_lines and the line-break constants are also
+used by the section locator.
+
+KVStore values stay plain strings (they are cached and dumped as JSON and
+plugins edit them). document() wraps one in a Document that the store keeps
+alongside it, so every step reading the key shares one buffer and index,
+rebuilt only after the string is replaced.
+"""
+
+import re
+from bisect import bisect_right
+from itertools import accumulate
+
+from app.state.kv_store import KVStore
+
+# The line boundaries str.splitlines() splits on ("\r\n" counts as one)
+LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+LINE_BREAK_RE = re.compile(r"\r\n|[" + re.escape(LINE_BREAKS) + "]")
+# Anything splitlines() treats as a line break besides "\n"
+_OTHER_BREAKS = LINE_BREAKS[1:]
+
+
+def join_lines(text: str) -> str:
+    """
+    "\\n".join(text.splitlines()), without building the list when the text
+    only uses "\\n" (then at most a trailing "\\n" has to go).
+    """
+    # One str.__contains__ per character beats a regex character class here
+    if any(ch in text for ch in _OTHER_BREAKS):
+        return "\n".join(text.splitlines())
+    return text[:-1] if text.endswith("\n") else text
+
+
+class Document:
+    """
+    A "\\n"-separated text and the offset each of its lines starts at.
+
+    Line i is text[starts[i] : starts[i + 1] - 1]; the last entry of starts
+    is one past the end of the text, so that holds for the last line too.
+    The index is built on first use.
+    """
+
+    def __init__(self, text: str):
+        self.text = join_lines(text)
+        self._starts: list[int] | None = None
+
+    @property
+    def starts(self) -> list[int]:
+        if self._starts is None:
+            # Each line starts one past the end of the previous one (its "\\n");
+            # summed in C from the line lengths rather than by a find() loop.
+            lengths = map(len, self.text.split("\n")) if self.text else ()
+            self._starts = list(accumulate(map((1).__add__, lengths), initial=0))
+        return self._starts
+
+    def lines(self) -> list[str]:
+        """Every line, as str.splitlines() would give them."""
+        return self.text.split("\n") if self.text else []
+
+    def line(self, index: int) -> str:
+        return self.span(index, index + 1)
+
+    def span(self, first: int, stop: int | None = None) -> str:
+        """Lines first..stop-1 (to the end if stop is None) as one string."""
+        starts = self.starts
+        if stop is None or stop >= len(starts):
+            return self.text[starts[first] :]
+        return self.text[starts[first] : starts[stop] - 1]
+
+    def line_at(self, offset: int) -> int:
+        """The index of the line containing this offset."""
+        return bisect_right(self.starts, offset) - 1
+
+
+def _document(text: str | None) -> Document:
+    return Document(text or "")
+
+
+def document(kv_store: KVStore, key: str) -> Document:
+    """The shared Document of the string stored under key."""
+    return kv_store.derived(key, _document)
@@ -13,17 +13,12 @@ import os
 import re
 
 from app import constants as const
+from app.pipeline.locate_sections import section_offsets
 from app.pipeline.run_result import RunResult
 from app.state.kv_store import KVStore
 
 logger = logging.getLogger(__name__)
 
-# The section header that introduces the batch-approval block (2026+ PDFs)
-SECTION_HEADER_RE = re.compile(
-    r"The Board voted to approve to the following restricted",
-    re.IGNORECASE,
-)
-
 # Each individual approval line; captures optional zip code and license type.
 # Handles both "a Zip Code restricted" (2025) and "an 02118 Zip Code restricted" (2026).
 VOTED_LINE_RE = re.compile(
@@ -85,15 +80,14 @@ class BoardVotedExtractorStep:
         if not pdf_text or not pdf_file_path:
             return RunResult()
 
-        section_match = SECTION_HEADER_RE.search(pdf_text)
-        if not section_match:
+        # End of the section header match, as recorded by SectionLocatorStep
+        header_end = section_offsets(self.kv_store, pdf_text)["board_voted"]
+        if header_end is None:
             return RunResult()
 
         # Start parsing after the full section header line (skip remainder of matched line)
-        header_line_end = pdf_text.find("\n", section_match.end())
-        section_start = (
-            header_line_end + 1 if header_line_end >= 0 else section_match.end()
-        )
+        header_line_end = pdf_text.find("\n", header_end)
+        section_start = header_line_end + 1 if header_line_end >= 0 else header_end
         section_text = pdf_text[section_start:]
         minutes_date = self._get_minutes_date(pdf_file_path)
         file_name = os.path.basename(pdf_file_path)
@@ -6,6 +6,7 @@ from datetime import datetime
 from dateutil import parser
 
 from app import constants as const
+from app.pipeline.document import Document, document
 from app.pipeline.run_result import RunResult
 from app.state.kv_store import KVStore
 
@@ -14,12 +15,19 @@ logger = logging.getLogger(__name__)
 
 # Regex for the start of a license chunk: "1. ", "10. ", etc. at beginning of line
 # A new chunk starts when a line begins with a number followed by a . a space and then some text
-CHUNK_START_RE = re.compile(r"^\d+\.\s+.+")
+# (searched over the whole section, so the whitespace can't run into the next line)
+CHUNK_START_RE = re.compile(r"^\d+\.[^\S\n]+.", re.MULTILINE)
+
+# A line holding only a numbered header, e.g. "1." or " 23. "
+STANDALONE_HEADER_RE = re.compile(r"^[^\S\n]*\d+\.[^\S\n]*$", re.MULTILINE)
 
 # Regex for identifying a license number pattern (case-insensitive, flexible spacing/colon)
 # Matches "License#", "license #", "LICENSE : #", etc.
 LICENSE_NUMBER_RE = re.compile(r"license\s*:?\s*#\s*:?", re.IGNORECASE)
 
+# The first non-whitespace character, i.e. the first non-empty line
+FIRST_TEXT_RE = re.compile(r"\S")
+
 YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
 
 
@@ -42,12 +50,8 @@ class LicenseTextExtractorStep:
             return RunResult(
                 proceed=False, reason="PDF file path not provided in KVStore"
             )
-        hearing_section = self._fix_header(hearing_section)
-
-        hearing_section_lines = hearing_section.splitlines()
-        licenses_text_data = self._extract_license_text(
-            hearing_section_lines, pdf_file_path
-        )
+        hearing_doc = self._fix_header(document(self.kv_store, const.HEARING_SECTION))
+        licenses_text_data = self._extract_license_text(hearing_doc, pdf_file_path)
         if licenses_text_data:
             self.kv_store.set(const.LICENSE_TEXT_DATA, licenses_text_data)
         else:
@@ -89,7 +93,7 @@ class LicenseTextExtractorStep:
             logger.warning(f"Could not parse date from from filename {pdf_file_path}")
         return "Date:null"
 
-    def _fix_header(self, text: str) -> str:
+    def _fix_header(self, doc: Document) -> Document:
         """
         Fix broken numbered headers by merging lines where a standalone numeric
         header (e.g. "1.", "23.") appears on its own line with the following line.
@@ -97,59 +101,51 @@ class LicenseTextExtractorStep:
         For any line that consists only of digits followed by a period, the next
         line is appended to the same line separated by a space. All other lines
         are preserved exactly, and no additional whitespace or formatting changes
-        are applied.
+        are applied. Sections without such a header are returned as they are.
         """
-        lines = text.splitlines()
-        output = []
-
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-
-            # Match lines like "1." , "23." etc (digits followed by a dot, and nothing else)
-            if re.fullmatch(r"\d+\.", line):
-                # If there is a next line, merge them
-                if i + 1 < len(lines):
-                    merged = f"{lines[i].rstrip()} {lines[i + 1].lstrip()}"
-                    output.append(merged)
-                    i += 2
-                    continue
-
-            # Normal line — keep as-is
-            output.append(lines[i])
-            i += 1
+        if not STANDALONE_HEADER_RE.search(doc.text):
+            # Re-read like a merged section would be, which drops a trailing empty line
+            return Document(doc.text) if doc.text.endswith("\n") else doc
+
+        # Splice each merged header into the buffer instead of splitting it
+        text, starts = doc.text, doc.starts
+        pieces = []
+        copied = 0
+        for match in STANDALONE_HEADER_RE.finditer(text):
+            if match.start() < copied:
+                # This line was merged into the header above it
+                continue
+            index = doc.line_at(match.start())
+            if index + 2 >= len(starts):
+                # The last line has nothing to merge with
+                break
+            pieces.append(text[copied : match.start()])
+            pieces.append(f"{match.group().rstrip()} {doc.line(index + 1).lstrip()}")
+            copied = starts[index + 2] - 1
 
-        return "\n".join(output)
+        pieces.append(text[copied:])
+        return Document("".join(pieces))
 
-    def _extract_license_text(self, hearing_section_lines, pdf_file_path):
+    def _extract_license_text(self, doc: Document, pdf_file_path):
         basename = os.path.basename(pdf_file_path)
 
         # Extract hearing date from the first line
         first_non_empty_line = ""
-        for line in hearing_section_lines:
-            if line.strip():
-                first_non_empty_line = line.strip()
-                break
+        first_text = FIRST_TEXT_RE.search(doc.text)
+        if first_text:
+            first_non_empty_line = doc.line(doc.line_at(first_text.start())).strip()
 
         hearing_date_line = self._get_hearing_date(first_non_empty_line, pdf_file_path)
 
-        chunks = []
-        current_chunk = []
-
-        for line in hearing_section_lines:
-            if CHUNK_START_RE.match(line):
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = [line]
-            elif current_chunk:
-                current_chunk.append(line)
-
-        if current_chunk:
-            chunks.append(current_chunk)
+        # Each chunk runs from its numbered first line up to the next one
+        chunk_starts = [
+            doc.line_at(m.start()) for m in CHUNK_START_RE.finditer(doc.text)
+        ]
 
         extracted_chunks = {}
-        for idx, chunk_lines in enumerate(chunks, 1):
-            chunk_text = "\n".join(chunk_lines)
+        for idx, first in enumerate(chunk_starts, 1):
+            stop = chunk_starts[idx] if idx < len(chunk_starts) else None
+            chunk_text = doc.span(first, stop)
 
             # Simplified: Keep chunk if it has at least one license number pattern
             if LICENSE_NUMBER_RE.search(chunk_text):
@@ -1,20 +1,59 @@
 import logging
-
-import fitz  # PyMuPDF
+import re
+from collections.abc import Generator
 
 from app import constants as const
+from app.pipeline.invariant_plugins import get_registry
+from app.pipeline.locate_sections import locate_sections
 from app.pipeline.run_result import RunResult
+from app.pipeline.text_engines import DEFAULT_TEXT_ENGINE, TextEngine, get_text_engine
 from app.state.kv_store import KVStore
+from app.state.text_cache import TextCache
 
 logger = logging.getLogger(__name__)
 
+# Minutes from this date on can have a "Board voted to approve" block after
+# the hearing, which runs to the end of the document, so lazy extraction
+# always reads them in full.
+BOARD_VOTED_SINCE = "2025-01-01"
+
+MINUTES_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+
+# A line made only of underscores (at least one) and whitespace, with its "\n"
+UNDERSCORE_LINE_RE = re.compile(r"^[^\S\n]*_+[^\S\n]*\n", re.MULTILINE)
+# The same as the last line, with the "\n" before it if there is one
+LAST_UNDERSCORE_LINE_RE = re.compile(r"(?:^|\n)[^\S\n]*_+[^\S\n]*\Z")
+
 
 class PDFTextExtractorStep:
-    """Extracts text from downloaded PDFs."""
+    """
+    Extracts text from downloaded PDFs.
+
+    If a TextCache is given and the PDF hash is in the KVStore, the cleaned
+    text is read from / written to the cache instead of re-parsing the PDF.
+
+    With lazy=True pages are extracted on demand and extraction stops after
+    the page holding the hearing's stop marker, when nothing later in the
+    document is needed: the minutes predate BOARD_VOTED_SINCE, no board-voted
+    header was seen and no POST_TEXT plugin targets the PDF. If the markers
+    aren't found every page is read, as without lazy. Partial text is never
+    written to the TextCache.
+
+    The pages are read by a TextEngine (PyMuPDF's plain text by default).
+    """
 
-    def __init__(self, kv_store: KVStore):
+    def __init__(
+        self,
+        kv_store: KVStore,
+        text_cache: TextCache | None = None,
+        lazy=False,
+        engine: TextEngine | None = None,
+    ):
         self.kv_store = kv_store
         self.file_path = self.kv_store.get(const.PDF_FILE_PATH)
+        self.text_cache = text_cache
+        self.lazy = lazy
+        self.engine = engine or get_text_engine(DEFAULT_TEXT_ENGINE)
 
     def run(self):
         # logger.info("Starting text extraction process...")
@@ -22,9 +61,17 @@ class PDFTextExtractorStep:
             return RunResult(
                 proceed=False, reason="PDF file path not provided in KVStore"
             )
-        text = self._extract_text(self.file_path)
-        text = self._remove_underscore_lines(text)
-        text = self._strip_non_ascii(text)
+        pdf_hash = self.kv_store.get(const.PDF_HASH)
+        text = None
+        if self.text_cache and pdf_hash:
+            text = self.text_cache.get(pdf_hash)
+        if text is None:
+            if self.lazy and self._can_stop_early(self.file_path):
+                text, complete = self._extract_hearing_text(self.file_path)
+            else:
+                text, complete = self._extract_clean_text(self.file_path), True
+            if text and complete and self.text_cache and pdf_hash:
+                self.text_cache.put(pdf_hash, text)
         if text:
             self.kv_store.set(const.PDF_TEXT, text)
         else:
@@ -33,21 +80,61 @@ class PDFTextExtractorStep:
         # logger.info("Text extraction process completed.")
         return RunResult()
 
-    def _extract_text(self, pdf_path) -> str:
+    def _can_stop_early(self, pdf_path) -> bool:
+        match = MINUTES_DATE_RE.search(str(pdf_path))
+        if not match or match.group(1) >= BOARD_VOTED_SINCE:
+            return False
+        # Plugins may rewrite text anywhere, including past the hearing
+        return not get_registry("POST_TEXT").for_file(pdf_path)
+
+    def _extract_clean_text(self, pdf_path) -> str:
         try:
-            doc = fitz.open(pdf_path)
-            all_text = []
-            for page in doc:
-                text = page.get_text()
-                if text.strip():
-                    all_text.append(text.strip())
-                    # all_text.append("\n-------------------------\n")
-            doc.close()
-            return "\n".join(all_text)
+            return "\n".join(self._iter_clean_pages(pdf_path))
         except Exception as e:
             logger.error(f"Error extracting text from {pdf_path}: {e}")
             return ""
 
+    def _extract_hearing_text(self, pdf_path) -> tuple[str, bool]:
+        """
+        The cleaned text of the pages up to the hearing's stop marker, and
+        whether that is the whole document.
+        """
+        pages = []
+        # Each page is scanned once; markers never span the "\n" between pages
+        hearing_started = False
+        try:
+            page_iter = self._iter_clean_pages(pdf_path)
+            for page in page_iter:
+                pages.append(page)
+                offsets = locate_sections(page, hearing_started)
+                if offsets["board_voted"] is not None:
+                    # The block runs to the end of the document
+                    pages.extend(page_iter)
+                    break
+                if offsets["hearing_stop"] is not None:
+                    page_iter.close()  # closes the engine's document too
+                    return "\n".join(pages), False
+                hearing_started |= offsets["hearing_start"] is not None
+        except Exception as e:
+            logger.error(f"Error extracting text from {pdf_path}: {e}")
+            return "", True
+        return "\n".join(pages), True
+
+    def _iter_clean_pages(self, pdf_path) -> Generator[str]:
+        """
+        Each page's share of the cleaned text, extracted on demand; joined
+        with "\\n" they are the document's cleaned text. Blank pages and
+        pages holding only underscore lines add nothing.
+        """
+        for page_text in self.engine.page_texts(pdf_path):
+            text = page_text.strip()
+            if not text:
+                continue
+            cleaned, removed = self._remove_underscore_lines(text)
+            # Pages holding only underscore lines add nothing
+            if removed <= text.count("\n"):
+                yield self._strip_non_ascii(cleaned)
+
     def _strip_non_ascii(self, text: str) -> str:
         """
         Remove all non-ASCII characters from text.
@@ -55,17 +142,12 @@ class PDFTextExtractorStep:
         """
         return text.encode("ascii", errors="ignore").decode("ascii")
 
-    def _remove_underscore_lines(self, text: str) -> str:
-        lines = text.split("\n")
-        cleaned = []
-
-        for line in lines:
-            stripped = line.strip()
-
-            # If the line is made only of underscores, skip it
-            if stripped and all(ch == "_" for ch in stripped):
-                continue
-
-            cleaned.append(line)
-
-        return "\n".join(cleaned)
+    def _remove_underscore_lines(self, text: str) -> tuple[str, int]:
+        """
+        The text without its lines made only of underscores (and whitespace),
+        and how many lines were removed. Each one goes with the "\\n" after
+        it, or before it for the last line, as if the kept lines were joined.
+        """
+        text, removed = UNDERSCORE_LINE_RE.subn("", text)
+        text, last = LAST_UNDERSCORE_LINE_RE.subn("", text)
+        return text, removed + last
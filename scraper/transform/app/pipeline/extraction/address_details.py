@@ -1,4 +1,4 @@
-from app.utils.boston_address_parser import BostonAddressParser
+from app.utils.boston_address_parser import get_parser
 
 from .context import ExtractionContext
 
@@ -11,8 +11,7 @@ class AddressDetailsExtractor:
         if not address:
             return
 
-        parser = BostonAddressParser()
-        parsed = parser.parse_address(address)
+        parsed = get_parser().parse_address(address)
 
         ctx.data["street_number"] = parsed.get("street_number")
         ctx.data["street_name"] = parsed.get("full_street_name")
@@ -1,8 +1,17 @@
 from dataclasses import dataclass, field
 
+from app.pipeline.document import Document
+
 
 @dataclass
 class ExtractionContext:
     lines: list[str]
     data: dict
     anchors: dict[str, int] = field(default_factory=dict)
+    document: Document | None = None
+
+    @classmethod
+    def from_document(cls, document: Document, data: dict) -> "ExtractionContext":
+        """A context over the Document's non-blank lines, stripped."""
+        lines = [stripped for line in document.lines() if (stripped := line.strip())]
+        return cls(lines=lines, data=data, document=document)
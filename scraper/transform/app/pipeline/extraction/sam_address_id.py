@@ -1,5 +1,5 @@
 from .context import ExtractionContext
-from .sam_index import lookup
+from .sam_matcher import match
 
 
 class SamAddressIdExtractor:
@@ -10,13 +10,16 @@ class SamAddressIdExtractor:
     ctx.data before this runs.
 
     Uses a local snapshot of Boston's Live SAM dataset (see `sam_index` and
-    `refresh_sam_data.py`) for an exact match on
-    street_number + street_name + ZIP. On a match, it sets SAM_ADDRESS_ID and
-    BUILDING_ID; on no match (or missing input) both stay None.
+    `refresh_sam_data.py`). An exact match on street_number + street_name +
+    ZIP is tried first; on a miss, `sam_matcher` tries numbers inside a SAM
+    range and near-miss street spellings within the ZIP. On a match, it sets
+    SAM_ADDRESS_ID, BUILDING_ID and sam_match_confidence (1.0 for an exact
+    match, lower for range and street-name matches); on no match (or missing
+    input) all three stay None.
 
     No network access: the snapshot is read locally, so extraction stays
     offline and deterministic. Ranges (e.g. "1463-1467") use the low end for
-    the lookup; fuller range handling is deferred.
+    the lookup.
     """
 
     priority = 37
@@ -25,12 +28,13 @@ class SamAddressIdExtractor:
         # Establish the keys up front so downstream consumers always see them.
         ctx.data.setdefault("sam_address_id", None)
         ctx.data.setdefault("building_id", None)
+        ctx.data.setdefault("sam_match_confidence", None)
 
         street_number = ctx.data.get("street_number")
         street_name = ctx.data.get("street_name")
         zipcode = ctx.data.get("zipcode")
 
-        # All three are needed to attempt an exact match.
+        # All three are needed to attempt a match.
         if not (street_number and street_name and zipcode):
             return
 
@@ -38,15 +42,17 @@ class SamAddressIdExtractor:
         if not number:
             return
 
-        ctx.data["sam_address_id"], ctx.data["building_id"] = lookup(
-            number, street_name, zipcode
-        )
+        (
+            ctx.data["sam_address_id"],
+            ctx.data["building_id"],
+            ctx.data["sam_match_confidence"],
+        ) = match(number, street_name, zipcode)
 
     @staticmethod
     def _lookup_number(street_number: str) -> str | None:
         """Reduce a parsed street number to a single value for the lookup.
 
-        "1463-1467" -> "1463" (low end; ranges deferred)
+        "1463-1467" -> "1463" (low end)
         "605A"      -> "605A"
         """
         first = street_number.split("-", 1)[0].strip()
@@ -1,7 +1,14 @@
 import csv
 import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+from collections.abc import Iterator
 from pathlib import Path
 
+from app.utils.hashing import sha256_file
+
 logger = logging.getLogger(__name__)
 
 # Local snapshot of Boston's Live SAM address data. The pipeline reads this
@@ -10,6 +17,13 @@ logger = logging.getLogger(__name__)
 # https://data.boston.gov/dataset/live-street-address-management-sam-addresses
 SAM_DATA_PATH = Path(__file__).resolve().parents[3] / "data" / "sam_addresses.csv"
 
+# Prebuilt lookup table for the snapshot, written next to it by
+# refresh_sam_data.py. Its pages are shared between worker processes through
+# the OS page cache; the CSV is the fallback. Checking that it matches the
+# snapshot hashes the CSV, so that is done once per run (see checked_db_path).
+SAM_INDEX_PATH = SAM_DATA_PATH.with_suffix(".sqlite")
+INDEX_FORMAT_VERSION = "3"
+
 # Columns stored in the snapshot (also the refresh script's query outFields,
 # kept in sync). IS_RANGE / RANGE_FROM / RANGE_TO drive range matching.
 SAM_FIELDS = [
@@ -24,7 +38,13 @@ SAM_FIELDS = [
 ]
 
 # Memoized index, keyed by (street_number, FULL_STREET_NAME upper, zip).
-_index: dict[tuple[str, str, str], tuple[str | None, str | None]] | None = None
+# Either a plain dict (CSV fallback, tests) or a SamDbIndex; both map the key
+# to (sam_address_id, building_id).
+_index: "dict | SamDbIndex | None" = None
+
+# The prebuilt index if it matched the snapshot, once _db_checked
+_db: "SamDbIndex | None" = None
+_db_checked = False
 
 
 def _key(
@@ -45,26 +65,11 @@ def _clean_number(value: str | None) -> str:
     return v
 
 
-def _build_index(path: Path = SAM_DATA_PATH) -> dict:
-    index: dict[tuple[str, str, str], tuple[str | None, str | None]] = {}
-    if not path.exists():
-        logger.warning(
-            "SAM snapshot not found at %s; address enrichment disabled. "
-            "Run `uv run python refresh_sam_data.py` to create it.",
-            path,
-        )
-        return index
-
-    def add(
-        street_number: str | None,
-        name: str | None,
-        zipcode: str | None,
-        value: tuple[str | None, str | None],
-    ) -> None:
-        key = _key(street_number, name, zipcode)
-        if key not in index:  # first row wins
-            index[key] = value
-
+def _iter_entries(
+    path: Path,
+) -> Iterator[tuple[tuple[str, str, str], tuple[str | None, str | None]]]:
+    """Yield every (key, (sam_id, building_id)) the snapshot provides, in file
+    order. A key can repeat; the first occurrence wins."""
     with open(path, newline="", encoding="utf-8") as f:
         for row in csv.DictReader(f):
             name = row.get("FULL_STREET_NAME")
@@ -74,24 +79,305 @@ def _build_index(path: Path = SAM_DATA_PATH) -> dict:
             value = (sam_id, building_id)
 
             # Exact street-number key.
-            add(row.get("STREET_NUMBER"), name, zipcode, value)
+            yield _key(row.get("STREET_NUMBER"), name, zipcode), value
 
             # For a range (e.g. 1463-1467), also index by its low end so a
             # parsed range address (reduced to its low end) resolves.
             if (row.get("IS_RANGE") or "").strip() == "1":
                 range_from = _clean_number(row.get("RANGE_FROM"))
                 if range_from:
-                    add(range_from, name, zipcode, value)
+                    yield _key(range_from, name, zipcode), value
+
+
+def _parse_int(value: str | None) -> int | None:
+    v = _clean_number(value)
+    return int(v) if v.isdigit() else None
+
+
+def _iter_ranges(
+    path: Path,
+) -> Iterator[tuple[str, str, int, int, str | None, str | None]]:
+    """Yield (STREET NAME, zip, from, to, sam_id, building_id) for every
+    IS_RANGE row with numeric bounds, in file order."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if (row.get("IS_RANGE") or "").strip() != "1":
+                continue
+            low = _parse_int(row.get("RANGE_FROM"))
+            high = _parse_int(row.get("RANGE_TO"))
+            if low is None or high is None:
+                continue
+            _, name, zipcode = _key(
+                None, row.get("FULL_STREET_NAME"), row.get("ZIP_CODE")
+            )
+            yield (
+                name,
+                zipcode,
+                min(low, high),
+                max(low, high),
+                (row.get("SAM_ADDRESS_ID") or "").strip() or None,
+                (row.get("BUILDING_ID") or "").strip() or None,
+            )
+
+
+def _iter_streets(path: Path) -> Iterator[tuple[str, str]]:
+    """Yield each distinct (STREET NAME, zip) once, in file order."""
+    seen: set[tuple[str, str]] = set()
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            _, name, zipcode = _key(
+                None, row.get("FULL_STREET_NAME"), row.get("ZIP_CODE")
+            )
+            if name and (name, zipcode) not in seen:
+                seen.add((name, zipcode))
+                yield name, zipcode
+
+
+def _csv_stamp(csv_path: Path) -> list[tuple[str, str]]:
+    """The snapshot's size and SHA-256, stored in the index's meta table."""
+    return [
+        ("csv_size", str(csv_path.stat().st_size)),
+        ("csv_sha256", sha256_file(csv_path)),
+    ]
+
+
+def _build_index(path: Path = SAM_DATA_PATH) -> dict:
+    index: dict[tuple[str, str, str], tuple[str | None, str | None]] = {}
+    if not path.exists():
+        logger.warning(
+            "SAM snapshot not found at %s; address enrichment disabled. "
+            "Run `uv run python refresh_sam_data.py` to create it.",
+            path,
+        )
+        return index
+
+    for key, value in _iter_entries(path):
+        if key not in index:  # first row wins
+            index[key] = value
 
     logger.info("Loaded %d SAM index entries from %s", len(index), path)
     return index
 
 
-def get_index() -> dict:
-    """Return the SAM index, built once per process from the local snapshot."""
+def build_db(csv_path: Path = SAM_DATA_PATH, db_path: Path = SAM_INDEX_PATH) -> int:
+    """Write the prebuilt SQLite index for a snapshot (atomically). Returns
+    the number of entries."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=db_path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute(
+                "CREATE TABLE addresses (street_number TEXT, street_name TEXT, "
+                "zip TEXT, sam_id TEXT, building_id TEXT, "
+                "PRIMARY KEY (street_number, street_name, zip)) WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE TABLE ranges (street_name TEXT, zip TEXT, range_from INTEGER, "
+                "range_to INTEGER, sam_id TEXT, building_id TEXT)"
+            )
+            conn.execute("CREATE TABLE streets (street_name TEXT, zip TEXT)")
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            # First row wins, as in _build_index.
+            conn.executemany(
+                "INSERT OR IGNORE INTO addresses VALUES (?, ?, ?, ?, ?)",
+                (key + value for key, value in _iter_entries(csv_path)),
+            )
+            # Inputs for the secondary (range / street name) matcher.
+            conn.executemany(
+                "INSERT INTO ranges VALUES (?, ?, ?, ?, ?, ?)", _iter_ranges(csv_path)
+            )
+            conn.executemany(
+                "INSERT INTO streets VALUES (?, ?)", _iter_streets(csv_path)
+            )
+            count = conn.execute("SELECT COUNT(*) FROM addresses").fetchone()[0]
+            conn.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [
+                    ("format_version", INDEX_FORMAT_VERSION),
+                    *_csv_stamp(csv_path),
+                    ("entries", str(count)),
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, db_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return count
+
+
+def update_db(
+    streets: set[tuple[str, str]],
+    csv_path: Path = SAM_DATA_PATH,
+    db_path: Path = SAM_INDEX_PATH,
+) -> int:
+    """
+    Bring a prebuilt index up to date with a snapshot in which only the rows
+    of `streets` ((STREET NAME, zip) pairs, as in _key) changed, with the
+    same result as build_db. Only those streets' addresses are re-inserted;
+    the small, order-sensitive ranges and streets tables are rewritten.
+    Atomic, like build_db. Returns the number of entries.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=db_path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(db_path, tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.execute(
+                "CREATE TEMP TABLE affected (street_name TEXT, zip TEXT, "
+                "PRIMARY KEY (street_name, zip))"
+            )
+            conn.executemany("INSERT OR IGNORE INTO affected VALUES (?, ?)", streets)
+            conn.execute(
+                "DELETE FROM addresses WHERE (street_name, zip) IN "
+                "(SELECT street_name, zip FROM affected)"
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO addresses VALUES (?, ?, ?, ?, ?)",
+                (
+                    key + value
+                    for key, value in _iter_entries(csv_path)
+                    if key[1:] in streets
+                ),
+            )
+            conn.execute("DELETE FROM ranges")
+            conn.executemany(
+                "INSERT INTO ranges VALUES (?, ?, ?, ?, ?, ?)", _iter_ranges(csv_path)
+            )
+            conn.execute("DELETE FROM streets")
+            conn.executemany(
+                "INSERT INTO streets VALUES (?, ?)", _iter_streets(csv_path)
+            )
+            count = conn.execute("SELECT COUNT(*) FROM addresses").fetchone()[0]
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [*_csv_stamp(csv_path), ("entries", str(count))],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, db_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return count
+
+
+class SamDbIndex:
+    """Read-only, dict-like view of a prebuilt SQLite index."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not be shared across a fork; reopen per process.
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True
+            )
+            self._pid = os.getpid()
+        return self._conn
+
+    def meta(self) -> dict[str, str]:
+        return dict(self._connection().execute("SELECT key, value FROM meta"))
+
+    def get(self, key: tuple[str, str, str], default=None):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT sam_id, building_id FROM addresses "
+                "WHERE street_number = ? AND street_name = ? AND zip = ?",
+                key,
+            )
+            .fetchone()
+        )
+        return default if row is None else row
+
+    def ranges(self) -> list[tuple[str, str, int, int, str | None, str | None]]:
+        """The rows of _iter_ranges, as stored by build_db."""
+        return (
+            self._connection().execute("SELECT * FROM ranges ORDER BY rowid").fetchall()
+        )
+
+    def streets(self) -> list[tuple[str, str]]:
+        """The rows of _iter_streets, as stored by build_db."""
+        return (
+            self._connection()
+            .execute("SELECT * FROM streets ORDER BY rowid")
+            .fetchall()
+        )
+
+    def __contains__(self, key: tuple[str, str, str]) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return (
+            self._connection().execute("SELECT COUNT(*) FROM addresses").fetchone()[0]
+        )
+
+
+def _open_db(
+    db_path: Path = SAM_INDEX_PATH, csv_path: Path = SAM_DATA_PATH
+) -> SamDbIndex | None:
+    """Open the prebuilt index if it exists and matches the snapshot."""
+    if not db_path.exists():
+        return None
+    try:
+        index = SamDbIndex(db_path)
+        meta = index.meta()
+    except sqlite3.Error as e:
+        logger.warning("Ignoring unreadable SAM index %s: %s", db_path, e)
+        return None
+    # The size rules most stale indexes out without hashing the snapshot;
+    # the hash catches edits that keep the size.
+    if (
+        meta.get("format_version") != INDEX_FORMAT_VERSION
+        or not csv_path.exists()
+        or meta.get("csv_size") != str(csv_path.stat().st_size)
+        or meta.get("csv_sha256") != sha256_file(csv_path)
+    ):
+        logger.warning(
+            "SAM index %s is stale; falling back to %s. Run "
+            "`uv run python refresh_sam_data.py --index-only` to rebuild it.",
+            db_path,
+            csv_path,
+        )
+        return None
+    logger.info("Opened SAM index %s (%s entries)", db_path, meta.get("entries"))
+    return index
+
+
+def checked_db_path() -> Path | None:
+    """The prebuilt index's path if it matches the snapshot, else None.
+    Checked once per process; a process pool hands the answer to its
+    workers through use_checked_db instead of each one hashing the CSV."""
+    global _db, _db_checked
+    if not _db_checked:
+        _db, _db_checked = _open_db(), True
+    return None if _db is None else _db.db_path
+
+
+def use_checked_db(db_path: Path | None) -> None:
+    """Take another process's checked_db_path() as this one's."""
+    global _db, _db_checked
+    _db, _db_checked = (None if db_path is None else SamDbIndex(db_path)), True
+
+
+def get_index() -> "dict | SamDbIndex":
+    """Return the SAM index, opened once per process: the prebuilt SQLite
+    index when it matches the snapshot, otherwise built from the CSV."""
     global _index
     if _index is None:
-        _index = _build_index()
+        checked_db_path()
+        _index = _db if _db is not None else _build_index()
     return _index
 
 
@@ -0,0 +1,231 @@
+import bisect
+import logging
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+from app.utils.boston_address_parser import STREET_SUFFIX_ABBR, STREET_SUFFIX_FULL
+
+from . import sam_index
+from .sam_index import SAM_DATA_PATH, lookup
+
+logger = logging.getLogger(__name__)
+
+# Confidence written alongside sam_address_id. Street-name matches are further
+# scaled by the name similarity.
+CONFIDENCE_EXACT = 1.0
+CONFIDENCE_RANGE = 0.9
+# Minimum trigram (Dice) similarity for a near-miss street name.
+MIN_NAME_SIMILARITY = 0.6
+# Near-miss street names tried per lookup, best first.
+MAX_NAME_CANDIDATES = 5
+# Most character edits between a near-miss name and the SAM name (typos).
+MAX_NAME_EDITS = 2
+
+_SUFFIXES = {suffix.upper() for suffix in STREET_SUFFIX_ABBR + STREET_SUFFIX_FULL}
+
+_NUMBER_RE = re.compile(r"\d+")
+
+# Memoized matcher (inject in tests, like sam_index._index).
+_matcher: "AddressMatcher | None" = None
+
+
+def _trigrams(name: str) -> frozenset[str]:
+    padded = f"  {name} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def _split_suffix(name: str) -> tuple[str, str | None]:
+    """("BLUE HILL AVE") -> ("BLUE HILL", "AVE"); names without a known
+    street suffix come back whole with None."""
+    base, _, last = name.rpartition(" ")
+    if base and last in _SUFFIXES:
+        return base, last
+    return name, None
+
+
+def _within_edits(a: str, b: str, limit: int = MAX_NAME_EDITS) -> bool:
+    """Whether the Levenshtein distance between a and b is at most limit."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            )
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+def _is_near_miss(street_name: str, sam_name: str) -> bool:
+    """
+    Whether `street_name` can be a misspelling of `sam_name`: a typo, or a
+    missing suffix ("BLUE HIL AVE" / "BLUE HILL" for "BLUE HILL AVE"). Names
+    with different suffixes ("WASHINGTON ST" / "WASHINGTON AVE") are
+    different streets.
+    """
+    base, suffix = _split_suffix(street_name)
+    sam_base, sam_suffix = _split_suffix(sam_name)
+    if suffix is None:
+        return _within_edits(street_name, sam_name) or _within_edits(
+            street_name, sam_base
+        )
+    if sam_suffix is None:
+        return _within_edits(base, sam_name)
+    return suffix == sam_suffix and _within_edits(base, sam_base)
+
+
+class AddressMatcher:
+    """
+    Secondary SAM index for addresses the exact lookup misses.
+
+    - Range rows (IS_RANGE) are kept per (street, zip) as intervals sorted by
+      their low end, so a number inside a range (same side of the street)
+      resolves with a bisect.
+    - Street names are indexed by trigram within each ZIP, so typos and
+      missing suffixes ("Blue Hil Ave" / "Blue Hill" for "Blue Hill Ave")
+      resolve to the closest SAM street. A street that exists as written is
+      never swapped for another one: that miss is a house-number miss.
+    """
+
+    def __init__(
+        self,
+        ranges: Iterable[tuple[str, str, int, int, str | None, str | None]],
+        streets: Iterable[tuple[str, str]],
+    ):
+        grouped: dict[tuple[str, str], list] = {}
+        for order, (name, zipcode, low, high, sam_id, building_id) in enumerate(ranges):
+            grouped.setdefault((name, zipcode), []).append(
+                (low, order, high, (sam_id, building_id))
+            )
+
+        # Per street: sorted lows, their intervals, and the running max of the
+        # highs so a search can stop once no earlier interval can reach n.
+        self._ranges: dict[tuple[str, str], tuple[list, list, list]] = {}
+        for key, intervals in grouped.items():
+            intervals.sort()
+            lows, max_highs, running = [], [], -1
+            for low, _, high, _ in intervals:
+                lows.append(low)
+                running = max(running, high)
+                max_highs.append(running)
+            self._ranges[key] = (lows, max_highs, intervals)
+
+        self._names: dict[str, list[tuple[str, frozenset[str]]]] = {}
+        self._postings: dict[str, dict[str, list[int]]] = {}
+        self._streets: set[tuple[str, str]] = set()
+        for name, zipcode in streets:
+            self._streets.add((name, zipcode))
+            names = self._names.setdefault(zipcode, [])
+            grams = _trigrams(name)
+            postings = self._postings.setdefault(zipcode, {})
+            for gram in grams:
+                postings.setdefault(gram, []).append(len(names))
+            names.append((name, grams))
+
+    def in_range(
+        self, number: int, street_name: str, zipcode: str
+    ) -> tuple[str | None, str | None] | None:
+        """The first SAM range on this street containing `number`. Ranges
+        whose ends share a parity only cover that side of the street."""
+        entry = self._ranges.get((street_name, zipcode))
+        if entry is None:
+            return None
+        lows, max_highs, intervals = entry
+        best = None
+        i = bisect.bisect_right(lows, number) - 1
+        while i >= 0 and max_highs[i] >= number:
+            low, order, high, value = intervals[i]
+            if high >= number and ((low - high) % 2 == 1 or (number - low) % 2 == 0):
+                if best is None or order < best[0]:
+                    best = (order, value)
+            i -= 1
+        return best[1] if best else None
+
+    def similar_streets(
+        self, street_name: str, zipcode: str
+    ) -> list[tuple[float, str]]:
+        """SAM street names in this ZIP that `street_name` may be a
+        misspelling of (see _is_near_miss), most similar first."""
+        postings = self._postings.get(zipcode)
+        if not postings:
+            return []
+        names = self._names[zipcode]
+        grams = _trigrams(street_name)
+        shared: dict[int, int] = {}
+        for gram in grams:
+            for idx in postings.get(gram, ()):
+                shared[idx] = shared.get(idx, 0) + 1
+
+        candidates = []
+        for idx, count in shared.items():
+            name, name_grams = names[idx]
+            score = 2 * count / (len(grams) + len(name_grams))
+            if (
+                score >= MIN_NAME_SIMILARITY
+                and name != street_name
+                and _is_near_miss(street_name, name)
+            ):
+                candidates.append((score, name))
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+        return candidates[:MAX_NAME_CANDIDATES]
+
+    def match(
+        self, street_number: str, street_name: str, zipcode: str
+    ) -> tuple[str | None, str | None, float | None]:
+        """Resolve an address the exact lookup missed. Returns (sam_address_id,
+        building_id, confidence), or (None, None, None)."""
+        street_name = street_name.strip().upper()
+        zipcode = zipcode.strip()
+        digits = _NUMBER_RE.match(street_number.strip())
+        number = int(digits.group(0)) if digits else None
+
+        if number is not None:
+            value = self.in_range(number, street_name, zipcode)
+            if value:
+                return (*value, CONFIDENCE_RANGE)
+
+        if (street_name, zipcode) in self._streets:
+            return None, None, None
+        for score, name in self.similar_streets(street_name, zipcode):
+            value = lookup(street_number, name, zipcode)
+            if value != (None, None):
+                return (*value, round(CONFIDENCE_EXACT * score, 2))
+            if number is not None:
+                value = self.in_range(number, name, zipcode)
+                if value:
+                    return (*value, round(CONFIDENCE_RANGE * score, 2))
+        return None, None, None
+
+
+def _build_matcher(path: Path = SAM_DATA_PATH) -> AddressMatcher:
+    index = sam_index.get_index()
+    if isinstance(index, sam_index.SamDbIndex):
+        return AddressMatcher(index.ranges(), index.streets())
+    if not path.exists():
+        return AddressMatcher([], [])
+    return AddressMatcher(sam_index._iter_ranges(path), sam_index._iter_streets(path))
+
+
+def get_matcher() -> AddressMatcher:
+    """Return the secondary matcher, built once per process from the same
+    source as the exact index."""
+    global _matcher
+    if _matcher is None:
+        _matcher = _build_matcher()
+    return _matcher
+
+
+def match(
+    street_number: str, full_street_name: str, zipcode: str
+) -> tuple[str | None, str | None, float | None]:
+    """Exact lookup, then range and near-miss street matching. Returns
+    (sam_address_id, building_id, confidence), or (None, None, None)."""
+    value = lookup(street_number, full_street_name, zipcode)
+    if value != (None, None):
+        return (*value, CONFIDENCE_EXACT)
+    return get_matcher().match(street_number, full_street_name, zipcode)
@@ -22,29 +22,44 @@ STATUS_KEYWORDS = [
 ]
 
 
+# One alternation instead of a pattern per keyword: a line qualifies if any
+# keyword appears as a whole word.
+STATUS_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(kw) for kw in STATUS_KEYWORDS) + r")\b",
+    re.IGNORECASE,
+)
+
+# Normalized status by substring of the status line, first match wins.
+STATUS_MAP = [
+    (("granted",), "granted"),
+    (("rejected",), "rejected"),
+    (("rescheduled", "re-scheduled"), "rescheduled"),
+    (("withdrawn",), "withdrawn"),
+    (("continued",), "continued"),
+    (("deferred", "defer"), "deferred"),
+]
+
+
+def normalize_status(status_detail: str) -> str | None:
+    sd_lower = status_detail.lower()
+    for needles, status in STATUS_MAP:
+        if any(needle in sd_lower for needle in needles):
+            return status
+    return None
+
+
 class StatusExtractor:
     priority = 60
 
     def run(self, ctx: ExtractionContext) -> None:
         # Check last 7 non-empty lines in reverse
         for line in reversed(ctx.lines[-7:]):
-            for keyword in STATUS_KEYWORDS:
-                if re.search(rf"\b{keyword}\b", line, re.IGNORECASE):
-                    status_detail = line.strip()
-                    ctx.data["status_detail"] = status_detail
-
-                    sd_lower = status_detail.lower()
-                    if "granted" in sd_lower:
-                        ctx.data["status"] = "granted"
-                    elif "rejected" in sd_lower:
-                        ctx.data["status"] = "rejected"
-                    elif any(kw in sd_lower for kw in ["rescheduled", "re-scheduled"]):
-                        ctx.data["status"] = "rescheduled"
-                    elif "withdrawn" in sd_lower:
-                        ctx.data["status"] = "withdrawn"
-                    elif "continued" in sd_lower:
-                        ctx.data["status"] = "continued"
-                    elif any(kw in sd_lower for kw in ["deferred", "defer"]):
-                        ctx.data["status"] = "deferred"
-
-                    return  # Stop after first status found
+            if STATUS_RE.search(line):
+                status_detail = line.strip()
+                ctx.data["status_detail"] = status_detail
+
+                status = normalize_status(status_detail)
+                if status:
+                    ctx.data["status"] = status
+
+                return  # Stop after first status found
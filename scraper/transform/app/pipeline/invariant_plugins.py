@@ -1,7 +1,10 @@
+import functools
 import importlib
 import inspect
 import logging
+import os
 import pkgutil
+import re
 
 from app import constants as const
 from app.pipeline.run_result import RunResult
@@ -10,16 +13,88 @@ from app.violation_plugins.base import Plugin
 
 logger = logging.getLogger(__name__)
 
+# voting_minutes_YYYY-MM-DD, ignoring any _vN revision suffix
+_MEETING_KEY_RE = re.compile(r"^voting_minutes_\d{4}-\d{2}-\d{2}")
+
+
+def meeting_key(pdf_file_path: str) -> str:
+    """The meeting a PDF belongs to, as used by Plugin.target."""
+    basename = os.path.basename(pdf_file_path)
+    match = _MEETING_KEY_RE.match(basename)
+    return match.group(0) if match else basename
+
+
+class PluginRegistry:
+    """
+    The plugins of one stage, indexed by the meeting they target.
+
+    Plugins without a target are candidates for every PDF. Dispatch keeps the
+    original priority order (ties broken by discovery order).
+    """
+
+    def __init__(self, plugins: list[Plugin]):
+        self._untargeted: list[tuple[int, Plugin]] = []
+        self._by_target: dict[str, list[tuple[int, Plugin]]] = {}
+        for order, plugin in enumerate(plugins):
+            if plugin.target:
+                self._by_target.setdefault(plugin.target, []).append((order, plugin))
+            else:
+                self._untargeted.append((order, plugin))
+        self._default = [plugin for _, plugin in self._untargeted]
+        self._dispatch: dict[str, list[Plugin]] = {}
+
+    def for_file(self, pdf_file_path: str) -> list[Plugin]:
+        """The plugins to query for this PDF."""
+        key = meeting_key(pdf_file_path)
+        targeted = self._by_target.get(key)
+        if not targeted:
+            return self._default
+        if key not in self._dispatch:
+            merged = sorted(self._untargeted + targeted, key=lambda item: item[0])
+            self._dispatch[key] = [plugin for _, plugin in merged]
+        return self._dispatch[key]
+
+
+def _discover_plugins(stage: str) -> list[Plugin]:
+    plugin_instances = []
+
+    stage_pkg = f"app.violation_plugins.{stage.lower()}"
+    stage_module = importlib.import_module(stage_pkg)
+
+    # iterate over modules inside the stage subpackage
+    for _, module_name, _ in pkgutil.iter_modules(stage_module.__path__):
+        module = importlib.import_module(f"{stage_pkg}.{module_name}")
+
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if (
+                issubclass(obj, Plugin)
+                and obj is not Plugin
+                and not inspect.isabstract(obj)
+            ):
+                plugin_instances.append(obj())
+
+    # deterministic order by priority
+    plugin_instances.sort(key=lambda p: getattr(p, "priority", 100))
+
+    return plugin_instances
+
+
+@functools.cache
+def get_registry(stage: str) -> PluginRegistry:
+    """Discover a stage's plugins once per process."""
+    return PluginRegistry(_discover_plugins(stage))
+
 
 class InvariantPluginStep:
     """Runs invariant plugins."""
 
     def __init__(self, kv_store: KVStore, stage: str):
-        self.plugins = self._load_plugins(stage)
+        self.name = f"{self.__class__.__name__}[{stage}]"
         self.kv_store = kv_store
         self.file_path = self.kv_store.get(const.PDF_FILE_PATH)
         if not self.file_path:
             raise ValueError("PDF file path not provided")
+        self.plugins = get_registry(stage).for_file(self.file_path)
 
     def run(self):
         # logger.info("Starting text extraction process...")
@@ -27,29 +102,6 @@ class InvariantPluginStep:
         # logger.info("Text extraction process completed.")
         return RunResult()
 
-    def _load_plugins(self, stage: str):
-        plugin_instances = []
-
-        stage_pkg = f"app.violation_plugins.{stage.lower()}"
-        stage_module = importlib.import_module(stage_pkg)
-
-        # iterate over modules inside the stage subpackage
-        for _, module_name, _ in pkgutil.iter_modules(stage_module.__path__):
-            module = importlib.import_module(f"{stage_pkg}.{module_name}")
-
-            for _, obj in inspect.getmembers(module, inspect.isclass):
-                if (
-                    issubclass(obj, Plugin)
-                    and obj is not Plugin
-                    and not inspect.isabstract(obj)
-                ):
-                    plugin_instances.append(obj())
-
-        # deterministic order by priority
-        plugin_instances.sort(key=lambda p: getattr(p, "priority", 100))
-
-        return plugin_instances
-
     def _run_plugins(self):
         for plugin in self.plugins:
             try:
@@ -1,19 +1,26 @@
 import logging
 import re
+import time
 
 from app import constants as const
+from app.pipeline.document import Document
 from app.pipeline.extraction.context import ExtractionContext
 from app.pipeline.extraction.json_pipeline import EXTRACTORS
 from app.pipeline.run_result import RunResult
+from app.utils.profiler import Profiler
 
 logger = logging.getLogger(__name__)
 
 
 class TextJsonExtractorStep:
-    """Extracts JSON data from license text using a pipeline of extractors."""
+    """
+    Extracts JSON data from license text using a pipeline of extractors.
+    If a Profiler is given, each extractor's time per chunk is recorded.
+    """
 
-    def __init__(self, kv_store):
+    def __init__(self, kv_store, profiler: Profiler | None = None):
         self.kv_store = kv_store
+        self.profiler = profiler
 
     def run(self):
         file_path = self.kv_store.get(const.PDF_FILE_PATH)
@@ -31,15 +38,19 @@ class TextJsonExtractorStep:
         results = []
 
         for store_key, content in license_text_data.items():
-            lines = [line.strip() for line in content.splitlines() if line.strip()]
+            # Chunks are "\n"-separated, so the Document wraps the stored string
+            ctx = ExtractionContext.from_document(
+                Document(content), self._initialize_data_dict(store_key)
+            )
+            lines = ctx.lines
             if not lines:
                 continue
 
-            data = self._initialize_data_dict(store_key)
-            ctx = ExtractionContext(lines=lines, data=data)
+            sizes = {"text_len": sum(map(len, lines)), "lines": len(lines)}
 
             # Chain of responsibility pattern
             for extractor in EXTRACTORS:
+                start = time.perf_counter()
                 try:
                     extractor.run(ctx)
                 except Exception as e:
@@ -48,6 +59,13 @@ class TextJsonExtractorStep:
                         exc_info=True,
                     )
                     # Pipeline continues for other extractors
+                if self.profiler:
+                    self.profiler.record(
+                        f"extractor.{extractor.__class__.__name__}",
+                        time.perf_counter() - start,
+                        chunks=1,
+                        **sizes,
+                    )
 
             results.append(ctx.data)
 
@@ -83,4 +101,5 @@ class TextJsonExtractorStep:
             "file_name": self._sourceFileName(store_key),
             "sam_address_id": None,
             "building_id": None,
+            "sam_match_confidence": None,
         }
@@ -0,0 +1,168 @@
+"""
+Locates the section boundaries of the PDF text in one scan.
+
+The hearing and "Board voted to approve" steps used to rescan PDF_TEXT on
+their own (the hearing step checked every marker against every line). The
+SectionLocatorStep runs one combined pattern (the markers as a prefix trie)
+over the lowercased text and records the offsets in SECTION_OFFSETS, and
+those steps slice the text by offset:
+
+- hearing_start: start of the first line containing a START_MARKERS entry
+- hearing_stop: start of the first later line containing a STOP_MARKERS
+  entry (the Old & New Business / Non-Hearing blocks), or None
+- board_voted: end of the first SECTION_HEADER_RE match, or None
+
+Markers are matched case-insensitively anywhere in a line, as before. It has
+to run after the POST_TEXT plugins, which may rewrite PDF_TEXT.
+"""
+
+import re
+
+from app import constants as const
+from app.pipeline.document import LINE_BREAK_RE, LINE_BREAKS, join_lines
+from app.pipeline.run_result import RunResult
+from app.state.kv_store import KVStore
+
+START_MARKERS = [
+    "Transactional Hearings,",
+    "The Board held a transactional hearing on",
+    "Transactional Hearings:",
+    "Transactional Hearing",
+    "Transactional Hearing:",
+    "Transactional Hearing Agenda",
+    "Hearing Date:",
+]
+
+STOP_MARKERS = [
+    "Old & New Business",
+    "OLD AND NEW BUSINESS",
+    "Old and New Business",
+    "Non Hearing Common Victualler Transactions",
+    "Non-Hearing Common Transactions",
+    "Non-Hearing Transactions",
+    "Non-Hearing Transactional:",
+    "Non-Hearing Transactional Items:",
+    "The following are applying for a new Common Victualler License",
+    "***FORCE STOP***",
+]
+
+# The section header that introduces the batch-approval block (2026+ PDFs)
+SECTION_HEADER = "The Board voted to approve to the following restricted"
+SECTION_HEADER_RE = re.compile(re.escape(SECTION_HEADER), re.IGNORECASE)
+
+
+def _trie_pattern(markers: list[str]) -> str:
+    """
+    An alternation of the lowercased markers with shared prefixes factored
+    out, like "non(?: hearing ...|-hearing (?:common ...|transaction...))".
+    The regex engine then rejects most positions on their first character
+    instead of trying every marker, which is what makes one scan cheap.
+    """
+    trie: dict = {}
+    for marker in markers:
+        node = trie
+        for ch in marker.lower():
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in node.items() if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+START_RE = re.compile(_trie_pattern(START_MARKERS))
+STOP_RE = re.compile(_trie_pattern(STOP_MARKERS))
+HEADER_RE = re.compile(_trie_pattern([SECTION_HEADER]))
+# Any boundary marker; each hit is then classified with the patterns above, so
+# markers that start at the same position (or overlap) are all seen.
+ANY_MARKER_RE = re.compile(
+    _trie_pattern([*START_MARKERS, *STOP_MARKERS, SECTION_HEADER])
+)
+
+
+def _lowercase(text: str) -> str:
+    """text.lower(), keeping every character at its offset."""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters (e.g. "\u0130") lowercase to two; leave them be.
+        lowered = "".join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+    return lowered
+
+
+def _line_start(text: str, pos: int) -> int:
+    return max(text.rfind(ch, 0, pos) for ch in LINE_BREAKS) + 1
+
+
+def _next_line_start(text: str, pos: int) -> int:
+    match = LINE_BREAK_RE.search(text, pos)
+    return match.end() if match else len(text)
+
+
+def locate_sections(text: str, hearing_started: bool = False) -> dict[str, int | None]:
+    """
+    The SECTION_OFFSETS of this text (see the module docstring).
+
+    With hearing_started=True the text continues a document whose hearing
+    started earlier (e.g. a later page): hearing_start stays None and the
+    first stop marker anywhere is the hearing_stop.
+    """
+    offsets: dict[str, int | None] = dict.fromkeys(
+        ["hearing_start", "hearing_stop", "board_voted"]
+    )
+    lowered = _lowercase(text)
+    start_line_end = 0 if hearing_started else None
+    match = ANY_MARKER_RE.search(lowered)
+    while match:
+        at = match.start()
+        if start_line_end is None:
+            if START_RE.match(lowered, at):
+                offsets["hearing_start"] = _line_start(text, at)
+                start_line_end = _next_line_start(text, at)
+        elif (
+            offsets["hearing_stop"] is None
+            and at >= start_line_end
+            and STOP_RE.match(lowered, at)
+        ):
+            offsets["hearing_stop"] = _line_start(text, at)
+        if offsets["board_voted"] is None:
+            header = HEADER_RE.match(lowered, at)
+            if header:
+                offsets["board_voted"] = header.end()
+        if offsets["hearing_stop"] is not None and offsets["board_voted"] is not None:
+            break
+        match = ANY_MARKER_RE.search(lowered, at + 1)
+    return offsets
+
+
+def hearing_text(text: str, offsets: dict[str, int | None]) -> str | None:
+    """The hearing section's lines joined with "\\n", or None if there is none."""
+    start = offsets["hearing_start"]
+    if start is None:
+        return None
+    return join_lines(text[start : offsets["hearing_stop"]])
+
+
+def section_offsets(kv_store: KVStore, text: str) -> dict[str, int | None]:
+    """SECTION_OFFSETS from the store, located now if the locator didn't run."""
+    offsets = kv_store.get(const.SECTION_OFFSETS)
+    if offsets is None:
+        offsets = locate_sections(text)
+    return offsets
+
+
+class SectionLocatorStep:
+    """Records the section offsets of the KVStore PDF text."""
+
+    def __init__(self, kv_store: KVStore):
+        self.kv_store = kv_store
+
+    def run(self):
+        pdf_text = self.kv_store.get(const.PDF_TEXT)
+        if pdf_text:
+            self.kv_store.set(const.SECTION_OFFSETS, locate_sections(pdf_text))
+        return RunResult()
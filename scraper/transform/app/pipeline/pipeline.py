@@ -1,4 +1,5 @@
 import logging
+import time
 from typing import Any
 
 from app import constants as const
@@ -8,9 +9,16 @@ from app.pipeline.extract_license_text import LicenseTextExtractorStep
 from app.pipeline.extract_pdf_text import PDFTextExtractorStep
 from app.pipeline.invariant_plugins import InvariantPluginStep
 from app.pipeline.json_extractor import TextJsonExtractorStep
+from app.pipeline.locate_sections import SectionLocatorStep
 from app.pipeline.run_result import RunResult
+from app.pipeline.text_engines import DEFAULT_TEXT_ENGINE, get_text_engine
+from app.state.checkpoint_store import CheckpointStore
 from app.state.kv_store import KVStore
+from app.state.text_cache import TextCache
+from app.state.transform_cache import TransformCache
+from app.utils.hashing import sha256_file
 from app.utils.logger import setup_logging
+from app.utils.profiler import Profiler
 
 logger = logging.getLogger(__name__)
 
@@ -20,20 +28,54 @@ class Pipeline:
     Manages a sequence of processing steps.
     Each step is expected to have a 'run' method that returns a RunResult.
     If a step's RunResult.proceed is False, the pipeline stops.
+    If a Profiler is given, each step's wall time and input size are recorded.
+
+    If a CheckpointStore is given, the KVStore is snapshotted after each step
+    (when the PDF hash is in the store). from_step restores the snapshot taken
+    after the previous step and runs from there; without one the run starts
+    at the first step. until_step stops the run after that step.
     """
 
-    def __init__(self, kv_store: KVStore, steps: list[Any]):
+    def __init__(
+        self,
+        kv_store: KVStore,
+        steps: list[Any],
+        profiler: Profiler | None = None,
+        checkpoints: CheckpointStore | None = None,
+        from_step: str | None = None,
+        until_step: str | None = None,
+    ):
         self.kv_store = kv_store
         self.steps = steps
+        self.profiler = profiler
+        self.checkpoints = checkpoints
+        self.from_step = from_step
+        self.until_step = until_step
+        self._names = [step_display_name(step) for step in steps]
+        for name in (from_step, until_step):
+            if name is not None and name not in self._names:
+                raise ValueError(
+                    f"Unknown pipeline step {name!r}; "
+                    f"choose from {', '.join(self._names)}"
+                )
+        if (
+            from_step
+            and until_step
+            and self._names.index(until_step) < self._names.index(from_step)
+        ):
+            raise ValueError(f"{until_step} runs before {from_step}")
 
     def run(self) -> RunResult:
         """Runs all steps in sequence."""
-        for step in self.steps:
-            step_name = step.__class__.__name__
+        for step in self.steps[self._resume() :]:
+            step_name = step_display_name(step)
             # logger.info(f"Running pipeline step: {step_name}...")
 
             try:
-                result = step.run()
+                if self.profiler:
+                    result = self._run_profiled(step, step_name, self.profiler)
+                else:
+                    result = step.run()
                 if not result.proceed:
                     logger.warning(
                         f"Pipeline stopped after {step_name}: {result.reason}"
@@ -43,45 +85,164 @@ class Pipeline:
                 logger.error(f"Pipeline failed at step {step_name}: {e}")
                 return RunResult(proceed=False, reason=str(e))
 
+            self._checkpoint(step_name)
+            if step_name == self.until_step:
+                break
+
         return RunResult()
 
+    def _checkpoint_key(self) -> tuple[str, str] | None:
+        pdf_file_path = self.kv_store.get(const.PDF_FILE_PATH)
+        pdf_hash = self.kv_store.get(const.PDF_HASH)
+        if not (pdf_file_path and pdf_hash):
+            return None
+        return pdf_file_path, pdf_hash
+
+    def _checkpoint(self, step_name: str) -> None:
+        if self.checkpoints is not None and (key := self._checkpoint_key()):
+            self.checkpoints.put(*key, step_name, self.kv_store.to_json())
+
+    def _resume(self) -> int:
+        """Restores the state before from_step; the index of the first step to run."""
+        index = self._names.index(self.from_step) if self.from_step else 0
+        if index == 0:
+            return 0
+        previous = self._names[index - 1]
+        snapshot = None
+        if self.checkpoints is not None and (key := self._checkpoint_key()):
+            snapshot = self.checkpoints.get(*key, previous)
+        if snapshot is None:
+            logger.warning(
+                f"No checkpoint after {previous}; running from the first step"
+            )
+            return 0
+        self.kv_store.load_json(snapshot)
+        return index
+
+    def _run_profiled(self, step: Any, step_name: str, profiler: Profiler) -> RunResult:
+        with profiler.measure(f"step.{step_name}", **self._input_sizes()):
+            return step.run()
+
+    def _input_sizes(self) -> dict[str, int]:
+        text = self.kv_store.get(const.PDF_TEXT) or ""
+        chunks = self.kv_store.get(const.LICENSE_TEXT_DATA) or {}
+        return {
+            "text_len": len(text),
+            "lines": text.count("\n") + 1 if text else 0,
+            "chunks": len(chunks),
+        }
+
+
+def step_display_name(step: Any) -> str:
+    """A step's `name` attribute if set (e.g. per plugin stage), else its class."""
+    return getattr(step, "name", None) or step.__class__.__name__
+
+
+def step_names() -> list[str]:
+    """The names of the pipeline steps, in order (for --from-step/--until-step)."""
+    store = KVStore()
+    store.set(const.PDF_FILE_PATH, "step_names.pdf")
+    return [step_display_name(step) for step in build_steps(store)]
 
-def run_pipeline(pdf_file_path: str, kv_store: KVStore | None = None):
+
+def build_steps(
+    store: KVStore,
+    text_cache: TextCache | None = None,
+    profiler: Profiler | None = None,
+    lazy_text: bool = False,
+    text_engine: str = DEFAULT_TEXT_ENGINE,
+) -> list[Any]:
+    """The steps that are run for each PDF in the store, in order."""
+    return [
+        # Extracts all text from the downloaded PDF (lazy_text: stops after the hearing when it can)
+        PDFTextExtractorStep(
+            store, text_cache, lazy=lazy_text, engine=get_text_engine(text_engine)
+        ),
+        # Runs fixes from ../violation_plugins/post_text/ on the extracted PDF text
+        InvariantPluginStep(store, "POST_TEXT"),
+        # Records the hearing and board-voted section offsets in one scan of the text
+        SectionLocatorStep(store),
+        # Extracts hearings from the PDF text
+        HearingTextExtractorStep(store),
+        # Runs fixes from ../violation_plugins/post_hearing/ after hearing text extraction
+        InvariantPluginStep(store, "POST_HEARING"),
+        # Extracts license-related text from the hearing text
+        LicenseTextExtractorStep(store),
+        # Runs fixes from ../violation_plugins/post_license/ after license text extraction
+        # TODO: uncomment this line when post_license plugins are implemented
+        # InvariantPluginStep(store, "POST_LICENSE"),
+        # Extracts structured JSON data from the hearing and license text and stores it in the KVStore.
+        TextJsonExtractorStep(store, profiler),
+        # Appends Granted records from the "Board voted to approve" section (does not stop pipeline).
+        BoardVotedExtractorStep(store),
+    ]
+
+
+def run_pipeline(
+    pdf_file_path: str,
+    kv_store: KVStore | None = None,
+    cache: TransformCache | None = None,
+    text_cache: TextCache | None = None,
+    profiler: Profiler | None = None,
+    lazy_text: bool = False,
+    text_engine: str = DEFAULT_TEXT_ENGINE,
+    checkpoints: CheckpointStore | None = None,
+    from_step: str | None = None,
+    until_step: str | None = None,
+):
     logger = setup_logging(__name__)
     if not pdf_file_path:
         raise ValueError("PDF file path is required")
 
+    start = time.perf_counter()
+
+    # Partial runs aren't cached
+    if from_step or until_step:
+        cache = None
+
     store = kv_store or KVStore()
     store.set(const.PDF_FILE_PATH, pdf_file_path)
 
-    # These steps are run for each PDF in the store
-    pipeline = Pipeline(
-        store,
-        [
-            # Extracts all text from the downloaded PDF
-            PDFTextExtractorStep(store),
-            # Runs fixes from ../violation_plugins/post_text/ on the extracted PDF text
-            InvariantPluginStep(store, "POST_TEXT"),
-            # Extracts hearings from the PDF text
-            HearingTextExtractorStep(store),
-            # Runs fixes from ../violation_plugins/post_hearing/ after hearing text extraction
-            InvariantPluginStep(store, "POST_HEARING"),
-            # Extracts license-related text from the hearing text
-            LicenseTextExtractorStep(store),
-            # Runs fixes from ../violation_plugins/post_license/ after license text extraction
-            # TODO: uncomment this line when post_license plugins are implemented
-            # InvariantPluginStep(store, "POST_LICENSE"),
-            # Extracts structured JSON data from the hearing and license text and stores it in the KVStore.
-            TextJsonExtractorStep(store),
-            # Appends Granted records from the "Board voted to approve" section (does not stop pipeline).
-            BoardVotedExtractorStep(store),
-        ],
+    pdf_hash = (
+        _hash_pdf(pdf_file_path) if (cache or text_cache or checkpoints) else None
     )
+    if pdf_hash:
+        store.set(const.PDF_HASH, pdf_hash)
+
+    # Unchanged PDFs (same content, same pipeline fingerprint) skip the steps,
+    # except in checkpointed runs, which always run them
+    if cache is not None and pdf_hash and not checkpoints:
+        cached = cache.get(pdf_file_path, pdf_hash)
+        if cached is not None:
+            store.set(const.LICENSE_JSON_DATA, cached)
+            if profiler:
+                profiler.record("pipeline.cache_hit", time.perf_counter() - start)
+            return cached
+
+    steps = build_steps(store, text_cache, profiler, lazy_text, text_engine)
+    pipeline = Pipeline(store, steps, profiler, checkpoints, from_step, until_step)
 
     result = pipeline.run()
 
     if result.proceed:
-        return store.get(const.LICENSE_JSON_DATA, [])
+        records = store.get(const.LICENSE_JSON_DATA, [])
     else:
         logger.error(f"Pipeline failed for {pdf_file_path}: {result.reason}")
-        return []
+        records = []
+
+    # Failures aren't cached, so a transient one doesn't hide the PDF's
+    # records until the fingerprint changes
+    if result.proceed and cache is not None and pdf_hash:
+        cache.put(pdf_file_path, pdf_hash, records)
+    if profiler:
+        profiler.record("pipeline.run_pipeline", time.perf_counter() - start)
+    return records
+
+
+def _hash_pdf(pdf_file_path: str) -> str | None:
+    """SHA-256 of the PDF, or None if it can't be read (caching is skipped)."""
+    try:
+        return sha256_file(pdf_file_path)
+    except OSError as e:
+        logger.warning(f"Could not hash {pdf_file_path}, not caching: {e}")
+        return None
@@ -0,0 +1,158 @@
+"""
+PDF text-extraction engines for PDFTextExtractorStep.
+
+An engine yields the raw text of each page of a PDF, on demand; the step
+does the cleanup. Engines are picked by name (`--text-engine`), and the name
+and library version are part of the text and transform cache fingerprints,
+since different engines can produce different text.
+
+- pymupdf: page.get_text() with PyMuPDF's default flags (the default)
+- pymupdf-fast: plain text with only the flags the pipeline relies on
+  (ligatures kept as-is, clipped to the page; no whitespace or unknown-glyph
+  handling, never images)
+- pymupdf-blocks: the page's text blocks, concatenated
+- pymupdf-words: the page's words, rejoined with single spaces per line
+- pdfium: pypdfium2, if installed (`uv sync --extra pdfium`)
+
+`python -m benchmarks.text_engines` times each available engine and checks
+whether it yields the same records as the default.
+"""
+
+import functools
+from collections.abc import Iterator
+from importlib import metadata
+from itertools import groupby
+from typing import Protocol
+
+import fitz  # PyMuPDF
+
+DEFAULT_TEXT_ENGINE = "pymupdf"
+
+
+class TextEngine(Protocol):
+    name: str
+    # Distribution whose version goes into the cache fingerprints
+    package: str
+
+    def page_texts(self, pdf_path: str) -> Iterator[str]:
+        """The raw text of each page, extracted as it is consumed."""
+        ...
+
+
+class PyMuPDFEngine:
+    name = "pymupdf"
+    package = "pymupdf"
+
+    def page_texts(self, pdf_path: str) -> Iterator[str]:
+        doc = fitz.open(pdf_path)
+        try:
+            for page in doc:
+                yield self._page_text(page)
+        finally:
+            doc.close()
+
+    def _page_text(self, page: fitz.Page) -> str:
+        return page.get_text()
+
+
+class PyMuPDFFastEngine(PyMuPDFEngine):
+    name = "pymupdf-fast"
+    FLAGS = fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_MEDIABOX_CLIP
+
+    def _page_text(self, page: fitz.Page) -> str:
+        return page.get_text("text", flags=self.FLAGS)
+
+
+class PyMuPDFBlocksEngine(PyMuPDFEngine):
+    name = "pymupdf-blocks"
+
+    def _page_text(self, page: fitz.Page) -> str:
+        # (x0, y0, x1, y1, text, block_no, block_type); type 0 is text
+        return "".join(block[4] for block in page.get_text("blocks") if block[6] == 0)
+
+
+class PyMuPDFWordsEngine(PyMuPDFEngine):
+    name = "pymupdf-words"
+
+    def _page_text(self, page: fitz.Page) -> str:
+        # (x0, y0, x1, y1, word, block_no, line_no, word_no)
+        words = page.get_text("words")
+        lines = [
+            " ".join(word[4] for word in line)
+            for _, line in groupby(words, key=lambda word: (word[5], word[6]))
+        ]
+        return "".join(f"{line}\n" for line in lines)
+
+
+class PdfiumEngine:
+    name = "pdfium"
+    package = "pypdfium2"
+
+    def __init__(self):
+        # Optional dependency; only imported when the engine is selected
+        import pypdfium2
+
+        self._pdfium = pypdfium2
+
+    def page_texts(self, pdf_path: str) -> Iterator[str]:
+        pdf = self._pdfium.PdfDocument(pdf_path)
+        try:
+            for page in pdf:
+                textpage = page.get_textpage()
+                try:
+                    # pdfium ends lines with "\r\n"
+                    yield textpage.get_text_range().replace("\r\n", "\n")
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+
+
+_ENGINE_CLASSES: list[type[TextEngine]] = [
+    PyMuPDFEngine,
+    PyMuPDFFastEngine,
+    PyMuPDFBlocksEngine,
+    PyMuPDFWordsEngine,
+    PdfiumEngine,
+]
+
+TEXT_ENGINES: dict[str, type[TextEngine]] = {
+    engine.name: engine for engine in _ENGINE_CLASSES
+}
+
+
+@functools.cache
+def get_text_engine(name: str = DEFAULT_TEXT_ENGINE) -> TextEngine:
+    """
+    The engine registered under this name. Raises ValueError for an unknown
+    name and ImportError if the engine's library isn't installed.
+    """
+    try:
+        engine_class = TEXT_ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown text engine {name!r}; choose from {', '.join(TEXT_ENGINES)}"
+        ) from None
+    return engine_class()
+
+
+def available_text_engines() -> list[str]:
+    """The names of the engines whose libraries are installed."""
+    names = []
+    for name in TEXT_ENGINES:
+        try:
+            get_text_engine(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def engine_fingerprint(name: str) -> str:
+    """The engine's name and library version, for the cache fingerprints."""
+    try:
+        version = metadata.version(TEXT_ENGINES[name].package)
+    except (KeyError, metadata.PackageNotFoundError):
+        version = ""
+    return f"{name}:{version}"
@@ -0,0 +1,84 @@
+import logging
+import os
+import sqlite3
+import zlib
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """
+    Snapshots of a PDF's KVStore after each pipeline step, so a run can
+    resume from (or stop at) any step.
+
+    Snapshots are the KVStore's compact JSON, zlib-compressed, in a single
+    SQLite file that worker processes can share. They are keyed by the PDF's
+    SHA-256, its file name (plugins and record keys depend on the name) and
+    the step; each checkpointed run replaces the previous snapshots. They
+    aren't tied to a code fingerprint: after changing a step, resume from
+    that step or an earlier one.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._conn: sqlite3.Connection | None = None
+
+    def get(self, pdf_file_path: str, pdf_hash: str, step_name: str) -> str | None:
+        """The snapshot taken after this step, or None if there is none."""
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT snapshot FROM checkpoints WHERE key = ?",
+                    (self._key(pdf_file_path, pdf_hash, step_name),),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Checkpoint read failed for {pdf_file_path}: {e}")
+            return None
+        if row is None:
+            return None
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put(
+        self, pdf_file_path: str, pdf_hash: str, step_name: str, snapshot: str
+    ) -> None:
+        """Store the snapshot taken after this step."""
+        blob = zlib.compress(snapshot.encode("utf-8"), 6)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints (key, snapshot) VALUES (?, ?)",
+                    (self._key(pdf_file_path, pdf_hash, step_name), blob),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Checkpoint write failed for {pdf_file_path}: {e}")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _key(self, pdf_file_path: str, pdf_hash: str, step_name: str) -> str:
+        return f"{pdf_hash}:{os.path.basename(pdf_file_path)}:{step_name}"
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints "
+                "(key TEXT PRIMARY KEY, snapshot BLOB NOT NULL) WITHOUT ROWID"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def __getstate__(self) -> dict:
+        # Connections can't cross process boundaries; each worker reopens.
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        return state
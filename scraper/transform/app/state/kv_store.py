@@ -9,6 +9,8 @@ class KVStore:
 
     def __init__(self):
         self._data = {}
+        # key -> (value, build, build(value)); see derived()
+        self._derived = {}
 
     # ---------- core API ----------
 
@@ -32,6 +34,31 @@ class KVStore:
         """Return a shallow JSON-safe copy"""
         return dict(self._data)
 
+    def derived(self, key, build):
+        """
+        build(value) for the current value of key, computed once and reused
+        by every step that asks until the key is set to another value.
+        Derived values aren't part of the store: they are never dumped or
+        snapshotted, and needn't be JSON-serializable.
+        """
+        value = self._data.get(key)
+        cached = self._derived.get(key)
+        if cached is not None and cached[0] is value and cached[1] is build:
+            return cached[2]
+        result = build(value)
+        self._derived[key] = (value, build, result)
+        return result
+
+    # ---------- snapshots ----------
+
+    def to_json(self) -> str:
+        """Compact JSON of the whole store (see load_json)."""
+        return json.dumps(self._data, ensure_ascii=False, separators=(",", ":"))
+
+    def load_json(self, snapshot: str):
+        """Replace the store's contents with a to_json() snapshot."""
+        self._data = json.loads(snapshot)
+
     # ---------- validation ----------
 
     def _is_json_compatible(self, value) -> bool:
@@ -0,0 +1,125 @@
+import hashlib
+import logging
+import sqlite3
+import zlib
+from importlib import metadata
+from pathlib import Path
+
+from app import constants as const
+from app.pipeline.text_engines import DEFAULT_TEXT_ENGINE, engine_fingerprint
+
+# The modules that produce PDF_TEXT; their source is part of the fingerprint.
+EXTRACTOR_SOURCES = [
+    const.APP_DIR / "pipeline" / "extract_pdf_text.py",
+    const.APP_DIR / "pipeline" / "text_engines.py",
+]
+
+logger = logging.getLogger(__name__)
+
+
+def extractor_fingerprint(text_engine: str = DEFAULT_TEXT_ENGINE) -> str:
+    """
+    Fingerprint of the code that produces PDF_TEXT: the PDF text extraction
+    step, the text engine (and its library version) and the PyMuPDF version.
+    Parser and extractor changes downstream don't touch it, so they can
+    reuse the cached text.
+    """
+    h = hashlib.sha256()
+    for source in EXTRACTOR_SOURCES:
+        h.update(source.read_bytes())
+    h.update(engine_fingerprint(text_engine).encode())
+    try:
+        h.update(metadata.version("pymupdf").encode())
+    except metadata.PackageNotFoundError:
+        pass
+    return h.hexdigest()
+
+
+class TextCache:
+    """
+    Compressed store of cleaned PDF_TEXT, keyed by the PDF's SHA-256.
+
+    Backed by a single SQLite file holding zlib-compressed text, so it is
+    safe to share between worker processes. Entries written by an older
+    extractor fingerprint are never returned and can be dropped with prune().
+
+    With rebuild=True every lookup misses but fresh text is still written.
+    Text from another text engine is a miss too (it has another fingerprint).
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        rebuild: bool = False,
+        text_engine: str = DEFAULT_TEXT_ENGINE,
+    ):
+        self.db_path = Path(db_path)
+        self.rebuild = rebuild
+        self.fingerprint = extractor_fingerprint(text_engine)[:16]
+        self._conn: sqlite3.Connection | None = None
+
+    def get(self, pdf_hash: str) -> str | None:
+        """Return the cached text for this PDF hash, or None on a miss."""
+        if self.rebuild:
+            return None
+        try:
+            row = (
+                self._connect()
+                .execute("SELECT text FROM texts WHERE key = ?", (self._key(pdf_hash),))
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Text cache read failed for {pdf_hash}: {e}")
+            return None
+        if row is None:
+            return None
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put(self, pdf_hash: str, text: str) -> None:
+        """Store the cleaned text for this PDF hash."""
+        blob = zlib.compress(text.encode("utf-8"), 6)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO texts (key, text) VALUES (?, ?)",
+                    (self._key(pdf_hash), blob),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Text cache write failed for {pdf_hash}: {e}")
+
+    def prune(self) -> int:
+        """Delete text extracted by an older extractor fingerprint."""
+        if not self.db_path.exists():
+            return 0
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM texts WHERE key NOT LIKE ?", (f"{self.fingerprint}:%",)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _key(self, pdf_hash: str) -> str:
+        return f"{self.fingerprint}:{pdf_hash}"
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS texts "
+                "(key TEXT PRIMARY KEY, text BLOB NOT NULL) WITHOUT ROWID"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def __getstate__(self) -> dict:
+        # Connections can't cross process boundaries; each worker reopens.
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        return state
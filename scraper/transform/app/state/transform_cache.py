@@ -0,0 +1,100 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from importlib import metadata
+from pathlib import Path
+
+from app import constants as const
+from app.pipeline.extraction.sam_index import SAM_DATA_PATH
+from app.pipeline.text_engines import DEFAULT_TEXT_ENGINE, engine_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def pipeline_fingerprint(text_engine: str = DEFAULT_TEXT_ENGINE) -> str:
+    """
+    Fingerprint of everything that can change the pipeline's output for an
+    unchanged PDF: the application code (steps, extractors, violation
+    plugins), the text engine, the PyMuPDF version and the SAM snapshot.
+    """
+    h = hashlib.sha256()
+    for path in sorted(const.APP_DIR.rglob("*.py")):
+        h.update(path.relative_to(const.APP_DIR).as_posix().encode())
+        h.update(path.read_bytes())
+    try:
+        h.update(metadata.version("pymupdf").encode())
+    except metadata.PackageNotFoundError:
+        pass
+    h.update(engine_fingerprint(text_engine).encode())
+    if SAM_DATA_PATH.exists():
+        h.update(SAM_DATA_PATH.read_bytes())
+    return h.hexdigest()
+
+
+class TransformCache:
+    """
+    Persistent cache of pipeline results (LICENSE_JSON_DATA) per PDF.
+
+    Entries are keyed by the PDF's SHA-256 and file name (plugins and the
+    `file_name` field depend on the name), and grouped in a directory per
+    pipeline fingerprint, so any code, plugin, text engine or SAM snapshot
+    change invalidates the whole cache.
+
+    With rebuild=True every lookup misses but fresh results are still
+    written, which forces a full run and repopulates the cache.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        rebuild: bool = False,
+        text_engine: str = DEFAULT_TEXT_ENGINE,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.rebuild = rebuild
+        self.fingerprint = pipeline_fingerprint(text_engine)
+        self.entries_dir = self.cache_dir / self.fingerprint[:16]
+
+    def get(self, pdf_file_path: str, pdf_hash: str) -> list | None:
+        """Return the cached records for this PDF, or None on a miss."""
+        if self.rebuild:
+            return None
+        path = self._entry_path(pdf_file_path, pdf_hash)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def put(self, pdf_file_path: str, pdf_hash: str, records: list) -> None:
+        """Store the records for this PDF (atomic, safe across processes)."""
+        path = self._entry_path(pdf_file_path, pdf_hash)
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.entries_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(records, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {path}: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+
+    def prune(self) -> int:
+        """Delete entries left behind by older pipeline fingerprints."""
+        if not self.cache_dir.exists():
+            return 0
+        removed = 0
+        for child in self.cache_dir.iterdir():
+            if child.is_dir() and child != self.entries_dir:
+                shutil.rmtree(child, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def _entry_path(self, pdf_file_path: str, pdf_hash: str) -> Path:
+        return self.entries_dir / f"{pdf_hash}_{os.path.basename(pdf_file_path)}.json"
@@ -1,4 +1,5 @@
 import csv
+import functools
 import json
 import os
 import re
@@ -84,35 +85,73 @@ STREET_SUFFIX_FULL = [
 ]
 
 
+NEIGHBORHOODS = [
+    "Allston",
+    "Boston",
+    "Brighton",
+    "Charlestown",
+    "Chestnut Hill",
+    "Dorchester",
+    "East Boston",
+    "Hyde Park",
+    "Jamaica Plain",
+    "Mattapan",
+    "Mission Hill",
+    "Quincy",
+    "Roslindale",
+    "Roxbury",
+    "South Boston",
+    "West Roxbury",
+    "Back Bay",
+]
+
+# Suffix lookup maps (case-insensitive), built once
+FULL_TO_ABBR = {
+    f.lower(): a for f, a in zip(STREET_SUFFIX_FULL, STREET_SUFFIX_ABBR, strict=True)
+}
+ABBR_SET = {a.lower(): a for a in STREET_SUFFIX_ABBR}
+
+# Nonstandard suffix spellings seen in the source data that aren't in
+# SAM's canonical list, mapped to the canonical abbreviation.
+SUFFIX_ALIASES = {"av": "Ave"}
+
+STATE_RE = re.compile(r"\b([A-Za-z]{2})\b,?(?:\s+\d{5})?$")
+NUMBER_HYPHEN_RE = re.compile(r"\s*-\s*")
+TRAILING_PUNCT_RE = re.compile(r"[.,]+$")
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Parsed addresses kept per parser; venues recur across many minutes.
+PARSE_CACHE_SIZE = 4096
+
+
 class BostonAddressParser:
     def __init__(self):
-        self.neighborhoods = [
-            "Allston",
-            "Boston",
-            "Brighton",
-            "Charlestown",
-            "Chestnut Hill",
-            "Dorchester",
-            "East Boston",
-            "Hyde Park",
-            "Jamaica Plain",
-            "Mattapan",
-            "Mission Hill",
-            "Quincy",
-            "Roslindale",
-            "Roxbury",
-            "South Boston",
-            "West Roxbury",
-            "Back Bay",
+        self.neighborhoods = list(NEIGHBORHOODS)
+        self._neighborhoods_by_length = [
+            (n, n.lower()) for n in sorted(self.neighborhoods, key=len, reverse=True)
         ]
+        self._parse_cached = functools.lru_cache(maxsize=PARSE_CACHE_SIZE)(self._parse)
 
     def parse_address(self, address):
+        if isinstance(address, str):
+            # Copy so callers can't modify the cached result
+            return dict(self._parse_cached(address))
+        return self._parse(address)
+
+    def _parse(self, address):
+        # Each component is computed once and shared with the ones that
+        # depend on it (the street name needs the number and neighborhood).
+        street_number = self.extract_street_number(address)
+        neighborhood = self.extract_neighborhood(address)
+
         normalized_address = {}
         normalized_address["street_number"] = self._normalize_street_number(
-            self.extract_street_number(address)
+            street_number
         )
-        normalized_address["full_street_name"] = self.extract_full_street_name(address)
-        normalized_address["neighborhood"] = self.extract_neighborhood(address)
+        normalized_address["full_street_name"] = self._street_name_between(
+            address, street_number, neighborhood
+        )
+        normalized_address["neighborhood"] = neighborhood
         # Default to "MA" only for real address strings; keep None for
         # non-string input, consistent with the other extractors.
         state = self.extract_state(address)
@@ -126,7 +165,7 @@ class BostonAddressParser:
         if not isinstance(address, str):
             return None
 
-        match = re.search(r"\b([A-Za-z]{2})\b,?(?:\s+\d{5})?$", address.strip())
+        match = STATE_RE.search(address.strip())
         if match:
             return match.group(1).upper()
         return None
@@ -155,7 +194,6 @@ class BostonAddressParser:
         return None
 
     def extract_neighborhood(self, address: str):
-        neighborhoods_sorted = sorted(self.neighborhoods, key=len, reverse=True)
         if not isinstance(address, str):
             return None
         farthest_idx = -1
@@ -164,8 +202,7 @@ class BostonAddressParser:
         addr_lower = address.lower()
 
         # Check neighborhoods in descending length order
-        for neighborhood in neighborhoods_sorted:
-            neighborhood_lower = neighborhood.lower()
+        for neighborhood, neighborhood_lower in self._neighborhoods_by_length:
             idx = addr_lower.rfind(neighborhood_lower)
             if idx > farthest_idx:
                 # print(f"Found {neighborhood} at index {idx}")
@@ -183,14 +220,22 @@ class BostonAddressParser:
         if not isinstance(address, str):
             return None
 
-        addr_lower = address.lower()
+        return self._street_name_between(
+            address,
+            self.extract_street_number(address),
+            self.extract_neighborhood(address),
+        )
+
+    def _street_name_between(self, address, street_number, town):
+        """The street name between the street number (or start) and the town."""
+        if not isinstance(address, str):
+            return None
 
-        town = self.extract_neighborhood(address)
         if town is None:
             return None
 
-        # Get street number if any
-        street_number = self.extract_street_number(address)
+        addr_lower = address.lower()
+
         if street_number is None:
             start_idx = 0
         else:
@@ -253,30 +298,19 @@ class BostonAddressParser:
         if not sn:
             return sn
         # Collapse spaces around an internal hyphen: "268 - 270" -> "268-270"
-        s = re.sub(r"\s*-\s*", "-", sn.strip())
+        s = NUMBER_HYPHEN_RE.sub("-", sn.strip())
         # Uppercase any letter suffix: "605a" -> "605A"
         return s.upper()
 
     def normalize_street_suffix(self, street_name: str) -> str:
-        # Build lookup maps (case-insensitive)
-        FULL_TO_ABBR = {
-            f.lower(): a
-            for f, a in zip(STREET_SUFFIX_FULL, STREET_SUFFIX_ABBR, strict=True)
-        }
-        ABBR_SET = {a.lower(): a for a in STREET_SUFFIX_ABBR}
-
-        # Nonstandard suffix spellings seen in the source data that aren't in
-        # SAM's canonical list, mapped to the canonical abbreviation.
-        SUFFIX_ALIASES = {"av": "Ave"}
-
         if not isinstance(street_name, str):
             return street_name
 
         s = street_name.strip()
 
         # remove trailing punctuation and collapse spaces
-        s = re.sub(r"[.,]+$", "", s)
-        s = re.sub(r"\s+", " ", s)
+        s = TRAILING_PUNCT_RE.sub("", s)
+        s = WHITESPACE_RE.sub(" ", s)
 
         parts = s.split(" ")
         last = parts[-1].lower()
@@ -300,6 +334,12 @@ class BostonAddressParser:
         return s
 
 
+@functools.cache
+def get_parser() -> BostonAddressParser:
+    """The shared parser, so its tables and parse cache outlive one record."""
+    return BostonAddressParser()
+
+
 ####################################################################
 # THIS CODE IS NOT USED IN THE PARSER, IT IS JUST FOR TESTING
 ####################################################################
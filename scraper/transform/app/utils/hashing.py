@@ -0,0 +1,15 @@
+"""Content hashing helpers shared by the on-disk caches."""
+
+import hashlib
+from pathlib import Path
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_file(path: str | Path) -> str:
+    """Return the hex SHA-256 of a file's contents, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
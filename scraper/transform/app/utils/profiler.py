@@ -0,0 +1,96 @@
+"""Run-wide timing profile for pipeline steps and extractors.
+
+Each pipeline step and extractor records its wall time, call count and the
+size of the input it worked on (text length, lines, chunks). A Profiler is
+cheap to pass around, and its plain-dict form can be sent back from worker
+processes and merged, so one profile covers every PDF in a run.
+"""
+
+import csv
+import json
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+SIZE_FIELDS = ["text_len", "lines", "chunks"]
+CSV_FIELDS = ["name", "calls", "total_s", "mean_ms", "max_ms", *SIZE_FIELDS]
+
+
+class Profiler:
+    """Aggregates timings per name (e.g. "step.HearingTextExtractorStep")."""
+
+    def __init__(self):
+        self._stats: dict[str, dict] = {}
+
+    def record(self, name: str, elapsed: float, **sizes: int) -> None:
+        entry = self._stats.get(name)
+        if entry is None:
+            entry = {"calls": 0, "total_s": 0.0, "max_s": 0.0}
+            entry.update(dict.fromkeys(SIZE_FIELDS, 0))
+            self._stats[name] = entry
+        entry["calls"] += 1
+        entry["total_s"] += elapsed
+        entry["max_s"] = max(entry["max_s"], elapsed)
+        for key, value in sizes.items():
+            entry[key] += value
+
+    @contextmanager
+    def measure(self, name: str, **sizes: int) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, **sizes)
+
+    def merge(self, stats: dict[str, dict]) -> None:
+        """Fold in another profiler's as_dict() (e.g. from a worker)."""
+        for name, other in stats.items():
+            entry = self._stats.setdefault(name, dict.fromkeys(other, 0))
+            for key, value in other.items():
+                if key == "max_s":
+                    entry[key] = max(entry[key], value)
+                else:
+                    entry[key] += value
+
+    def as_dict(self) -> dict[str, dict]:
+        return {name: dict(entry) for name, entry in sorted(self._stats.items())}
+
+    def rows(self) -> list[dict]:
+        """One summary row per name, slowest (by total time) first."""
+        rows = []
+        for name, entry in self._stats.items():
+            calls = entry["calls"] or 1
+            rows.append(
+                {
+                    "name": name,
+                    "calls": entry["calls"],
+                    "total_s": round(entry["total_s"], 6),
+                    "mean_ms": round(entry["total_s"] / calls * 1000, 3),
+                    "max_ms": round(entry["max_s"] * 1000, 3),
+                    **{key: entry[key] for key in SIZE_FIELDS},
+                }
+            )
+        rows.sort(key=lambda r: (-r["total_s"], r["name"]))
+        return rows
+
+    def top(self, n: int = 10) -> list[dict]:
+        return self.rows()[:n]
+
+    def write(self, json_path: Path, csv_path: Path) -> None:
+        rows = self.rows()
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def format_top(self, n: int = 10) -> str:
+        lines = [f"{'name':<45} {'calls':>7} {'total s':>9} {'mean ms':>9}"]
+        for row in self.top(n):
+            lines.append(
+                f"{row['name']:<45} {row['calls']:>7} "
+                f"{row['total_s']:>9.3f} {row['mean_ms']:>9.3f}"
+            )
+        return "\n".join(lines)
@@ -5,6 +5,9 @@ from abc import ABC, abstractmethod
 
 class Plugin(ABC):
     priority = 100  # lower runs first
+    # Meeting the plugin fixes, e.g. "voting_minutes_2024-09-26" (matches every
+    # _vN revision). None means the plugin is queried for every PDF.
+    target: str | None = None
 
     @abstractmethod
     def query(self, store: dict) -> bool:
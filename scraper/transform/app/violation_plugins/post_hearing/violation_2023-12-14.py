@@ -7,10 +7,11 @@ from app.violation_plugins.base import Plugin
 
 class Violation_2023_12_14(Plugin):
     priority = 10
+    target = "voting_minutes_2023-12-14"
 
     def query(self, store):
         pdf_file_path = store.get(const.PDF_FILE_PATH)
-        if "voting_minutes_2023-12-14" in pdf_file_path:
+        if self.target in pdf_file_path:
             return True
         return False
 
@@ -9,10 +9,11 @@ from app.violation_plugins.base import Plugin
 
 class Violation_2020_09_10(Plugin):
     priority = 10
+    target = "voting_minutes_2020-09-10"
 
     def query(self, store):
         pdf_file_path = store.get(const.PDF_FILE_PATH)
-        if "voting_minutes_2020-09-10" in pdf_file_path:
+        if self.target in pdf_file_path:
             return True
         return False
 
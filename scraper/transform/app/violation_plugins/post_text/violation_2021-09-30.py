@@ -8,10 +8,11 @@ from app.violation_plugins.base import Plugin
 
 class Violation_2021_09_30(Plugin):
     priority = 10
+    target = "voting_minutes_2021-09-30"
 
     def query(self, store):
         pdf_file_path = store.get(const.PDF_FILE_PATH)
-        if "voting_minutes_2021-09-30" in pdf_file_path:
+        if self.target in pdf_file_path:
             return True
         return False
 
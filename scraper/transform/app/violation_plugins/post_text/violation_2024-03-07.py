@@ -9,10 +9,11 @@ from app.violation_plugins.base import Plugin
 
 class Violation_2024_03_07(Plugin):
     priority = 10
+    target = "voting_minutes_2024-03-07"
 
     def query(self, store):
         pdf_file_path = store.get(const.PDF_FILE_PATH)
-        if "voting_minutes_2024-03-07" in pdf_file_path:
+        if self.target in pdf_file_path:
             return True
         return False
 
@@ -11,10 +11,11 @@ from app.violation_plugins.base import Plugin
 
 class Violation_2025_05_01(Plugin):
     priority = 10
+    target = "voting_minutes_2025-05-01"
 
     def query(self, store):
         pdf_file_path = store.get(const.PDF_FILE_PATH)
-        if "voting_minutes_2025-05-01" in pdf_file_path:
+        if self.target in pdf_file_path:
             return True
         return False
 
@@ -0,0 +1,158 @@
+"""Deterministic synthetic corpus for the benchmarks.
+
+Everything here is generated from a fixed seed, so every run (and every
+machine) benchmarks the same minutes text, PDFs, addresses and SAM rows.
+Nothing is downloaded; the PDFs are written locally with PyMuPDF.
+"""
+
+import csv
+import random
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from app.pipeline.extraction.sam_index import SAM_FIELDS
+
+SEED = 20250101
+
+BUSINESS_WORDS = [
+    "Harbor", "Liberty", "Granite", "Beacon", "Copley", "Fenway", "Summit",
+    "Maverick", "Commonwealth", "Emerald", "Bunker", "Neponset", "Franklin",
+]  # fmt: skip
+BUSINESS_SUFFIXES = ["LLC", "Inc.", "Corp.", "Restaurant Group, LLC"]
+STREETS = [
+    ("Blue Hill", "Ave", "Dorchester", "02121"),
+    ("Washington", "St", "Roxbury", "02119"),
+    ("Centre", "St", "Jamaica Plain", "02130"),
+    ("Bennington", "St", "East Boston", "02128"),
+    ("Dorchester", "Ave", "South Boston", "02127"),
+    ("Hyde Park", "Ave", "Hyde Park", "02136"),
+    ("Tremont", "St", "Boston", "02116"),
+    ("Cambridge", "St", "Allston", "02134"),
+    ("Columbia", "Rd", "Dorchester", "02125"),
+    ("Main", "St", "Charlestown", "02129"),
+]
+LICENSE_TYPES = [
+    "Common Victualler 7 Day All Alcoholic Beverages License",
+    "Common Victualler 7 Day Wines and Malt Beverages License",
+    "Common Victualler License",
+]
+STATUSES = [
+    "Granted",
+    "Deferred",
+    "Deferred to allow for completion of the community process",
+    "Continued",
+    "Withdrawn",
+    "Rescheduled to the next hearing",
+    "Rejected",
+]
+LINES_PER_PAGE = 60
+
+
+def _address(rng: random.Random) -> str:
+    name, suffix, neighborhood, zipcode = rng.choice(STREETS)
+    number = rng.randint(1, 1800)
+    if rng.random() < 0.15:
+        number_text = f"{number}-{number + 4}"
+    else:
+        number_text = str(number)
+    return f"{number_text} {name} {suffix}, {neighborhood}, MA {zipcode}"
+
+
+def addresses(count: int = 500, seed: int = SEED) -> list[str]:
+    """Distinct-ish venue addresses in the format the minutes use."""
+    rng = random.Random(seed)
+    return [_address(rng) for _ in range(count)]
+
+
+def minutes_text(entries: int, seed: int = SEED) -> str:
+    """Voting-minutes text with a transactional hearing of `entries` items."""
+    rng = random.Random(seed)
+    lines = [
+        "City of Boston",
+        "Licensing Board",
+        "Voting Hearing Agenda",
+        "Licensed Premise Inspection Hearing on Tuesday, September 30, 2025",
+    ]
+    for i in range(1, 6):
+        lines += [
+            f"{i}. {rng.choice(BUSINESS_WORDS)} Venues, LLC",
+            f"Doing business as: {rng.choice(BUSINESS_WORDS)} Bar",
+            f"Location: {_address(rng)}",
+            f"License#: LB-{rng.randint(10000, 99999)}, Category: CV7AL",
+            "Notice: Assault and battery in violation of M.G.L. ch. 138 s. 64.",
+            "No Violation",
+            "_" * 60,
+        ]
+    lines.append("Transactional Hearing on Wednesday, October 1, 2025")
+    for i in range(1, entries + 1):
+        name = f"{rng.choice(BUSINESS_WORDS)} {rng.choice(BUSINESS_WORDS)}"
+        lines += [
+            f"{i}. {name} {rng.choice(BUSINESS_SUFFIXES)}",
+            f"Doing business as: {name} Kitchen",
+            _address(rng),
+            f"License #: LB-{rng.randint(100000, 699999)}",
+            f"Has applied for a {rng.choice(LICENSE_TYPES)} to be exercised on the",
+            "above - Full-service restaurant with seating for 40 guests.",
+            f"Manager: {rng.choice(BUSINESS_WORDS)} {rng.choice(BUSINESS_WORDS)}",
+            f"Attorney: {rng.choice(BUSINESS_WORDS)} Esq.",
+            "Hours of Operation: 11:00 AM to 1:00 AM",
+            rng.choice(STATUSES),
+            "",
+        ]
+    lines += [
+        "Non-Hearing Transactional Items:",
+        "1. The Board is in receipt of correspondence from a licensee.",
+        "Acknowledged",
+    ]
+    return "\n".join(lines)
+
+
+def write_pdf(text: str, path: Path) -> Path:
+    """Write text to a PDF, one line per text row, LINES_PER_PAGE per page."""
+    doc = fitz.open()
+    lines = text.split("\n")
+    for start in range(0, len(lines), LINES_PER_PAGE):
+        page = doc.new_page()
+        for row, line in enumerate(lines[start : start + LINES_PER_PAGE]):
+            if line:
+                page.insert_text((36, 36 + row * 12), line, fontsize=9)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def write_pdf_corpus(directory: Path, count: int = 8, entries: int = 40) -> list[Path]:
+    """Write `count` minutes PDFs (distinct meeting dates) to `directory`."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        text = minutes_text(entries, seed=SEED + i)
+        path = directory / f"voting_minutes_2030-01-{i + 1:02d}.pdf"
+        paths.append(write_pdf(text, path))
+    return paths
+
+
+def write_sam_csv(path: Path, rows: int = 50_000, seed: int = SEED) -> Path:
+    """Write a synthetic SAM snapshot with the real snapshot's columns."""
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SAM_FIELDS)
+        writer.writeheader()
+        for i in range(rows):
+            name, suffix, _, zipcode = STREETS[i % len(STREETS)]
+            number = i // len(STREETS) + 1
+            is_range = rng.random() < 0.1
+            writer.writerow(
+                {
+                    "SAM_ADDRESS_ID": str(100000 + i),
+                    "BUILDING_ID": str(200000 + i // 3),
+                    "STREET_NUMBER": f"{number}-{number + 4}" if is_range else number,
+                    "FULL_STREET_NAME": f"{name} {suffix}",
+                    "ZIP_CODE": zipcode,
+                    "IS_RANGE": "1" if is_range else "0",
+                    "RANGE_FROM": number if is_range else "",
+                    "RANGE_TO": number + 4 if is_range else "",
+                }
+            )
+    return path
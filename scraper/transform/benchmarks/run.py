@@ -0,0 +1,468 @@
+"""Benchmark harness for the transform pipeline.
+
+Runs the whole pipeline, each step, each extractor, address parsing and SAM
+lookups against the fixed synthetic corpus in `benchmarks.corpus`. Reports
+throughput and peak memory, and compares them to `baseline.json`.
+Throughput is compared relative to a fixed reference workload timed just
+before each benchmark, so the baseline holds on machines faster or slower
+than the one that recorded it. Exits non-zero if any benchmark regresses
+beyond the tolerance, unless --report-only is given. Runs fully offline:
+
+    uv run python -m benchmarks.run
+    uv run python -m benchmarks.run --update-baseline
+"""
+
+import argparse
+import json
+import logging
+import platform
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+from app import constants as const
+from app.pipeline.document import Document
+from app.pipeline.extract_license_text import LicenseTextExtractorStep
+from app.pipeline.extraction import sam_index, sam_matcher
+from app.pipeline.extraction.context import ExtractionContext
+from app.pipeline.extraction.json_pipeline import EXTRACTORS
+from app.pipeline.pipeline import build_steps, run_pipeline, step_display_name
+from app.state.kv_store import KVStore
+from app.utils.boston_address_parser import BostonAddressParser
+from benchmarks import corpus
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.30
+# Peak-memory growth below this is treated as noise.
+MEMORY_SLACK_KIB = 256
+# Minimum wall time per timed sample.
+MIN_SAMPLE_S = 0.05
+
+
+@dataclass
+class Benchmark:
+    """A timed unit of work: `run(setup())` processes `count` items."""
+
+    name: str
+    unit: str
+    count: int
+    run: Callable[[Any], object]
+    setup: Callable[[], Any] = lambda: None
+
+
+def measure(bench: Benchmark, repeats: int) -> dict:
+    """
+    Best-of-N throughput, plus peak traced (Python heap) memory from one
+    extra pass. Each timed sample repeats the benchmark until it has run for
+    at least MIN_SAMPLE_S, so very fast benchmarks aren't dominated by noise.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        elapsed, runs = 0.0, 0
+        while elapsed < MIN_SAMPLE_S:
+            arg = bench.setup()
+            start = time.perf_counter()
+            bench.run(arg)
+            elapsed += time.perf_counter() - start
+            runs += 1
+        best = min(best, elapsed / runs)
+
+    arg = bench.setup()
+    tracemalloc.start()
+    try:
+        bench.run(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "unit": bench.unit,
+        "count": bench.count,
+        "best_s": round(best, 6),
+        "throughput": round(bench.count / best, 2) if best > 0 else 0.0,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+# ---------- benchmark definitions ----------
+
+
+def _reference_benchmark() -> Benchmark:
+    """
+    Plain-Python string, regex and dict work that doesn't depend on this
+    repo's code, to measure how fast the current machine is.
+    """
+    words = [f"Licensee {i} d/b/a Venue {i % 97}, {i} Main St" for i in range(2000)]
+    pattern = re.compile(r"(\d+) Main St")
+
+    def run(_) -> None:
+        counts: dict[str, int] = {}
+        for word in words:
+            match = pattern.search(word)
+            key = word.split(",", 1)[0].upper() if match else word
+            counts[key] = counts.get(key, 0) + 1
+        sorted(counts.items())
+
+    return Benchmark("reference", "ops/sec", len(words), run)
+
+
+def _step_states(pdf_paths: list[str]) -> list[list[dict]]:
+    """For each PDF, the KVStore contents before each step runs."""
+    states = []
+    for pdf_path in pdf_paths:
+        store = KVStore()
+        store.set(const.PDF_FILE_PATH, pdf_path)
+        before = []
+        for step in build_steps(store):
+            before.append(store.as_dict())
+            if not step.run().proceed:
+                break
+        states.append(before)
+    return states
+
+
+def _store_from(state: dict) -> KVStore:
+    store = KVStore()
+    for key, value in state.items():
+        store.set(key, value)
+    return store
+
+
+def _step_benchmarks(pdf_paths: list[str]) -> list[Benchmark]:
+    states = _step_states(pdf_paths)
+    names = [step_display_name(step) for step in build_steps(_store_from(states[0][0]))]
+    benches = []
+    for index, name in enumerate(names):
+        inputs = [before[index] for before in states if len(before) > index]
+
+        def setup(inputs=inputs, index=index) -> list:
+            return [build_steps(_store_from(state))[index] for state in inputs]
+
+        def run(steps: list) -> None:
+            for step in steps:
+                step.run()
+
+        benches.append(Benchmark(f"step.{name}", "pdfs/sec", len(inputs), run, setup))
+    return benches
+
+
+def _chunk_documents(pdf_paths: list[str]) -> list[Document]:
+    chunks = []
+    for pdf_path in pdf_paths:
+        store = KVStore()
+        store.set(const.PDF_FILE_PATH, pdf_path)
+        for step in build_steps(store):
+            step.run()
+            if isinstance(step, LicenseTextExtractorStep):
+                break
+        for content in (store.get(const.LICENSE_TEXT_DATA) or {}).values():
+            doc = Document(content)
+            if ExtractionContext.from_document(doc, {}).lines:
+                chunks.append(doc)
+    return chunks
+
+
+def _extractor_benchmarks(chunks: list[Document]) -> list[Benchmark]:
+    benches = []
+    for index, extractor in enumerate(EXTRACTORS):
+
+        def setup(index=index) -> list[ExtractionContext]:
+            # Bring each context to the state this extractor normally sees.
+            contexts = []
+            for doc in chunks:
+                ctx = ExtractionContext.from_document(doc, {})
+                for earlier in EXTRACTORS[:index]:
+                    earlier.run(ctx)
+                contexts.append(ctx)
+            return contexts
+
+        def run(contexts: list, extractor=extractor) -> None:
+            for ctx in contexts:
+                extractor.run(ctx)
+
+        name = f"extractor.{extractor.__class__.__name__}"
+        benches.append(Benchmark(name, "records/sec", len(chunks), run, setup))
+    return benches
+
+
+def build_benchmarks(workdir: Path) -> list[Benchmark]:
+    pdf_paths = [str(p) for p in corpus.write_pdf_corpus(workdir / "pdfs")]
+    record_count = sum(len(run_pipeline(p)) for p in pdf_paths)
+
+    def run_all(_) -> None:
+        for pdf_path in pdf_paths:
+            run_pipeline(pdf_path)
+
+    benches = [
+        Benchmark("pipeline.run_pipeline", "pdfs/sec", len(pdf_paths), run_all),
+        Benchmark(
+            "pipeline.run_pipeline.records", "records/sec", record_count, run_all
+        ),
+    ]
+
+    def setup_stores() -> list[KVStore]:
+        return [_store_from({const.PDF_FILE_PATH: p}) for p in pdf_paths]
+
+    def build_all(stores: list[KVStore]) -> None:
+        for store in stores:
+            build_steps(store)
+
+    # Per-PDF step construction (e.g. plugin discovery), outside the step runs
+    benches.append(
+        Benchmark(
+            "pipeline.build_steps", "pdfs/sec", len(pdf_paths), build_all, setup_stores
+        )
+    )
+    benches += _step_benchmarks(pdf_paths)
+    benches += _extractor_benchmarks(_chunk_documents(pdf_paths))
+
+    # Venues recur across many minutes, so repeat a smaller set of addresses.
+    addresses = corpus.addresses(500) * 10
+    parser = BostonAddressParser()
+
+    def parse_all(_) -> None:
+        for address in addresses:
+            parser.parse_address(address)
+
+    def parse_all_uncached(_) -> None:
+        for address in addresses:
+            parser._parse(address)
+
+    benches += [
+        Benchmark("address.parse_address", "lookups/sec", len(addresses), parse_all),
+        Benchmark(
+            "address.parse_address.uncached",
+            "lookups/sec",
+            len(addresses),
+            parse_all_uncached,
+        ),
+    ]
+
+    sam_csv = corpus.write_sam_csv(workdir / "sam_addresses.csv")
+    parsed = [parser.parse_address(a) for a in corpus.addresses(2000)]
+    keys = [
+        (p["street_number"].split("-")[0], p["full_street_name"], p["zipcode"])
+        for p in parsed
+        if p["street_number"] and p["full_street_name"] and p["zipcode"]
+    ]
+
+    def load_index(_) -> None:
+        sam_index._build_index(sam_csv)
+
+    def setup_lookup() -> None:
+        sam_index._index = sam_index._build_index(sam_csv)
+
+    def lookup_all(_) -> None:
+        for key in keys:
+            sam_index.lookup(*key)
+
+    sam_db = workdir / "sam_addresses.sqlite"
+    sam_index.build_db(sam_csv, sam_db)
+
+    def open_db(_) -> None:
+        sam_index._open_db(sam_db, sam_csv).get(("1", "", ""))
+
+    def setup_db_lookup() -> None:
+        sam_index._index = sam_index._open_db(sam_db, sam_csv)
+
+    # Near misses for the secondary matcher: numbers inside SAM ranges and
+    # street names without their suffix.
+    near_misses = [
+        (str(int(number) + 2) if number.isdigit() else number, name, zipcode)
+        for number, name, zipcode in keys
+    ] + [(number, name.rsplit(" ", 1)[0], zipcode) for number, name, zipcode in keys]
+
+    def setup_match() -> None:
+        sam_index._index = sam_index._build_index(sam_csv)
+        sam_matcher._matcher = sam_matcher._build_matcher(sam_csv)
+
+    def match_all(_) -> None:
+        for key in near_misses:
+            sam_matcher.match(*key)
+
+    benches += [
+        Benchmark("sam_index.load", "rows/sec", 50_000, load_index),
+        Benchmark(
+            "sam_index.lookup", "lookups/sec", len(keys), lookup_all, setup_lookup
+        ),
+        Benchmark("sam_index.load.db", "opens/sec", 1, open_db),
+        Benchmark(
+            "sam_index.lookup.db", "lookups/sec", len(keys), lookup_all, setup_db_lookup
+        ),
+        Benchmark(
+            "sam_matcher.match", "lookups/sec", len(near_misses), match_all, setup_match
+        ),
+    ]
+    return benches
+
+
+# ---------- baseline comparison ----------
+
+
+def measure_all(benches: list[Benchmark], repeats: int) -> dict:
+    """
+    Measure each benchmark right after the reference workload and record its
+    throughput as a multiple of the reference's, so that both machine speed
+    and load changes during the run mostly cancel out.
+    """
+    reference = _reference_benchmark()
+    results = {}
+    for bench in benches:
+        base = measure(reference, repeats)["throughput"]
+        result = measure(bench, repeats)
+        result["relative"] = round(result["throughput"] / base, 6)
+        results[bench.name] = result
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return a message for every benchmark that regressed past the tolerance."""
+    regressions = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            regressions.append(f"{name}: missing from this run")
+            continue
+        if "relative" not in base:
+            regressions.append(f"{name}: baseline has no relative throughput")
+            continue
+        floor = base["relative"] * (1 - tolerance)
+        if current["relative"] < floor:
+            regressions.append(
+                f"{name}: {current['relative']:.4g}x reference "
+                f"< {floor:.4g}x (baseline {base['relative']:.4g}x)"
+            )
+        ceiling = base["peak_kib"] * (1 + tolerance) + MEMORY_SLACK_KIB
+        if current["peak_kib"] > ceiling:
+            regressions.append(
+                f"{name}: peak {current['peak_kib']:.0f} KiB "
+                f"> {ceiling:.0f} KiB (baseline {base['peak_kib']:.0f} KiB)"
+            )
+    return regressions
+
+
+def _environment() -> dict:
+    try:
+        pymupdf = metadata.version("pymupdf")
+    except metadata.PackageNotFoundError:
+        pymupdf = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pymupdf": pymupdf,
+    }
+
+
+def _format_table(results: dict, baseline: dict) -> str:
+    lines = [f"{'benchmark':<48} {'throughput':>16} {'vs base':>8} {'peak KiB':>10}"]
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base and "relative" in base:
+            ratio = f"{r['relative'] / base['relative']:.2f}x"
+        else:
+            ratio = "new"
+        lines.append(
+            f"{name:<48} {r['throughput']:>10.1f} {r['unit'].split('/')[0]:>5} "
+            f"{ratio:>8} {r['peak_kib']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Transform pipeline benchmarks")
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Timed runs per benchmark; the best is kept (default: 3)",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_PATH,
+        help="Baseline JSON to compare against",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed fractional slowdown / memory growth (default: 0.30)",
+    )
+    parser.add_argument(
+        "--report-only",
+        action="store_true",
+        help="Report regressions without exiting non-zero",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write this run's results into the baseline",
+    )
+    parser.add_argument("--output", type=Path, help="Also write results to a JSON file")
+    parser.add_argument(
+        "--filter", default="", help="Only run benchmarks whose name contains this"
+    )
+    args = parser.parse_args(argv)
+
+    # Pipeline warnings (e.g. no SAM snapshot) would drown out the report.
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saved_index, saved_matcher = sam_index._index, sam_matcher._matcher
+        try:
+            benches = [b for b in build_benchmarks(Path(tmp)) if args.filter in b.name]
+            results = measure_all(benches, args.repeats)
+        finally:
+            sam_index._index, sam_matcher._matcher = saved_index, saved_matcher
+    logging.disable(logging.NOTSET)
+
+    baseline_doc = {}
+    if args.baseline.exists():
+        baseline_doc = json.loads(args.baseline.read_text(encoding="utf-8"))
+    baseline = {
+        name: entry
+        for name, entry in baseline_doc.get("benchmarks", {}).items()
+        if args.filter in name
+    }
+
+    print(_format_table(results, baseline))
+    document = {"environment": _environment(), "benchmarks": results}
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+    if args.update_baseline:
+        # A filtered run only replaces the benchmarks it ran; a full run
+        # drops benchmarks that no longer exist.
+        merged = results
+        if args.filter:
+            merged = {**baseline_doc.get("benchmarks", {}), **results}
+        document = {"environment": _environment(), "benchmarks": merged}
+        args.baseline.write_text(
+            json.dumps(document, indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("\nNo baseline to compare against; run with --update-baseline.")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nREGRESSIONS (tolerance {args.tolerance:.0%}):")
+        for message in regressions:
+            print(f"  - {message}")
+        return 0 if args.report_only else 1
+    print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Speed and equality comparison of the PDF text engines.
+
+For every installed engine in `app.pipeline.text_engines`, times page
+extraction and checks whether the pipeline produces the same cleaned text
+and the same records as the default engine. Uses the synthetic corpus unless
+`--dir` points at real minutes:
+
+    uv run python -m benchmarks.text_engines
+    uv run python -m benchmarks.text_engines --dir ../scrape/data/voting_minutes_pdfs
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from app import constants as const
+from app.pipeline.extract_pdf_text import PDFTextExtractorStep
+from app.pipeline.pipeline import run_pipeline
+from app.pipeline.text_engines import (
+    DEFAULT_TEXT_ENGINE,
+    available_text_engines,
+    get_text_engine,
+)
+from app.state.kv_store import KVStore
+from benchmarks import corpus
+from benchmarks.run import Benchmark, measure
+
+
+def _readable(pdf_paths: list[str]) -> tuple[list[str], int]:
+    """The PDFs the default engine can open, and their total page count."""
+    engine = get_text_engine(DEFAULT_TEXT_ENGINE)
+    readable, pages = [], 0
+    for pdf_path in pdf_paths:
+        try:
+            pages += sum(1 for _ in engine.page_texts(pdf_path))
+        except Exception as e:
+            print(f"Skipping {pdf_path}: {e}", file=sys.stderr)
+            continue
+        readable.append(pdf_path)
+    return readable, pages
+
+
+def _clean_text(pdf_path: str, engine_name: str) -> str | None:
+    store = KVStore()
+    store.set(const.PDF_FILE_PATH, pdf_path)
+    PDFTextExtractorStep(store, engine=get_text_engine(engine_name)).run()
+    return store.get(const.PDF_TEXT)
+
+
+def compare_engines(pdf_paths: list[str], repeats: int) -> list[dict]:
+    """One row per installed engine: pages/sec and equality with the default."""
+    pdf_paths, pages = _readable(pdf_paths)
+    expected_text = [_clean_text(p, DEFAULT_TEXT_ENGINE) for p in pdf_paths]
+    expected_records = [run_pipeline(p) for p in pdf_paths]
+    rows = []
+    for name in available_text_engines():
+        engine = get_text_engine(name)
+
+        def run(_, engine=engine) -> None:
+            for pdf_path in pdf_paths:
+                for _ in engine.page_texts(pdf_path):
+                    pass
+
+        result = measure(Benchmark(name, "pages/sec", pages, run), repeats)
+        texts = [_clean_text(p, name) for p in pdf_paths]
+        records = [run_pipeline(p, text_engine=name) for p in pdf_paths]
+        rows.append(
+            {
+                "engine": name,
+                "pages_per_sec": result["throughput"],
+                "peak_kib": result["peak_kib"],
+                "same_text": sum(
+                    a == b for a, b in zip(texts, expected_text, strict=True)
+                ),
+                "same_records": sum(
+                    a == b for a, b in zip(records, expected_records, strict=True)
+                ),
+                "pdfs": len(pdf_paths),
+            }
+        )
+    return rows
+
+
+def _format_table(rows: list[dict]) -> str:
+    lines = [
+        f"{'engine':<16} {'pages/sec':>10} {'peak KiB':>9} "
+        f"{'same text':>10} {'same records':>13}"
+    ]
+    for row in sorted(rows, key=lambda r: -r["pages_per_sec"]):
+        lines.append(
+            f"{row['engine']:<16} {row['pages_per_sec']:>10.1f} "
+            f"{row['peak_kib']:>9.1f} "
+            f"{row['same_text']:>5}/{row['pdfs']:<4} "
+            f"{row['same_records']:>8}/{row['pdfs']:<4}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare the PDF text engines")
+    parser.add_argument(
+        "--dir", type=Path, help="Directory of minutes PDFs (default: synthetic)"
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Timed runs per engine; the best is kept (default: 3)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.dir:
+            pdf_paths = sorted(str(p) for p in args.dir.glob("*.pdf"))
+        else:
+            pdf_paths = [str(p) for p in corpus.write_pdf_corpus(Path(tmp))]
+        rows = compare_engines(pdf_paths, args.repeats)
+    logging.disable(logging.NOTSET)
+
+    print(_format_table(rows))
+    print(
+        "\nAn engine can replace the default only if every PDF has the same "
+        "records (see --text-engine)."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,16 +7,48 @@ refresh the snapshot (manually, or by the scheduled refresh Action):
 
     uv run python refresh_sam_data.py
 
+After the first full download it runs incrementally: only rows added or edited
+since the last refresh (by OBJECTID and the layer's edit-date field) are
+fetched and merged into the snapshot by SAM_ADDRESS_ID, and only the affected
+streets are re-indexed. A layer without an edit-date field can't report its
+edits, so then every refresh is a full one. Deleted addresses are only
+dropped by a full refresh, so run one periodically:
+
+    uv run python refresh_sam_data.py --full
+
+It also writes the prebuilt lookup index next to the snapshot. To rebuild just
+the index from the committed snapshot (no network):
+
+    uv run python refresh_sam_data.py --index-only
+
 Source: https://data.boston.gov/dataset/live-street-address-management-sam-addresses
 """
 
+import argparse
 import csv
+import json
 import logging
+import os
+import tempfile
 import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from app.pipeline.extraction.sam_index import SAM_DATA_PATH, SAM_FIELDS
+from app.pipeline.extraction.sam_index import (
+    SAM_DATA_PATH,
+    SAM_FIELDS,
+    SAM_INDEX_PATH,
+    _key,
+    _open_db,
+    build_db,
+    update_db,
+)
 
 SAM_QUERY_URL = (
     "https://gisportal.boston.gov/arcgis/rest/services/"
@@ -24,54 +56,344 @@ SAM_QUERY_URL = (
 )
 PAGE_SIZE = 2000  # SAM's maxRecordCount
 REQUEST_TIMEOUT = 60
+WORKERS = 4  # pages in flight at once
+MAX_RETRIES = 3  # per page, after the first attempt
+RETRY_BACKOFF = 1.0  # seconds, doubled on each retry
+
+# High-water marks of the last refresh (max OBJECTID and edit date), which the
+# next incremental refresh queries from.
+SAM_STATE_PATH = SAM_DATA_PATH.with_name("sam_refresh_state.json")
 
 logger = logging.getLogger(__name__)
 
 
+def _session(workers: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _query(session: requests.Session, url: str, params: dict) -> dict:
+    """One FeatureServer query, retried with backoff on network/API errors."""
+    params = {**params, "f": "json"}
+    attempt = 0
+    while True:
+        try:
+            resp = session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+            resp.raise_for_status()
+            payload = resp.json()
+            if "error" in payload:
+                raise RuntimeError(f"SAM API error: {payload['error']}")
+            return payload
+        except (requests.RequestException, ValueError, RuntimeError) as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = RETRY_BACKOFF * 2**attempt
+            logger.warning("SAM query failed (%s), retrying in %.1fs", e, delay)
+            time.sleep(delay)
+            attempt += 1
+
+
+def _ordered_map(
+    executor: ThreadPoolExecutor, fn: Callable, items: Iterable, window: int
+) -> Iterator:
+    """Like executor.map, but with at most `window` calls pending, so pages
+    don't pile up in memory behind a slow one."""
+    pending: deque = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _and(where: str, clause: str) -> str:
+    return clause if where == "1=1" else f"({where}) AND {clause}"
+
+
+def fetch_ids(
+    session: requests.Session, url: str = SAM_QUERY_URL, where: str = "1=1"
+) -> list[int]:
+    """OBJECTIDs of the rows matching `where`, ascending."""
+    payload = _query(session, url, {"where": where, "returnIdsOnly": "true"})
+    return sorted(payload.get("objectIds") or [])
+
+
+def _id_ranges(ids: list[int]) -> list[tuple[int, int]]:
+    """(lo, hi] OBJECTID ranges holding PAGE_SIZE of `ids` each."""
+    ranges = []
+    for start in range(0, len(ids), PAGE_SIZE):
+        lo = ids[start - 1] if start else ids[0] - 1
+        ranges.append((lo, ids[min(start + PAGE_SIZE, len(ids)) - 1]))
+    return ranges
+
+
+def _fetch_page(
+    session: requests.Session,
+    url: str,
+    where: str,
+    id_range: tuple[int, int],
+    out_fields: list[str] = SAM_FIELDS,
+) -> list[dict]:
+    lo, hi = id_range
+    params = {
+        "where": _and(where, f"OBJECTID > {lo} AND OBJECTID <= {hi}"),
+        "outFields": ",".join(out_fields),
+        "returnGeometry": "false",
+        "orderByFields": "OBJECTID",
+    }
+    payload = _query(session, url, params)
+    if payload.get("exceededTransferLimit"):
+        # A range never holds more than PAGE_SIZE rows, so the server's
+        # maxRecordCount is below PAGE_SIZE.
+        raise RuntimeError(f"SAM page OBJECTID {lo}-{hi} was truncated")
+    return [f.get("attributes", {}) for f in payload.get("features") or []]
+
+
+def iter_rows(
+    url: str = SAM_QUERY_URL,
+    where: str = "1=1",
+    workers: int = WORKERS,
+    out_fields: list[str] = SAM_FIELDS,
+) -> Iterator[dict]:
+    """
+    Yield the attribute rows matching `where`, in OBJECTID order.
+
+    The matching OBJECTIDs are fetched first and cut into ranges of
+    PAGE_SIZE rows; each page queries its OBJECTID range rather than a
+    result offset, so rows added or deleted during the refresh can't shift
+    rows between pages. Pages are requested `workers` at a time (each
+    retried on failure) and yielded in order as they arrive, so only a few
+    pages are held in memory at once.
+    """
+    workers = max(1, workers)
+    session = _session(workers)
+    ids = fetch_ids(session, url, where)
+    logger.info("SAM layer has %d rows", len(ids))
+    fetched = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while ids:
+            pages = _ordered_map(
+                executor,
+                lambda id_range: _fetch_page(session, url, where, id_range, out_fields),
+                _id_ranges(ids),
+                window=workers * 2,
+            )
+            for page in pages:
+                fetched += len(page)
+                logger.info("fetched %d rows...", fetched)
+                yield from page
+            # Rows added since the IDs were fetched
+            ids = fetch_ids(session, url, _and(where, f"OBJECTID > {ids[-1]}"))
+
+
 def fetch_all() -> list[dict]:
     """Page through the whole SAM layer and return the attribute rows."""
-    rows: list[dict] = []
-    offset = 0
-    while True:
-        params = {
-            "where": "1=1",
-            "outFields": ",".join(SAM_FIELDS),
-            "returnGeometry": "false",
-            "orderByFields": "OBJECTID",  # stable ordering for pagination
-            "resultOffset": str(offset),
-            "resultRecordCount": str(PAGE_SIZE),
-            "f": "json",
-        }
-        resp = requests.get(SAM_QUERY_URL, params=params, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        payload = resp.json()
-        if "error" in payload:
-            raise RuntimeError(f"SAM API error: {payload['error']}")
-        features = payload.get("features") or []
-        rows.extend(f.get("attributes", {}) for f in features)
-        logger.info("fetched %d rows...", len(rows))
-        if len(features) < PAGE_SIZE:
-            break
-        offset += PAGE_SIZE
-        time.sleep(0.2)  # be polite to the endpoint
-    return rows
-
-
-def write_snapshot(rows: list[dict]) -> None:
-    SAM_DATA_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(SAM_DATA_PATH, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=SAM_FIELDS, extrasaction="ignore")
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({field: row.get(field) for field in SAM_FIELDS})
+    return list(iter_rows())
+
+
+def write_snapshot(rows: Iterable[dict], path: Path = SAM_DATA_PATH) -> int:
+    """Stream rows into the snapshot CSV; the file is replaced only once all
+    rows are written. Returns the number of rows."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    count = 0
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=SAM_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({field: row.get(field) for field in SAM_FIELDS})
+                count += 1
+        os.replace(tmp_path, path)
+    finally:
+        Path(tmp_path).unlink(missing_ok=True)
+    return count
+
+
+def fetch_edit_date_field(url: str = SAM_QUERY_URL) -> str | None:
+    """The layer's editor-tracking edit date field, if it has one."""
+    layer_url = url.removesuffix("/query")
+    info = _query(_session(1), layer_url, {})
+    return (info.get("editFieldsInfo") or {}).get("editDateField")
+
+
+def _tracked(rows: Iterable[dict], state: dict) -> Iterator[dict]:
+    """Pass rows through, raising the state's high-water marks as they go."""
+    edit_field = state.get("edit_date_field")
+    for row in rows:
+        objectid = row.get("OBJECTID")
+        if objectid is not None:
+            state["max_objectid"] = max(state.get("max_objectid") or 0, objectid)
+        edited = row.get(edit_field) if edit_field else None
+        if edited is not None:
+            state["max_edit_date"] = max(state.get("max_edit_date") or 0, edited)
+        yield row
+
+
+def _out_fields(state: dict) -> list[str]:
+    extra = ["OBJECTID"]
+    if state.get("edit_date_field"):
+        extra.append(state["edit_date_field"])
+    return SAM_FIELDS + extra
+
+
+def _changes_where(state: dict) -> str:
+    """Rows added (higher OBJECTID) or edited since the state was written.
+    Edit dates are compared to the second, so the last second is re-read;
+    merging a row twice is harmless."""
+    clauses = [f"OBJECTID > {int(state.get('max_objectid') or 0)}"]
+    if state.get("edit_date_field") and state.get("max_edit_date") is not None:
+        since = datetime.fromtimestamp(state["max_edit_date"] / 1000, UTC)
+        clauses.append(
+            f"{state['edit_date_field']} >= "
+            f"TIMESTAMP '{since.strftime('%Y-%m-%d %H:%M:%S')}'"
+        )
+    return " OR ".join(clauses)
+
+
+def _street(row: dict) -> tuple[str, str]:
+    """(STREET NAME, zip) as the index keys it, for a CSV or an API row."""
+    _, name, zipcode = _key(
+        None, str(row.get("FULL_STREET_NAME") or ""), str(row.get("ZIP_CODE") or "")
+    )
+    return name, zipcode
+
+
+def _row_id(row: dict) -> str:
+    value = row.get("SAM_ADDRESS_ID")
+    return "" if value is None else str(value).strip()
+
+
+def _change_id(row: dict) -> str:
+    # Rows without a SAM_ADDRESS_ID can't replace anything; keep them apart
+    return _row_id(row) or f"OBJECTID {row.get('OBJECTID')}"
+
+
+def _merged(
+    path: Path, changes: dict[str, dict], streets: set[tuple[str, str]]
+) -> Iterator[dict]:
+    """The snapshot's rows with `changes` (keyed by SAM_ADDRESS_ID) applied:
+    edited rows replaced in place, new rows appended. The (street, zip) of
+    every replaced and added row, before and after, is added to `streets`."""
+    remaining = dict(changes)
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            new = remaining.pop(_row_id(row), None)
+            if new is not None:
+                streets.add(_street(row))
+                streets.add(_street(new))
+                row = new
+            yield row
+    for row in remaining.values():
+        streets.add(_street(row))
+        yield row
+
+
+def _load_state(path: Path) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _save_state(state: dict, path: Path) -> None:
+    state["refreshed_at"] = datetime.now(UTC).isoformat(timespec="seconds")
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def refresh(
+    full: bool = False,
+    url: str = SAM_QUERY_URL,
+    workers: int = WORKERS,
+    csv_path: Path = SAM_DATA_PATH,
+    db_path: Path = SAM_INDEX_PATH,
+    state_path: Path = SAM_STATE_PATH,
+) -> tuple[str, int, int]:
+    """
+    Refresh the snapshot and its index. Incremental when a previous refresh
+    left its state next to the snapshot and the layer tracks edit dates (and
+    `full` is False), otherwise a full download. Returns (mode, rows written or merged, index entries).
+    """
+    state = None if full else _load_state(state_path)
+    if state is not None and not state.get("edit_date_field"):
+        # Only new OBJECTIDs could be fetched; edited rows would go stale
+        logger.warning(
+            "The SAM layer has no edit-date field, so edits can't be fetched "
+            "incrementally; running a full refresh"
+        )
+        state = None
+    if state is None or not csv_path.exists():
+        state = {"edit_date_field": fetch_edit_date_field(url)}
+        out_fields = _out_fields(state)
+        rows = write_snapshot(
+            _tracked(iter_rows(url, workers=workers, out_fields=out_fields), state),
+            csv_path,
+        )
+        entries = build_db(csv_path, db_path)
+        _save_state(state, state_path)
+        return "full", rows, entries
+
+    where = _changes_where(state)
+    logger.info("Fetching SAM rows where %s", where)
+    changed = iter_rows(url, where, workers=workers, out_fields=_out_fields(state))
+    changes = {_change_id(row): row for row in _tracked(changed, state)}
+    if changes:
+        index_valid = _open_db(db_path, csv_path) is not None
+        streets: set[tuple[str, str]] = set()
+        write_snapshot(_merged(csv_path, changes, streets), csv_path)
+        if index_valid:
+            entries = update_db(streets, csv_path, db_path)
+        else:
+            entries = build_db(csv_path, db_path)
+    else:
+        index = _open_db(db_path, csv_path)
+        entries = len(index) if index is not None else build_db(csv_path, db_path)
+    _save_state(state, state_path)
+    return "incremental", len(changes), entries
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh the local SAM snapshot")
+    parser.add_argument(
+        "--index-only",
+        action="store_true",
+        help="Only rebuild the lookup index from the existing snapshot",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Download the whole layer instead of only the rows changed since "
+        "the last refresh (drops deleted addresses)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help=f"Pages fetched concurrently (default: {WORKERS})",
+    )
+    args = parser.parse_args()
+
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    if args.index_only:
+        entries = build_db(SAM_DATA_PATH, SAM_INDEX_PATH)
+        print(f"Wrote {entries} index entries to {SAM_INDEX_PATH}")
+        return
+
     logger.info("Downloading SAM addresses from %s", SAM_QUERY_URL)
-    rows = fetch_all()
-    write_snapshot(rows)
-    print(f"Wrote {len(rows)} rows to {SAM_DATA_PATH}")
+    mode, rows, entries = refresh(full=args.full, workers=args.workers)
+    if mode == "full":
+        print(f"Wrote {rows} rows to {SAM_DATA_PATH}")
+    else:
+        print(f"Merged {rows} new or edited rows into {SAM_DATA_PATH}")
+    print(f"Index {SAM_INDEX_PATH} has {entries} entries")
 
 
 if __name__ == "__main__":
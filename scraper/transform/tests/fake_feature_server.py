@@ -0,0 +1,134 @@
+"""A local stand-in for the ArcGIS FeatureServer query endpoint of the SAM
+layer, used by the refresh tests."""
+
+import json
+import re
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CLAUSE_RE = re.compile(r"(\w+) (>=|>|<=) (?:TIMESTAMP '([^']+)'|(\d+))")
+PAGE_RE = re.compile(r"OBJECTID > (\d+) AND OBJECTID <= \d+$")
+
+
+class FakeFeatureServer:
+    """
+    Serves `rows` (attribute dicts with an OBJECTID) for /query, honouring
+    returnIdsOnly, maxRecordCount (setting exceededTransferLimit) and
+    `where` clauses of the form "1=1" or "<FIELD> >[=]|<= <number |
+    TIMESTAMP '...'>" joined with OR, and such groups (parenthesized if
+    they contain OR) joined with AND. The layer description (any other
+    path) reports `edit_date_field` as the editor-tracking field; dates are
+    epoch ms.
+    """
+
+    def __init__(
+        self,
+        rows: list[dict],
+        max_record_count: int = 2000,
+        edit_date_field: str | None = None,
+    ):
+        self.rows = rows
+        self.max_record_count = max_record_count
+        self.edit_date_field = edit_date_field
+        self.queries: list[dict] = []
+        # Number of upcoming page requests to fail, per page lower bound
+        # (the n in "OBJECTID > n AND OBJECTID <= m")
+        self.failures: dict[int, int] = {}
+        self.url = ""
+        self._lock = threading.Lock()
+
+    def _matching(self, where: str) -> list[dict]:
+        rows = sorted(self.rows, key=lambda r: r["OBJECTID"])
+        if where == "1=1":
+            return rows
+        groups = []
+        for group in where.split(" AND "):
+            clauses = []
+            for clause in group.removeprefix("(").removesuffix(")").split(" OR "):
+                field, op, timestamp, number = CLAUSE_RE.fullmatch(clause).groups()
+                if timestamp:
+                    parsed = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+                    value = parsed.replace(tzinfo=UTC).timestamp() * 1000
+                else:
+                    value = int(number)
+                clauses.append((field, op, value))
+            groups.append(clauses)
+        return [
+            row
+            for row in rows
+            if all(
+                any(_compare(row.get(field), op, value) for field, op, value in group)
+                for group in groups
+            )
+        ]
+
+    def layer_info(self) -> dict:
+        info: dict = {"name": "SAM addresses", "maxRecordCount": self.max_record_count}
+        if self.edit_date_field:
+            info["editFieldsInfo"] = {"editDateField": self.edit_date_field}
+        return info
+
+    def respond(self, params: dict) -> tuple[int, dict]:
+        where = params.get("where", "1=1")
+        with self._lock:
+            self.queries.append(params)
+            page_start = PAGE_RE.search(where)
+            lo = int(page_start.group(1)) if page_start else None
+            if self.failures.get(lo):
+                self.failures[lo] -= 1
+                return 500, {}
+        rows = self._matching(where)
+        if params.get("returnIdsOnly") == "true":
+            ids = [row["OBJECTID"] for row in rows]
+            return 200, {"objectIdFieldName": "OBJECTID", "objectIds": ids}
+        payload: dict = {
+            "features": [{"attributes": row} for row in rows[: self.max_record_count]]
+        }
+        if len(rows) > self.max_record_count:
+            payload["exceededTransferLimit"] = True
+        return 200, payload
+
+
+def _compare(actual, op: str, value) -> bool:
+    if actual is None:
+        return False
+    if op == ">=":
+        return actual >= value
+    if op == "<=":
+        return actual <= value
+    return actual > value
+
+
+@contextmanager
+def serve(server: FakeFeatureServer) -> Iterator[FakeFeatureServer]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802 (http.server API)
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if url.path.endswith("/query"):
+                status, payload = server.respond(params)
+            else:
+                status, payload = 200, server.layer_info()
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.url = f"http://127.0.0.1:{httpd.server_address[1]}/query"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
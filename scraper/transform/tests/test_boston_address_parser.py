@@ -0,0 +1,34 @@
+"""Tests for app.utils.boston_address_parser."""
+
+from app.utils.boston_address_parser import BostonAddressParser, get_parser
+
+
+def test_parse_address_components():
+    parsed = BostonAddressParser().parse_address(
+        "605 - 607a Boylston Street, Boston, MA 02116"
+    )
+    assert parsed == {
+        "street_number": "605-607A",
+        "full_street_name": "Boylston St",
+        "neighborhood": "Boston",
+        "state": "MA",
+        "zipcode": "02116",
+    }
+
+
+def test_cached_results_are_copies():
+    parser = BostonAddressParser()
+    address = "12 Centre St, Jamaica Plain, MA 02130"
+    first = parser.parse_address(address)
+    first["zipcode"] = "changed"
+    assert parser.parse_address(address)["zipcode"] == "02130"
+
+
+def test_non_string_input_is_not_cached():
+    parser = BostonAddressParser()
+    assert parser.parse_address(None)["state"] is None
+    assert parser.parse_address(["unhashable"])["street_number"] is None
+
+
+def test_get_parser_is_shared():
+    assert get_parser() is get_parser()
@@ -0,0 +1,91 @@
+"""Tests for app.state.checkpoint_store and checkpointed Pipeline runs."""
+
+import pickle
+
+import pytest
+
+from app import constants as const
+from app.pipeline.pipeline import Pipeline
+from app.pipeline.run_result import RunResult
+from app.state.checkpoint_store import CheckpointStore
+from app.state.kv_store import KVStore
+
+PDF = "/some/dir/voting_minutes_2025-10-01.pdf"
+
+
+class AppendStep:
+    """Appends its name to the store's "ran" list."""
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def run(self):
+        self.store.set("ran", [*self.store.get("ran", []), self.name])
+        return RunResult()
+
+
+def _pipeline(store, checkpoints, **kwargs):
+    steps = [AppendStep(store, name) for name in ["a", "b", "c"]]
+    return Pipeline(store, steps, checkpoints=checkpoints, **kwargs)
+
+
+def _store():
+    store = KVStore()
+    store.set(const.PDF_FILE_PATH, PDF)
+    store.set(const.PDF_HASH, "abc")
+    return store
+
+
+def test_kv_store_json_round_trip():
+    store = _store()
+    store.set("offsets", {"hearing_start": 3, "board_voted": None})
+    clone = KVStore()
+    clone.load_json(store.to_json())
+    assert clone.as_dict() == store.as_dict()
+
+
+def test_checkpoints_are_keyed_by_hash_file_name_and_step(tmp_path):
+    checkpoints = CheckpointStore(tmp_path / "checkpoints.sqlite")
+    checkpoints.put(PDF, "abc", "a", '{"x":1}')
+    assert checkpoints.get(PDF, "abc", "a") == '{"x":1}'
+    assert checkpoints.get(PDF, "abc", "b") is None
+    assert checkpoints.get(PDF, "def", "a") is None
+    assert checkpoints.get("/x/voting_minutes_2025-10-02.pdf", "abc", "a") is None
+
+
+def test_picklable_for_worker_processes(tmp_path):
+    checkpoints = CheckpointStore(tmp_path / "checkpoints.sqlite")
+    checkpoints.put(PDF, "abc", "a", "{}")
+    assert pickle.loads(pickle.dumps(checkpoints)).get(PDF, "abc", "a") == "{}"
+
+
+def test_resume_from_a_step_restores_the_previous_snapshot(tmp_path):
+    checkpoints = CheckpointStore(tmp_path / "checkpoints.sqlite")
+    _pipeline(_store(), checkpoints).run()
+
+    store = _store()
+    _pipeline(store, checkpoints, from_step="c").run()
+
+    assert store.get("ran") == ["a", "b", "c"]
+    assert checkpoints.get(PDF, "abc", "c") == store.to_json()
+
+
+def test_until_step_stops_after_it(tmp_path):
+    store = _store()
+    _pipeline(store, CheckpointStore(tmp_path / "c.sqlite"), until_step="b").run()
+    assert store.get("ran") == ["a", "b"]
+
+
+def test_missing_checkpoint_runs_from_the_first_step(tmp_path):
+    store = _store()
+    _pipeline(store, CheckpointStore(tmp_path / "c.sqlite"), from_step="c").run()
+    assert store.get("ran") == ["a", "b", "c"]
+
+
+def test_unknown_or_reversed_steps_are_rejected(tmp_path):
+    checkpoints = CheckpointStore(tmp_path / "c.sqlite")
+    with pytest.raises(ValueError, match="Unknown pipeline step"):
+        _pipeline(_store(), checkpoints, from_step="z")
+    with pytest.raises(ValueError, match="runs before"):
+        _pipeline(_store(), checkpoints, from_step="c", until_step="a")
@@ -0,0 +1,31 @@
+"""Tests for parallel --dir runs in app.cli."""
+
+import json
+
+from app.cli import _process_files
+from benchmarks import corpus
+
+
+def _output(outcomes) -> str:
+    """The --output JSON a run with these outcomes writes."""
+    results = [
+        record for records, error, _ in outcomes if error is None for record in records
+    ]
+    return json.dumps(results, indent=2, ensure_ascii=False)
+
+
+def test_parallel_run_output_matches_a_serial_run(tmp_path):
+    pdf_paths = [str(p) for p in corpus.write_pdf_corpus(tmp_path, count=6)]
+    broken = tmp_path / "voting_minutes_2025-12-31.pdf"
+    broken.write_bytes(b"not a pdf")
+    pdf_paths.insert(3, str(broken))
+
+    serial = list(_process_files(pdf_paths, workers=1))
+    parallel = list(_process_files(pdf_paths, workers=3))
+
+    assert _output(parallel) == _output(serial)
+    assert [records for records, _, _ in parallel] == [
+        records for records, _, _ in serial
+    ]
+    assert serial[3][0] == []
+    assert len(json.loads(_output(serial))) == 6 * 40
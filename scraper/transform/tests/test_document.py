@@ -0,0 +1,109 @@
+"""Tests for app.pipeline.document and the steps that read through it."""
+
+import random
+import re
+
+from app import constants as const
+from app.pipeline.document import Document, document, join_lines
+from app.pipeline.extract_license_text import LicenseTextExtractorStep
+from app.pipeline.extraction.context import ExtractionContext
+from app.state.kv_store import KVStore
+
+
+def _random_text(rng):
+    pieces = ["1.", " 2. ", "3. A LLC", "License #: LB-1", "", "  ", "x"]
+    breaks = ["\n", "\n", "\n", "\r\n", "\r", "\x0c", " "]
+    return "".join(
+        rng.choice(pieces) + rng.choice(breaks) for _ in range(rng.randint(0, 12))
+    )
+
+
+def test_join_lines_matches_splitlines():
+    rng = random.Random(3)
+    for _ in range(2000):
+        text = _random_text(rng)
+        assert join_lines(text) == "\n".join(text.splitlines())
+
+
+def test_lines_and_spans_are_sliced_from_the_buffer():
+    doc = Document("a\r\nbb\n\nccc\n")
+
+    assert doc.text == "a\nbb\n\nccc"
+    assert doc.starts == [0, 2, 5, 6, 10]
+    assert [doc.line(i) for i in range(4)] == ["a", "bb", "", "ccc"]
+    assert doc.span(1, 3) == "bb\n"
+    assert doc.span(2) == "\nccc"
+    assert doc.line_at(doc.text.index("ccc") + 1) == 3
+
+
+def test_empty_document_has_no_lines():
+    assert Document("").starts == [0]
+    assert Document("\n").starts == [0]
+
+
+def test_license_chunks_are_spans_of_the_hearing_section():
+    store = KVStore()
+    store.set(const.PDF_FILE_PATH, "voting_minutes_2024-01-05.pdf")
+    store.set(
+        const.HEARING_SECTION,
+        "Transactional Hearing on January 5, 2024\r\n"
+        "1.\n"
+        "Some Bar LLC\n"
+        "License #: LB-1\n"
+        "2. No License Here\n"
+        "3. Other Bar LLC\n"
+        "License #: LB-2\n"
+        "  \n\n",
+    )
+
+    LicenseTextExtractorStep(store).run()
+
+    assert store.get(const.LICENSE_TEXT_DATA) == {
+        "voting_minutes_2024-01-05.pdf_1": "Date:2024-01-05\n1. Some Bar LLC\nLicense #: LB-1",
+        "voting_minutes_2024-01-05.pdf_3": "Date:2024-01-05\n3. Other Bar LLC\nLicense #: LB-2\n  ",
+    }
+
+
+def _split_fix_header(text):
+    """The line-by-line merge _fix_header splices into the buffer instead."""
+    lines, output, i = text.split("\n"), [], 0
+    while i < len(lines):
+        if re.fullmatch(r"\d+\.", lines[i].strip()) and i + 1 < len(lines):
+            output.append(f"{lines[i].rstrip()} {lines[i + 1].lstrip()}")
+            i += 2
+        else:
+            output.append(lines[i])
+            i += 1
+    return "\n".join(output)
+
+
+def test_fix_header_matches_merging_split_lines():
+    rng = random.Random(4)
+    step = LicenseTextExtractorStep(KVStore())
+    for _ in range(2000):
+        doc = Document(_random_text(rng))
+        fixed = step._fix_header(doc)
+        assert fixed.text == Document(_split_fix_header(doc.text)).text
+
+
+def test_steps_share_the_document_until_the_string_changes():
+    store = KVStore()
+    store.set(const.HEARING_SECTION, "1. A\nLicense #: LB-1")
+
+    shared = document(store, const.HEARING_SECTION)
+    assert document(store, const.HEARING_SECTION) is shared
+    assert shared.text is store.get(const.HEARING_SECTION)
+    assert "_derived" not in store.to_json()
+
+    store.set(const.HEARING_SECTION, "2. B")
+    assert document(store, const.HEARING_SECTION).text == "2. B"
+    store.delete(const.HEARING_SECTION)
+    assert document(store, const.HEARING_SECTION).starts == [0]
+
+
+def test_extraction_context_reads_the_document_lines():
+    doc = Document("Date:2024-01-05\n1. A LLC\n  \n License #: LB-1 ")
+    ctx = ExtractionContext.from_document(doc, {})
+
+    assert ctx.document is doc
+    assert ctx.lines == ["Date:2024-01-05", "1. A LLC", "License #: LB-1"]
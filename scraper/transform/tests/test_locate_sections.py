@@ -0,0 +1,155 @@
+"""Tests for app.pipeline.locate_sections and the steps that slice by it."""
+
+import random
+
+from app import constants as const
+from app.pipeline.extract_board_voted import BoardVotedExtractorStep
+from app.pipeline.extract_hearing import HearingTextExtractorStep
+from app.pipeline.locate_sections import (
+    SECTION_HEADER_RE,
+    START_MARKERS,
+    STOP_MARKERS,
+    SectionLocatorStep,
+    hearing_text,
+    locate_sections,
+)
+from app.state.kv_store import KVStore
+
+
+def _line_scan_hearing(text):
+    """The previous per-line, per-marker scan of HearingTextExtractorStep."""
+    extracted, in_section = [], False
+    for line in text.splitlines():
+        lower_line = line.strip().lower()
+        if not in_section:
+            if any(marker.lower() in lower_line for marker in START_MARKERS):
+                in_section = True
+                extracted.append(line)
+        elif any(marker.lower() in lower_line for marker in STOP_MARKERS):
+            break
+        else:
+            extracted.append(line)
+    return "\n".join(extracted) if extracted else None
+
+
+def _random_text(rng):
+    pieces = [
+        *START_MARKERS,
+        *STOP_MARKERS,
+        "The Board voted to approve to the following restricted licenses",
+        "1. Some Bar LLC",
+        "Granted",
+        "Hearing",
+        "Old &",
+        "  ",
+        "",
+    ]
+    breaks = ["\n", "\n", "\n", "\r\n", "\r", "\x0c", "\x1e"]
+    parts = []
+    for _ in range(rng.randint(0, 30)):
+        piece = rng.choice(pieces)
+        if rng.random() < 0.3:
+            piece = piece.upper() if rng.random() < 0.5 else piece.lower()
+        parts.append(piece)
+        parts.append(rng.choice(breaks) if rng.random() < 0.7 else " ")
+    return "".join(parts)
+
+
+def _store(text, path="voting_minutes_2026-01-08.pdf"):
+    store = KVStore()
+    store.set(const.PDF_TEXT, text)
+    store.set(const.PDF_FILE_PATH, path)
+    return store
+
+
+def test_hearing_slice_matches_the_line_scan():
+    rng = random.Random(20260108)
+    for _ in range(3000):
+        text = _random_text(rng)
+        assert hearing_text(text, locate_sections(text)) == _line_scan_hearing(text)
+
+
+def test_page_by_page_scan_matches_the_joined_text():
+    rng = random.Random(11)
+    for _ in range(1000):
+        pages = [_random_text(rng) for _ in range(rng.randint(1, 4))]
+        started = stopped = voted = False
+        for count, page in enumerate(pages, 1):
+            offsets = locate_sections(page, started)
+            started |= offsets["hearing_start"] is not None
+            stopped |= offsets["hearing_stop"] is not None
+            voted |= offsets["board_voted"] is not None
+            joined = locate_sections("\n".join(pages[:count]))
+            assert stopped == (joined["hearing_stop"] is not None), pages
+            assert voted == (joined["board_voted"] is not None), pages
+
+
+def test_board_voted_offset_matches_the_header_search():
+    rng = random.Random(7)
+    for _ in range(1000):
+        text = _random_text(rng)
+        match = SECTION_HEADER_RE.search(text)
+        expected = match.end() if match else None
+        assert locate_sections(text)["board_voted"] == expected
+
+
+def test_stop_markers_on_the_start_line_are_ignored():
+    text = "Intro\nTransactional Hearing - Old & New Business\n1. A LLC\nOld & New Business\nrest"
+
+    offsets = locate_sections(text)
+
+    assert text[offsets["hearing_start"] :].startswith("Transactional Hearing")
+    assert text[offsets["hearing_stop"] :] == "Old & New Business\nrest"
+    assert hearing_text(text, offsets) == (
+        "Transactional Hearing - Old & New Business\n1. A LLC"
+    )
+
+
+def test_text_without_markers_has_no_sections():
+    assert locate_sections("nothing\nto see") == {
+        "hearing_start": None,
+        "hearing_stop": None,
+        "board_voted": None,
+    }
+
+
+def test_steps_slice_at_the_recorded_offsets():
+    text = (
+        "Transactional Hearing\n"
+        "1. Some Bar LLC\n"
+        "Non-Hearing Transactions\n"
+        "The Board voted to approve to the following restricted licenses:\n"
+        "Corner Cafe LLC\n"
+        "License #: LB-123456\n"
+        "12 Main St, Boston, MA 02118\n"
+        "The Board voted to approve an 02118 Zip Code restricted "
+        "All Alcoholic Beverages License\n"
+    )
+    store = _store(text)
+
+    SectionLocatorStep(store).run()
+    HearingTextExtractorStep(store).run()
+    BoardVotedExtractorStep(store).run()
+
+    assert store.get(const.SECTION_OFFSETS)["hearing_stop"] == text.index("Non-")
+    assert store.get(const.HEARING_SECTION) == "Transactional Hearing\n1. Some Bar LLC"
+    [record] = store.get(const.LICENSE_JSON_DATA)
+    assert record["license_number"] == "LB-123456"
+    assert record["business_name"] == "Corner Cafe LLC"
+
+
+def test_steps_locate_sections_themselves_without_the_locator():
+    store = _store("Hearing Date: Jan 8\n1. Some Bar LLC\nOld and New Business\n")
+
+    HearingTextExtractorStep(store).run()
+
+    assert not store.has(const.SECTION_OFFSETS)
+    assert store.get(const.HEARING_SECTION) == "Hearing Date: Jan 8\n1. Some Bar LLC"
+
+
+def test_markers_are_matched_case_insensitively_inside_lines():
+    text = "x\n--- TRANSACTIONAL HEARINGS: ---\nbody\nsee non-hearing transactions\n"
+
+    assert hearing_text(text, locate_sections(text)) == (
+        "--- TRANSACTIONAL HEARINGS: ---\nbody"
+    )
@@ -0,0 +1,112 @@
+"""Tests for app.pipeline.extract_pdf_text.PDFTextExtractorStep."""
+
+import random
+
+import fitz  # PyMuPDF
+
+from app import constants as const
+from app.pipeline.extract_pdf_text import PDFTextExtractorStep
+from app.state.kv_store import KVStore
+from app.state.text_cache import TextCache
+
+HEARING = ["Transactional Hearing", "1. Some Venue, LLC", "License #: LB-123456"]
+AFTER = ["Old & New Business", "Nothing else"]
+
+
+def _write_pdf(path, pages):
+    doc = fitz.open()
+    for lines in pages:
+        page = doc.new_page()
+        for row, line in enumerate(lines):
+            page.insert_text((36, 36 + row * 12), line, fontsize=9)
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+def _extract(pdf_path, lazy, text_cache=None):
+    store = KVStore()
+    store.set(const.PDF_FILE_PATH, pdf_path)
+    store.set(const.PDF_HASH, "abc")
+    PDFTextExtractorStep(store, text_cache, lazy=lazy).run()
+    return store.get(const.PDF_TEXT)
+
+
+def test_pages_are_cleaned_and_joined(tmp_path):
+    pdf = _write_pdf(
+        tmp_path / "voting_minutes_2024-01-04.pdf",
+        [["Intro", "_____"], ["_____"], [], HEARING],
+    )
+
+    assert _extract(pdf, lazy=False) == "\n".join(["Intro", *HEARING])
+
+
+class _PagesEngine:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def page_texts(self, pdf_path):
+        return iter(self.pages)
+
+
+def _split_clean_pages(pages):
+    """The line-by-line cleaning the underscore regexes stand in for."""
+    for page in pages:
+        text = page.strip()
+        if not text:
+            continue
+        lines = [
+            line
+            for line in text.split("\n")
+            if not ((stripped := line.strip()) and set(stripped) == {"_"})
+        ]
+        if lines:
+            yield "\n".join(lines)
+
+
+def test_underscore_lines_are_removed_like_split_lines():
+    rng = random.Random(5)
+    pieces = ["___", " _ ", "_x_", "a", "", " ", "\t__\r", "1. A"]
+    pages = [
+        "\n".join(rng.choice(pieces) for _ in range(rng.randint(1, 6)))
+        for _ in range(3000)
+    ]
+    step = PDFTextExtractorStep(KVStore(), engine=_PagesEngine(pages))
+
+    assert list(step._iter_clean_pages("x.pdf")) == list(_split_clean_pages(pages))
+
+
+def test_lazy_stops_after_the_hearing_stop_page(tmp_path):
+    pdf = _write_pdf(
+        tmp_path / "voting_minutes_2024-01-04.pdf", [HEARING, AFTER, ["Late page"]]
+    )
+    text_cache = TextCache(tmp_path / "text.sqlite")
+
+    text = _extract(pdf, lazy=True, text_cache=text_cache)
+
+    assert text == "\n".join(HEARING + AFTER)
+    assert text_cache.get("abc") is None
+
+
+def test_lazy_reads_everything_without_a_stop_marker(tmp_path):
+    pdf = _write_pdf(tmp_path / "voting_minutes_2024-01-04.pdf", [HEARING, ["More"]])
+
+    assert _extract(pdf, lazy=True) == _extract(pdf, lazy=False)
+
+
+def test_lazy_reads_everything_after_a_board_voted_header(tmp_path):
+    header = "The Board voted to approve to the following restricted licenses:"
+    pdf = _write_pdf(
+        tmp_path / "voting_minutes_2024-01-04.pdf",
+        [[header, *HEARING], AFTER, ["Late page"]],
+    )
+
+    assert _extract(pdf, lazy=True) == _extract(pdf, lazy=False)
+
+
+def test_lazy_reads_recent_minutes_in_full(tmp_path):
+    pdf = _write_pdf(
+        tmp_path / "voting_minutes_2026-01-08.pdf", [HEARING, AFTER, ["Late page"]]
+    )
+
+    assert _extract(pdf, lazy=True).endswith("Late page")
@@ -0,0 +1,44 @@
+"""Tests for the invariant plugin registry in app.pipeline.invariant_plugins."""
+
+from app.pipeline.invariant_plugins import PluginRegistry, get_registry, meeting_key
+from app.violation_plugins.base import Plugin
+
+
+class _Fake(Plugin):
+    def __init__(self, name, target=None):
+        self.name = name
+        self.target = target
+
+    def query(self, store):
+        return True
+
+    def run(self, store):
+        pass
+
+
+def test_meeting_key_ignores_directory_and_revision():
+    assert meeting_key("/x/voting_minutes_2025-10-02_v2.pdf") == (
+        "voting_minutes_2025-10-02"
+    )
+    assert meeting_key("other.pdf") == "other.pdf"
+
+
+def test_registry_dispatches_by_target_and_keeps_order():
+    plugins = [
+        _Fake("a", "voting_minutes_2021-02-04"),
+        _Fake("global"),
+        _Fake("b", "voting_minutes_2024-09-26"),
+        _Fake("c", "voting_minutes_2021-02-04"),
+    ]
+    registry = PluginRegistry(plugins)
+    names = [p.name for p in registry.for_file("voting_minutes_2021-02-04.pdf")]
+    assert names == ["a", "global", "c"]
+    assert [p.name for p in registry.for_file("voting_minutes_2030-01-01.pdf")] == [
+        "global"
+    ]
+
+
+def test_registry_is_discovered_once_per_stage():
+    assert get_registry("POST_TEXT") is get_registry("POST_TEXT")
+    targets = {p.target for p in get_registry("POST_TEXT").for_file("x.pdf")}
+    assert targets <= {None}
@@ -0,0 +1,59 @@
+"""Tests for app.utils.profiler.Profiler."""
+
+import csv
+import json
+
+from app.utils.profiler import Profiler
+
+
+def test_record_aggregates_calls_time_and_sizes():
+    profiler = Profiler()
+    profiler.record("step.A", 0.5, text_len=100, lines=10)
+    profiler.record("step.A", 1.5, text_len=50, lines=5, chunks=2)
+    entry = profiler.as_dict()["step.A"]
+    assert entry["calls"] == 2
+    assert entry["total_s"] == 2.0
+    assert entry["max_s"] == 1.5
+    assert (entry["text_len"], entry["lines"], entry["chunks"]) == (150, 15, 2)
+
+
+def test_merge_combines_worker_profiles():
+    main, worker = Profiler(), Profiler()
+    main.record("extractor.X", 0.25, lines=3)
+    worker.record("extractor.X", 0.75, lines=4)
+    worker.record("step.B", 0.1)
+    main.merge(worker.as_dict())
+    stats = main.as_dict()
+    assert stats["extractor.X"]["calls"] == 2
+    assert stats["extractor.X"]["total_s"] == 1.0
+    assert stats["extractor.X"]["max_s"] == 0.75
+    assert stats["extractor.X"]["lines"] == 7
+    assert stats["step.B"]["calls"] == 1
+
+
+def test_top_orders_by_total_time():
+    profiler = Profiler()
+    profiler.record("fast", 0.1)
+    profiler.record("slow", 2.0)
+    profiler.record("medium", 0.5)
+    assert [row["name"] for row in profiler.top(2)] == ["slow", "medium"]
+
+
+def test_measure_records_elapsed_time():
+    profiler = Profiler()
+    with profiler.measure("block", chunks=1):
+        pass
+    entry = profiler.as_dict()["block"]
+    assert entry["calls"] == 1
+    assert entry["chunks"] == 1
+
+
+def test_write_json_and_csv(tmp_path):
+    profiler = Profiler()
+    profiler.record("step.A", 0.002, text_len=10)
+    profiler.write(tmp_path / "p.json", tmp_path / "p.csv")
+    rows = json.loads((tmp_path / "p.json").read_text())
+    assert rows[0]["name"] == "step.A"
+    assert rows[0]["mean_ms"] == 2.0
+    with open(tmp_path / "p.csv", newline="") as f:
+        assert next(csv.DictReader(f))["text_len"] == "10"
@@ -0,0 +1,255 @@
+"""Tests for refresh_sam_data against a local fake FeatureServer."""
+
+import csv
+import json
+import sqlite3
+
+import pytest
+import requests
+
+import refresh_sam_data
+from app.pipeline.extraction.sam_index import SAM_FIELDS
+from tests.fake_feature_server import FakeFeatureServer, serve
+
+
+def _rows(count: int, start: int = 1) -> list[dict]:
+    return [
+        {
+            "OBJECTID": i,
+            "SAM_ADDRESS_ID": 100000 + i,
+            "BUILDING_ID": 200000 + i,
+            "STREET_NUMBER": str(i),
+            "FULL_STREET_NAME": "Main St",
+            "ZIP_CODE": "02129",
+            "IS_RANGE": 0,
+            "RANGE_FROM": None,
+            "RANGE_TO": None,
+        }
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def small_pages(monkeypatch):
+    monkeypatch.setattr(refresh_sam_data, "PAGE_SIZE", 5)
+    monkeypatch.setattr(refresh_sam_data, "RETRY_BACKOFF", 0)
+
+
+@pytest.fixture
+def layer():
+    with serve(FakeFeatureServer(_rows(23), max_record_count=5)) as server:
+        yield server
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_iter_rows_returns_every_row_in_objectid_order(layer, workers):
+    rows = list(refresh_sam_data.iter_rows(layer.url, workers=workers))
+    assert [row["OBJECTID"] for row in rows] == list(range(1, 24))
+
+    assert layer.queries[0]["returnIdsOnly"] == "true"
+    pages = sorted(q["where"] for q in layer.queries[1:-1])
+    assert pages == [
+        "OBJECTID > 0 AND OBJECTID <= 5",
+        "OBJECTID > 10 AND OBJECTID <= 15",
+        "OBJECTID > 15 AND OBJECTID <= 20",
+        "OBJECTID > 20 AND OBJECTID <= 23",
+        "OBJECTID > 5 AND OBJECTID <= 10",
+    ]
+    assert layer.queries[-1] == {
+        "where": "OBJECTID > 23",
+        "returnIdsOnly": "true",
+        "f": "json",
+    }
+
+
+def test_pages_follow_gaps_in_objectids():
+    rows = [row for row in _rows(30) if row["OBJECTID"] % 3]
+    with serve(FakeFeatureServer(rows, max_record_count=5)) as server:
+        fetched = list(refresh_sam_data.iter_rows(server.url, workers=2))
+        pages = [q for q in server.queries if "returnIdsOnly" not in q]
+    assert fetched == rows
+    assert len(pages) == 4
+
+
+def test_truncated_pages_are_an_error():
+    with serve(FakeFeatureServer(_rows(8), max_record_count=3)) as server:
+        with pytest.raises(RuntimeError, match="truncated"):
+            list(refresh_sam_data.iter_rows(server.url, workers=1))
+
+
+def test_failed_pages_are_retried(layer):
+    layer.failures = {5: 2, 15: 1}
+    rows = list(refresh_sam_data.iter_rows(layer.url, workers=3))
+    assert [row["OBJECTID"] for row in rows] == list(range(1, 24))
+
+
+def test_gives_up_after_max_retries(layer):
+    layer.failures = {10: refresh_sam_data.MAX_RETRIES + 1}
+    with pytest.raises(requests.HTTPError):
+        list(refresh_sam_data.iter_rows(layer.url, workers=2))
+
+
+class ChangingLayer(FakeFeatureServer):
+    """Applies `change` to its rows once, right after the first ID query."""
+
+    def __init__(self, rows, change):
+        super().__init__(rows, max_record_count=5)
+        self.change = change
+
+    def respond(self, params):
+        result = super().respond(params)
+        if params.get("returnIdsOnly") == "true" and self.change:
+            self.change(self.rows)
+            self.change = None
+        return result
+
+
+def test_rows_added_after_the_id_query_are_fetched():
+    def add(rows):
+        rows.extend(_rows(3, start=len(rows) + 1))
+
+    with serve(ChangingLayer(_rows(10), add)) as server:
+        rows = list(refresh_sam_data.iter_rows(server.url, workers=2))
+    assert [row["OBJECTID"] for row in rows] == list(range(1, 14))
+
+
+def test_rows_deleted_during_the_refresh_do_not_shift_pages():
+    def delete_second(rows):
+        del rows[1]
+
+    with serve(ChangingLayer(_rows(12), delete_second)) as server:
+        rows = list(refresh_sam_data.iter_rows(server.url, workers=1))
+    assert [row["OBJECTID"] for row in rows] == [1, *range(3, 13)]
+
+
+def test_write_snapshot_streams_rows_to_csv(layer, tmp_path):
+    path = tmp_path / "sam.csv"
+    path.write_text("old", encoding="utf-8")
+    count = refresh_sam_data.write_snapshot(
+        refresh_sam_data.iter_rows(layer.url, workers=2), path
+    )
+    assert count == 23
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames == SAM_FIELDS
+        rows = list(reader)
+    assert rows[0]["SAM_ADDRESS_ID"] == "100001"
+    assert rows[-1]["STREET_NUMBER"] == "23"
+
+
+def test_failed_refresh_keeps_the_old_snapshot(layer, tmp_path):
+    path = tmp_path / "sam.csv"
+    path.write_text("old", encoding="utf-8")
+    layer.failures = {20: refresh_sam_data.MAX_RETRIES + 1}
+    with pytest.raises(requests.HTTPError):
+        refresh_sam_data.write_snapshot(
+            refresh_sam_data.iter_rows(layer.url, workers=2), path
+        )
+    assert path.read_text(encoding="utf-8") == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["sam.csv"]
+
+
+EDIT_FIELD = "last_edited_date"
+EPOCH_MS = 1_700_000_000_000
+
+
+def _edited_rows(count: int, start: int = 1) -> list[dict]:
+    rows = _rows(count, start)
+    for row in rows:
+        row[EDIT_FIELD] = EPOCH_MS + row["OBJECTID"] * 1000
+    return rows
+
+
+def _paths(directory):
+    directory.mkdir()
+    return {
+        "csv_path": directory / "sam.csv",
+        "db_path": directory / "sam.sqlite",
+        "state_path": directory / "state.json",
+    }
+
+
+def _dump(db_path) -> dict:
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            table: conn.execute(f"SELECT * FROM {table} ORDER BY rowid").fetchall()
+            if table != "addresses"
+            else sorted(conn.execute("SELECT * FROM addresses").fetchall())
+            for table in ["addresses", "ranges", "streets", "meta"]
+        }
+    finally:
+        conn.close()
+
+
+def test_incremental_refresh_matches_a_full_one(tmp_path):
+    rows = _edited_rows(23)
+    with serve(FakeFeatureServer(rows, 5, edit_date_field=EDIT_FIELD)) as layer:
+        paths = _paths(tmp_path / "incremental")
+        assert refresh_sam_data.refresh(url=layer.url, **paths)[:2] == ("full", 23)
+
+        later = EPOCH_MS + 100_000
+        rows[2].update({"FULL_STREET_NAME": "Elm St", EDIT_FIELD: later})
+        rows[6].update({"BUILDING_ID": 999, EDIT_FIELD: later})
+        rows.append({**_edited_rows(1, start=24)[0], "IS_RANGE": 1})
+        rows[-1].update({"RANGE_FROM": 24, "RANGE_TO": 28, EDIT_FIELD: later})
+        layer.queries.clear()
+
+        mode, changed, _ = refresh_sam_data.refresh(url=layer.url, **paths)
+        assert mode == "incremental"
+        # Rows 3, 7 and 24, plus row 23, edited in the last second recorded
+        assert changed == 4
+        assert all(q["where"] != "1=1" for q in layer.queries)
+
+        reference = _paths(tmp_path / "full")
+        refresh_sam_data.refresh(full=True, url=layer.url, **reference)
+
+    assert paths["csv_path"].read_text(encoding="utf-8") == reference[
+        "csv_path"
+    ].read_text(encoding="utf-8")
+    assert _dump(paths["db_path"]) == _dump(reference["db_path"])
+    state = json.loads(paths["state_path"].read_text(encoding="utf-8"))
+    assert state["max_objectid"] == 24
+    assert state["max_edit_date"] == EPOCH_MS + 100_000
+
+
+def test_unchanged_layer_only_rereads_the_last_second(tmp_path):
+    with serve(FakeFeatureServer(_edited_rows(8), 5, EDIT_FIELD)) as layer:
+        paths = _paths(tmp_path / "sam")
+        refresh_sam_data.refresh(url=layer.url, **paths)
+        before = paths["csv_path"].read_text(encoding="utf-8")
+        mode, changed, entries = refresh_sam_data.refresh(url=layer.url, **paths)
+    # Row 8 was edited in the last recorded second
+    assert (mode, changed, entries) == ("incremental", 1, 8)
+    assert paths["csv_path"].read_text(encoding="utf-8") == before
+
+
+def test_deleted_rows_are_dropped_by_a_full_refresh_only(tmp_path):
+    rows = _edited_rows(6)
+    with serve(FakeFeatureServer(rows, 5, EDIT_FIELD)) as layer:
+        paths = _paths(tmp_path / "sam")
+        refresh_sam_data.refresh(url=layer.url, **paths)
+        del rows[1]
+
+        refresh_sam_data.refresh(url=layer.url, **paths)
+        assert "100002" in paths["csv_path"].read_text(encoding="utf-8")
+
+        assert refresh_sam_data.refresh(full=True, url=layer.url, **paths)[:2] == (
+            "full",
+            5,
+        )
+        assert "100002" not in paths["csv_path"].read_text(encoding="utf-8")
+
+
+def test_without_edit_tracking_every_refresh_is_full(tmp_path, caplog):
+    rows = _rows(6)
+    with serve(FakeFeatureServer(rows, 5)) as layer:
+        paths = _paths(tmp_path / "sam")
+        refresh_sam_data.refresh(url=layer.url, **paths)
+        rows[1]["BUILDING_ID"] = 999
+        rows.extend(_rows(2, start=7))
+        layer.queries.clear()
+        assert refresh_sam_data.refresh(url=layer.url, **paths)[:2] == ("full", 8)
+    assert "1=1" in {q["where"] for q in layer.queries}
+    assert "999" in paths["csv_path"].read_text(encoding="utf-8")
+    assert "no edit-date field" in caplog.text
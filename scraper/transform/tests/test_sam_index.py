@@ -9,7 +9,10 @@ from app.pipeline.extraction.sam_index import (
     _build_index,
     _clean_number,
     _key,
+    _open_db,
+    build_db,
     lookup,
+    update_db,
 )
 
 
@@ -162,3 +165,111 @@ def test_lookup_hit_and_miss(tmp_path):
         assert lookup("604", "BLUE HILL AVE", "02121") == ("100", "200")
     finally:
         sam_index._index = None
+
+
+def _range_snapshot(path: Path) -> None:
+    _write_csv(
+        path,
+        [
+            _row(
+                SAM_ADDRESS_ID="300",
+                BUILDING_ID="400",
+                STREET_NUMBER="1463-1467",
+                FULL_STREET_NAME="Dorchester Ave",
+                ZIP_CODE="02122",
+                IS_RANGE="1",
+                RANGE_FROM="1463",
+                RANGE_TO="1467",
+            ),
+            _row(
+                SAM_ADDRESS_ID="301",
+                BUILDING_ID="401",
+                STREET_NUMBER="1463",
+                FULL_STREET_NAME="Dorchester Ave",
+                ZIP_CODE="02122",
+                IS_RANGE="0",
+            ),
+        ],
+    )
+
+
+def test_db_index_matches_csv_index(tmp_path):
+    csv_path = tmp_path / "sam.csv"
+    db_path = tmp_path / "sam.sqlite"
+    _range_snapshot(csv_path)
+    assert build_db(csv_path, db_path) == 2
+    expected = _build_index(csv_path)
+    db_index = _open_db(db_path, csv_path)
+    assert db_index is not None
+    assert len(db_index) == len(expected)
+    for key, value in expected.items():
+        assert db_index.get(key) == value
+    assert db_index.get(("1", "NOWHERE ST", "00000"), (None, None)) == (None, None)
+
+
+def test_db_index_rejected_when_snapshot_changes(tmp_path):
+    csv_path = tmp_path / "sam.csv"
+    db_path = tmp_path / "sam.sqlite"
+    _range_snapshot(csv_path)
+    build_db(csv_path, db_path)
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("9,9,9,B St,02127,0,,\n")
+    assert _open_db(db_path, csv_path) is None
+
+
+def test_db_index_rejected_when_an_edit_keeps_the_size(tmp_path):
+    csv_path = tmp_path / "sam.csv"
+    db_path = tmp_path / "sam.sqlite"
+    _range_snapshot(csv_path)
+    build_db(csv_path, db_path)
+    text = csv_path.read_text(encoding="utf-8")
+    csv_path.write_text(text.replace("300,400", "399,499"), encoding="utf-8")
+    assert _open_db(db_path, csv_path) is None
+
+
+def test_missing_db_index_falls_back(tmp_path):
+    assert _open_db(tmp_path / "none.sqlite", tmp_path / "none.csv") is None
+
+
+def test_update_db_matches_a_full_rebuild(tmp_path):
+    csv_path = tmp_path / "sam.csv"
+    db_path = tmp_path / "sam.sqlite"
+    _range_snapshot(csv_path)
+    build_db(csv_path, db_path)
+
+    # Row 301 moves to another street and a new address is added
+    with open(csv_path, encoding="utf-8") as f:
+        text = f.read().replace("301,401,1463,Dorchester Ave", "301,401,1463,Adams St")
+    csv_path.write_text(text + "302,402,12,Adams St,02122,0,,\n", encoding="utf-8")
+    streets = {("DORCHESTER AVE", "02122"), ("ADAMS ST", "02122")}
+    assert update_db(streets, csv_path, db_path) == 4
+
+    rebuilt = tmp_path / "rebuilt.sqlite"
+    build_db(csv_path, rebuilt)
+    db_index = _open_db(db_path, csv_path)
+    assert db_index is not None
+    assert db_index.meta() == _open_db(rebuilt, csv_path).meta()
+    assert db_index.get(("1463", "ADAMS ST", "02122")) == ("301", "401")
+    assert db_index.get(("1463", "DORCHESTER AVE", "02122")) == ("300", "400")
+    assert db_index.streets() == [("DORCHESTER AVE", "02122"), ("ADAMS ST", "02122")]
+
+
+def test_workers_use_the_checked_db_without_hashing(tmp_path, monkeypatch):
+    csv_path = tmp_path / "sam.csv"
+    db_path = tmp_path / "sam.sqlite"
+    _range_snapshot(csv_path)
+    build_db(csv_path, db_path)
+
+    def no_hashing(path):
+        raise AssertionError("the snapshot was hashed again")
+
+    monkeypatch.setattr(sam_index, "sha256_file", no_hashing)
+    try:
+        sam_index.use_checked_db(db_path)
+        assert sam_index.checked_db_path() == db_path
+        index = sam_index.get_index()
+        assert isinstance(index, sam_index.SamDbIndex)
+        assert index.get(("1463", "DORCHESTER AVE", "02122")) == ("300", "400")
+    finally:
+        sam_index._index = None
+        sam_index._db, sam_index._db_checked = None, False
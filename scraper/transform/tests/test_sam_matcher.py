@@ -0,0 +1,101 @@
+"""Tests for app.pipeline.extraction.sam_matcher."""
+
+from app.pipeline.extraction import sam_index, sam_matcher
+from app.pipeline.extraction.sam_matcher import (
+    CONFIDENCE_EXACT,
+    CONFIDENCE_RANGE,
+    AddressMatcher,
+    match,
+)
+
+RANGES = [
+    # 1463-1467: odd side only
+    ("DORCHESTER AVE", "02122", 1463, 1467, "300", "400"),
+    # 10-15: mixed parity covers both sides
+    ("A ST", "02127", 10, 15, "500", "600"),
+    ("A ST", "02127", 12, 12, "501", "601"),
+]
+STREETS = [
+    ("DORCHESTER AVE", "02122"),
+    ("BLUE HILL AVE", "02121"),
+    ("A ST", "02127"),
+]
+
+
+def test_in_range_respects_parity():
+    matcher = AddressMatcher(RANGES, STREETS)
+    assert matcher.in_range(1465, "DORCHESTER AVE", "02122") == ("300", "400")
+    assert matcher.in_range(1464, "DORCHESTER AVE", "02122") is None
+    assert matcher.in_range(1469, "DORCHESTER AVE", "02122") is None
+    assert matcher.in_range(11, "A ST", "02127") == ("500", "600")
+
+
+def test_in_range_prefers_earliest_snapshot_row():
+    matcher = AddressMatcher(RANGES, STREETS)
+    assert matcher.in_range(12, "A ST", "02127") == ("500", "600")
+
+
+def test_similar_streets_is_scoped_by_zip():
+    matcher = AddressMatcher(RANGES, STREETS)
+    assert [name for _, name in matcher.similar_streets("BLUE HILL", "02121")] == [
+        "BLUE HILL AVE"
+    ]
+    assert matcher.similar_streets("BLUE HILL", "02122") == []
+
+
+def test_match_exact_then_range_then_fuzzy():
+    sam_index._index = {
+        ("604", "BLUE HILL AVE", "02121"): ("100", "200"),
+    }
+    sam_matcher._matcher = AddressMatcher(RANGES, STREETS)
+    try:
+        assert match("604", "Blue Hill Ave", "02121") == (
+            "100",
+            "200",
+            CONFIDENCE_EXACT,
+        )
+        assert match("1465", "Dorchester Ave", "02122") == (
+            "300",
+            "400",
+            CONFIDENCE_RANGE,
+        )
+        sam_id, building_id, confidence = match("604", "Blue Hil Ave", "02121")
+        assert (sam_id, building_id) == ("100", "200")
+        assert 0.6 <= confidence < CONFIDENCE_EXACT
+        assert match("1", "Nowhere St", "02121") == (None, None, None)
+    finally:
+        sam_index._index = None
+        sam_matcher._matcher = None
+
+
+def test_db_index_feeds_the_matcher(tmp_path):
+    csv_path = tmp_path / "sam.csv"
+    db_path = tmp_path / "sam.sqlite"
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write(",".join(sam_index.SAM_FIELDS) + "\n")
+        f.write("300,400,1463-1467,Dorchester Ave,02122,1,1463,1467\n")
+    sam_index.build_db(csv_path, db_path)
+    db_index = sam_index._open_db(db_path, csv_path)
+    matcher = AddressMatcher(db_index.ranges(), db_index.streets())
+    assert matcher.in_range(1467, "DORCHESTER AVE", "02122") == ("300", "400")
+    assert matcher.similar_streets("DORCHESTER", "02122")
+
+
+def test_existing_street_is_not_swapped_for_another_suffix():
+    streets = [("WASHINGTON ST", "02119"), ("WASHINGTON AVE", "02119")]
+    sam_index._index = {("100", "WASHINGTON AVE", "02119"): ("700", "800")}
+    sam_matcher._matcher = AddressMatcher([], streets)
+    try:
+        assert match("100", "Washington St", "02119") == (None, None, None)
+    finally:
+        sam_index._index = None
+        sam_matcher._matcher = None
+
+
+def test_similar_streets_allows_typos_and_missing_suffixes_only():
+    matcher = AddressMatcher([], [("WASHINGTON AVE", "02119")])
+    assert matcher.similar_streets("WASHINGTON ST", "02119") == []
+    for name in ["WASHINGTON", "WASHINGTN AVE", "WASHINGTON AV"]:
+        assert [n for _, n in matcher.similar_streets(name, "02119")] == [
+            "WASHINGTON AVE"
+        ]
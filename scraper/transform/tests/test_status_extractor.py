@@ -0,0 +1,35 @@
+"""Tests for app.pipeline.extraction.status.StatusExtractor."""
+
+from app.pipeline.extraction.context import ExtractionContext
+from app.pipeline.extraction.status import StatusExtractor
+
+
+def _run(lines):
+    ctx = ExtractionContext(lines=lines, data={})
+    StatusExtractor().run(ctx)
+    return ctx.data
+
+
+def test_last_matching_line_wins_and_is_normalized():
+    data = _run(["1. Some Bar LLC", "Granted", "Deferred to the next hearing"])
+    assert data == {
+        "status_detail": "Deferred to the next hearing",
+        "status": "deferred",
+    }
+
+
+def test_status_priority_follows_the_map_not_the_line_order():
+    assert _run(["Rejected; previously Granted"])["status"] == "granted"
+    assert _run(["RE-SCHEDULED"])["status"] == "rescheduled"
+
+
+def test_keywords_must_be_whole_words():
+    assert _run(["Deferral requested", "Undeferred"]) == {}
+
+
+def test_keyword_without_normalized_status_only_sets_detail():
+    assert _run(["No Violation"]) == {"status_detail": "No Violation"}
+
+
+def test_only_the_last_seven_lines_are_checked():
+    assert _run(["Granted"] + ["filler"] * 7) == {}
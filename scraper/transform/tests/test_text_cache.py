@@ -0,0 +1,40 @@
+"""Tests for app.state.text_cache.TextCache."""
+
+import pickle
+
+from app.state.text_cache import TextCache
+
+TEXT = "Transactional Hearing\n1. Some Venue, LLC\nLicense #: LB-123456\n" * 50
+
+
+def test_miss_then_hit_round_trips_text(tmp_path):
+    cache = TextCache(tmp_path / "text.sqlite")
+    assert cache.get("abc") is None
+    cache.put("abc", TEXT)
+    assert cache.get("abc") == TEXT
+
+
+def test_entries_persist_across_instances(tmp_path):
+    TextCache(tmp_path / "text.sqlite").put("abc", TEXT)
+    assert TextCache(tmp_path / "text.sqlite").get("abc") == TEXT
+
+
+def test_rebuild_ignores_entries(tmp_path):
+    TextCache(tmp_path / "text.sqlite").put("abc", TEXT)
+    assert TextCache(tmp_path / "text.sqlite", rebuild=True).get("abc") is None
+
+
+def test_prune_drops_other_fingerprints(tmp_path):
+    cache = TextCache(tmp_path / "text.sqlite")
+    cache.put("abc", TEXT)
+    cache.fingerprint = "0" * 16  # simulate an extractor change
+    cache.put("abc", "new text")
+    assert cache.prune() == 1
+    assert cache.get("abc") == "new text"
+
+
+def test_picklable_for_worker_processes(tmp_path):
+    cache = TextCache(tmp_path / "text.sqlite")
+    cache.put("abc", TEXT)
+    clone = pickle.loads(pickle.dumps(cache))
+    assert clone.get("abc") == TEXT
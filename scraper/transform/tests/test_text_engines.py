@@ -0,0 +1,82 @@
+"""Tests for app.pipeline.text_engines."""
+
+import fitz  # PyMuPDF
+import pytest
+
+from app.pipeline.pipeline import run_pipeline
+from app.pipeline.text_engines import (
+    DEFAULT_TEXT_ENGINE,
+    available_text_engines,
+    engine_fingerprint,
+    get_text_engine,
+)
+from app.state.text_cache import TextCache
+
+PAGES = [
+    ["Transactional Hearing", "1. Some Venue, LLC", "License #: LB-123456"],
+    ["Old & New Business", "Nothing else"],
+]
+
+
+def _write_pdf(path, pages):
+    doc = fitz.open()
+    for lines in pages:
+        page = doc.new_page()
+        for row, line in enumerate(lines):
+            page.insert_text((36, 36 + row * 12), line, fontsize=9)
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError, match="Unknown text engine"):
+        get_text_engine("ocr")
+
+
+def test_pymupdf_engines_are_always_available():
+    assert DEFAULT_TEXT_ENGINE in available_text_engines()
+    assert "pymupdf-blocks" in available_text_engines()
+
+
+@pytest.mark.parametrize("name", ["pymupdf-fast", "pymupdf-blocks"])
+def test_engine_matches_the_default_page_text(tmp_path, name):
+    pdf = _write_pdf(tmp_path / "voting_minutes_2024-01-04.pdf", PAGES)
+
+    expected = list(get_text_engine(DEFAULT_TEXT_ENGINE).page_texts(pdf))
+
+    assert list(get_text_engine(name).page_texts(pdf)) == expected
+
+
+def test_words_engine_yields_each_line(tmp_path):
+    pdf = _write_pdf(tmp_path / "voting_minutes_2024-01-04.pdf", PAGES)
+
+    pages = list(get_text_engine("pymupdf-words").page_texts(pdf))
+
+    assert [page.splitlines() for page in pages] == PAGES
+
+
+def test_pdfium_yields_each_line(tmp_path):
+    pytest.importorskip("pypdfium2")
+    pdf = _write_pdf(tmp_path / "voting_minutes_2024-01-04.pdf", PAGES)
+
+    pages = list(get_text_engine("pdfium").page_texts(pdf))
+
+    assert [page.split() for page in pages] == [
+        " ".join(lines).split() for lines in PAGES
+    ]
+
+
+def test_engine_is_part_of_the_cache_fingerprint(tmp_path):
+    default = TextCache(tmp_path / "text.sqlite")
+    blocks = TextCache(tmp_path / "text.sqlite", text_engine="pymupdf-blocks")
+    default.put("abc", "default text")
+
+    assert engine_fingerprint("pymupdf") != engine_fingerprint("pymupdf-blocks")
+    assert blocks.get("abc") is None
+
+
+def test_pipeline_runs_with_another_engine(tmp_path):
+    pdf = _write_pdf(tmp_path / "voting_minutes_2024-01-04.pdf", PAGES)
+
+    assert run_pipeline(pdf, text_engine="pymupdf-blocks") == run_pipeline(pdf)
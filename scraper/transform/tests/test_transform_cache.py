@@ -0,0 +1,67 @@
+"""Tests for app.state.transform_cache.TransformCache."""
+
+from app.pipeline import pipeline
+from app.state.transform_cache import TransformCache
+from app.utils.hashing import sha256_file
+
+PDF = "/some/dir/voting_minutes_2025-10-01.pdf"
+RECORDS = [{"license_number": "LB-607777", "business_name": "Café"}]
+
+
+def test_miss_then_hit(tmp_path):
+    cache = TransformCache(tmp_path)
+    assert cache.get(PDF, "abc") is None
+    cache.put(PDF, "abc", RECORDS)
+    assert cache.get(PDF, "abc") == RECORDS
+
+
+def test_keyed_by_hash_and_file_name(tmp_path):
+    cache = TransformCache(tmp_path)
+    cache.put(PDF, "abc", RECORDS)
+    # Same content under another name runs different plugins / file_name.
+    assert cache.get("/x/voting_minutes_2025-10-02.pdf", "abc") is None
+    assert cache.get(PDF, "def") is None
+
+
+def test_empty_result_is_cached(tmp_path):
+    cache = TransformCache(tmp_path)
+    cache.put(PDF, "abc", [])
+    assert cache.get(PDF, "abc") == []
+
+
+def test_rebuild_ignores_entries_but_still_writes(tmp_path):
+    TransformCache(tmp_path).put(PDF, "abc", RECORDS)
+    rebuild = TransformCache(tmp_path, rebuild=True)
+    assert rebuild.get(PDF, "abc") is None
+    rebuild.put(PDF, "abc", [])
+    assert TransformCache(tmp_path).get(PDF, "abc") == []
+
+
+def test_prune_removes_other_fingerprints(tmp_path):
+    stale = tmp_path / "0000000000000000"
+    stale.mkdir()
+    (stale / "old.json").write_text("[]")
+    cache = TransformCache(tmp_path)
+    cache.put(PDF, "abc", RECORDS)
+    assert cache.prune() == 1
+    assert not stale.exists()
+    assert cache.get(PDF, "abc") == RECORDS
+
+
+def test_failed_runs_are_not_cached(tmp_path, monkeypatch):
+    pdf = tmp_path / "voting_minutes_2025-10-01.pdf"
+    pdf.write_bytes(b"not a pdf")
+    cache = TransformCache(tmp_path / "cache")
+    runs = []
+    run = pipeline.Pipeline.run
+
+    def counting_run(self):
+        runs.append(self)
+        return run(self)
+
+    monkeypatch.setattr(pipeline.Pipeline, "run", counting_run)
+
+    assert pipeline.run_pipeline(str(pdf), cache=cache) == []
+    assert cache.get(str(pdf), sha256_file(pdf)) is None
+    assert pipeline.run_pipeline(str(pdf), cache=cache) == []
+    assert len(runs) == 2
@@ -0,0 +1,184 @@
+"""Unit tests for merge_licenses.py."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+import merge_licenses
+
+
+def _applicant(ln: str, date: str, status: str = "Deferred", **extra) -> dict:
+    return {
+        "license_number": ln,
+        "business_name": f"Business {ln}",
+        "dba_name": None,
+        "address": "1 Main St, Boston, MA 02118",
+        "zipcode": "02118",
+        "entity_number": "1",
+        "alcohol_type": "all alcoholic beverages",
+        "details": "Has applied for a Common Victualler 7 Day All Alcoholic "
+        "Beverages License",
+        "status": status,
+        "minutes_date": date,
+        "file_name": f"voting_minutes_{date}.pdf",
+        **extra,
+    }
+
+
+def _board_voted(ln: str, date: str) -> dict:
+    return _applicant(
+        ln, date, "Granted", details="The board voted to approve the license"
+    )
+
+
+@pytest.fixture
+def files(tmp_path: Path) -> dict:
+    paths = {
+        "input": tmp_path / "transform.json",
+        "licenses": tmp_path / "licenses.json",
+        "last": tmp_path / "last_processed_date.json",
+    }
+    paths["last"].write_text(json.dumps({"date": "2025-03-01T00:00:00.000Z"}))
+    return paths
+
+
+def _write_input(files: dict, records: list[dict]) -> None:
+    files["input"].write_text(json.dumps(records), encoding="utf-8")
+
+
+def _merge_full(files: dict, records: list[dict]) -> int:
+    _write_input(files, records)
+    return merge_licenses.merge_licenses(str(files["input"]), str(files["licenses"]))
+
+
+def _merge_incremental(files: dict, records: list[dict]) -> int:
+    _write_input(files, records)
+    return merge_licenses.merge_licenses_incremental(
+        str(files["input"]), str(files["licenses"]), str(files["last"])
+    )
+
+
+def _licenses(files: dict) -> list[dict]:
+    return json.loads(files["licenses"].read_text(encoding="utf-8"))
+
+
+class DescribeMergeLicenses:
+    """Tests for merge_licenses.merge_licenses."""
+
+    def it_appends_new_applicants_with_sequential_indexes(self, files: dict) -> None:
+        count = _merge_full(
+            files, [_applicant("LB-1", "2025-01-02"), _applicant("LB-2", "2025-01-02")]
+        )
+
+        assert count == 2
+        assert [(r["index"], r["license_number"]) for r in _licenses(files)] == [
+            (1, "LB-1"),
+            (2, "LB-2"),
+        ]
+
+    def and_it_grants_a_deferred_license_when_the_board_votes(
+        self, files: dict
+    ) -> None:
+        _merge_full(files, [_applicant("LB-1", "2025-01-02")])
+
+        count = _merge_full(files, [_board_voted("LB-1", "2025-02-06")])
+
+        record = _licenses(files)[0]
+        assert count == 1
+        assert record["status"] == "Granted"
+        assert record["granted_date"] == "2025-02-06"
+        assert record["application_expiration_date"] is None
+
+    def and_it_writes_the_license_index_next_to_the_file(self, files: dict) -> None:
+        _merge_full(files, [_applicant("LB-1", "2025-01-02")])
+
+        index = merge_licenses.load_index(str(files["licenses"]))
+
+        assert index is not None
+        assert index["count"] == 1
+        assert index["licenses"]["LB-1"]["status"] == "Deferred"
+
+    def but_it_leaves_no_temp_files_behind(self, files: dict) -> None:
+        _merge_full(files, [_applicant("LB-1", "2025-01-02")])
+
+        assert not list(files["licenses"].parent.glob("*.tmp"))
+
+
+class DescribeMergeLicensesIncremental:
+    """Tests for merge_licenses.merge_licenses_incremental."""
+
+    def it_only_merges_records_from_pdfs_after_the_last_processed_date(
+        self, files: dict
+    ) -> None:
+        _merge_full(files, [_applicant("LB-1", "2025-01-02")])
+
+        count = _merge_incremental(
+            files,
+            [
+                _applicant("LB-2", "2025-02-27"),
+                _applicant("LB-3", "2025-03-01"),
+                _applicant("LB-4", "2025-03-06"),
+            ],
+        )
+
+        assert count == 1
+        assert [r["license_number"] for r in _licenses(files)] == ["LB-1", "LB-4"]
+
+    def and_it_appends_exactly_what_a_full_merge_would_write(
+        self, files: dict, tmp_path: Path
+    ) -> None:
+        _merge_full(files, [_applicant("LB-1", "2025-01-02")])
+        new = [_applicant("LB-2", "2025-03-06"), _applicant("LB-3", "2025-03-06")]
+        full = {**files, "licenses": tmp_path / "full.json"}
+        full["licenses"].write_bytes(files["licenses"].read_bytes())
+
+        _merge_incremental(files, new)
+        _merge_full(full, new)
+
+        assert files["licenses"].read_text() == full["licenses"].read_text()
+
+    def and_it_grants_tracked_licenses_found_in_the_index(self, files: dict) -> None:
+        _merge_full(files, [_applicant("LB-1", "2025-01-02")])
+
+        count = _merge_incremental(files, [_board_voted("LB-1", "2025-03-06")])
+
+        assert count == 1
+        assert _licenses(files)[0]["status"] == "Granted"
+        index = merge_licenses.load_index(str(files["licenses"]))
+        assert index is not None
+        assert index["licenses"]["LB-1"]["status"] == "Granted"
+
+    def and_it_rebuilds_a_stale_index(self, files: dict) -> None:
+        _merge_full(files, [_applicant("LB-1", "2025-01-02")])
+        records = _licenses(files)
+        records.append({**records[0], "index": 2, "license_number": "LB-9"})
+        files["licenses"].write_text(json.dumps(records, indent=4))
+
+        _merge_incremental(files, [_applicant("LB-9", "2025-03-06")])
+
+        assert merge_licenses.load_index(str(files["licenses"])) is None
+        assert len(_licenses(files)) == 2
+
+    def but_it_does_not_touch_licenses_when_nothing_is_new(self, files: dict) -> None:
+        _merge_full(files, [_applicant("LB-1", "2025-01-02")])
+        before = files["licenses"].stat().st_mtime_ns
+
+        count = _merge_incremental(files, [_applicant("LB-2", "2025-02-01")])
+
+        assert count == 0
+        assert files["licenses"].stat().st_mtime_ns == before
+
+
+class DescribeReadLastProcessedDate:
+    """Tests for merge_licenses.read_last_processed_date."""
+
+    def it_returns_the_date_part_of_the_timestamp(self, files: dict) -> None:
+        result = merge_licenses.read_last_processed_date(str(files["last"]))
+
+        assert result == "2025-03-01"
+
+    def but_it_returns_none_for_a_missing_file(self, tmp_path: Path) -> None:
+        result = merge_licenses.read_last_processed_date(str(tmp_path / "none.json"))
+
+        assert result is None
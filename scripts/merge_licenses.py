@@ -4,12 +4,23 @@ Merges transform pipeline JSON output into licenses.json.
 Maps from the scraper/transform pipeline's output format to the licenses.json
 schema, filters to applicant entries only, deduplicates by license_number,
 updates status on existing records, and appends new ones.
+
+With --incremental, only records from PDFs newer than the date in
+last_processed_date.json are merged. A persistent license-number index next
+to licenses.json (licenses.index.json) answers "is this license tracked, and
+with what status?", so new records are appended to the file without loading
+it; licenses.json is only parsed and rewritten when a tracked license is
+granted. The index is stamped with the size and SHA-256 of the licenses.json
+it describes (mtimes don't survive a checkout) and is committed with it.
 """
 
 import argparse
+import hashlib
 import json
 import os
+import re
 import sys
+import tempfile
 from datetime import date
 from pathlib import Path
 
@@ -19,6 +30,11 @@ from dotenv import load_dotenv
 load_dotenv()
 
 LICENSES_JSON = os.getenv("LICENSES_JSON")
+LAST_PROCESSED_DATE_JSON = os.getenv("LAST_PROCESSED_DATE_JSON")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+INDEX_FORMAT_VERSION = 2
+PDF_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
 
 ELIGIBLE_ZIPCODES = {
     "02118",
@@ -79,34 +95,55 @@ def dedup_existing(existing: list) -> tuple:
     return deduped, removed
 
 
-def merge_licenses(transform_json_path: str, licenses_json_path: str) -> int:
-    with open(transform_json_path, encoding="utf-8") as f:
-        new_records: list[dict] = json.load(f)
+def pdf_date(record: dict) -> str:
+    """Meeting date of the PDF a transform record came from: the date in its
+    file name (voting_minutes_YYYY-MM-DD.pdf), else its minutes_date."""
+    match = PDF_DATE_RE.search(record.get("file_name") or "")
+    return match.group() if match else record.get("minutes_date") or ""
 
-    existing: list[dict] = []
-    if os.path.exists(licenses_json_path):
-        with open(licenses_json_path, encoding="utf-8") as f:
-            content = f.read().strip()
-            if content:
-                existing = json.loads(content)
 
-    # Dedup existing records by license_number (keep first occurrence)
-    existing, dupes_removed = dedup_existing(existing)
-    if dupes_removed:
-        print(f"Removed {dupes_removed} duplicate records from existing data")
+def read_last_processed_date(path: str) -> str | None:
+    """The YYYY-MM-DD date in last_processed_date.json, or None."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            value = json.load(f).get("date")
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return None
+    return value[:10] if isinstance(value, str) and value else None
 
-    # `records` is the single working list; entries added immediately so board-voted
-    # records processed later can find and update them.
-    records = existing
 
-    # Build lookup: license_number -> index into `records`
-    records_by_license: dict = {
-        r["license_number"]: i for i, r in enumerate(records) if r.get("license_number")
-    }
+def plan_merge(new_records: list[dict], tracked: dict) -> tuple:
+    """Decide what merging `new_records` changes.
 
-    added = 0
-    updated = 0
+    `tracked` maps license_number -> {"status", "business_name"} for the
+    records already in licenses.json; it is updated as licenses are granted.
+    Returns (new entries, grants, skipped, updated), where grants maps an
+    already tracked license_number to the (granted_date, granted_file) it
+    moves to Granted with. Entries added by this merge are granted in place.
+    """
+    entries: list[dict] = []
+    added_by_license: dict = {}  # license_number -> entry added in this merge
+    grants: dict = {}
     skipped = 0
+    updated = 0
+
+    def grant(ln: str, record: dict) -> None:
+        nonlocal updated
+        entry = added_by_license.get(ln)
+        old_status = entry["status"] if entry else tracked[ln]["status"]
+        if old_status == "Deferred" and map_status(record.get("status")) == "Granted":
+            if entry:
+                entry["status"] = "Granted"
+                entry["application_expiration_date"] = None
+                entry["granted_date"] = record.get("minutes_date")
+                entry["granted_file"] = record.get("file_name")
+                name = entry["business_name"]
+            else:
+                tracked[ln]["status"] = "Granted"
+                grants[ln] = (record.get("minutes_date"), record.get("file_name"))
+                name = tracked[ln]["business_name"]
+            print(f"Updated {ln} ({name}): Deferred -> Granted")
+            updated += 1
 
     for record in new_records:
         raw_alcohol_type = record.get("alcohol_type")
@@ -145,44 +182,23 @@ def merge_licenses(transform_json_path: str, licenses_json_path: str) -> int:
 
         ln = record.get("license_number") or ""
         new_status = map_status(record.get("status"))
+        is_known = bool(ln) and (ln in added_by_license or ln in tracked)
 
         if is_board_voted:
             # Board-voted records only update existing entries (Deferred -> Granted).
             # If the license isn't already tracked, skip — we missed the initial application.
-            if ln and ln in records_by_license:
-                idx = records_by_license[ln]
-                old_status = records[idx]["status"]
-                if old_status == "Deferred" and new_status == "Granted":
-                    records[idx]["status"] = "Granted"
-                    records[idx]["application_expiration_date"] = None
-                    records[idx]["granted_date"] = record.get("minutes_date")
-                    records[idx]["granted_file"] = record.get("file_name")
-                    print(
-                        f"Updated {ln} ({records[idx]['business_name']}): "
-                        f"Deferred -> Granted"
-                    )
-                    updated += 1
+            if is_known:
+                grant(ln, record)
             else:
                 skipped += 1
         elif "applied" not in details.lower():
             # Only include new applications, not modifications to existing licenses.
             # New applicants have "applied" in their details; modifications say "Holder of ... petitioned".
             skipped += 1
-        elif ln and ln in records_by_license:
+        elif is_known:
             # Only advance status forward (Deferred -> Granted), never backwards.
             # A Granted record seen again as Deferred in an older PDF should not be reverted.
-            idx = records_by_license[ln]
-            old_status = records[idx]["status"]
-            if old_status == "Deferred" and new_status == "Granted":
-                records[idx]["status"] = "Granted"
-                records[idx]["application_expiration_date"] = None
-                records[idx]["granted_date"] = record.get("minutes_date")
-                records[idx]["granted_file"] = record.get("file_name")
-                print(
-                    f"Updated {ln} ({records[idx]['business_name']}): "
-                    f"Deferred -> Granted"
-                )
-                updated += 1
+            grant(ln, record)
         else:
             minutes_date = record.get("minutes_date")
             file_name = record.get("file_name") or ""
@@ -191,7 +207,7 @@ def merge_licenses(transform_json_path: str, licenses_json_path: str) -> int:
             # application hearing date/file.
             already_granted = new_status == "Granted"
             entry = {
-                "index": None,  # assigned below
+                "index": None,  # assigned when written
                 "entity_number": record.get("entity_number") or "",
                 "business_name": record.get("business_name") or "",
                 "dba_name": record.get("dba_name"),
@@ -213,25 +229,209 @@ def merge_licenses(transform_json_path: str, licenses_json_path: str) -> int:
                     f"WARNING: No license_number for '{record.get('business_name')}' "
                     "— appending without match key"
                 )
-            # Add immediately and track index so later board-voted records can find this entry
+            # Track it so later board-voted records can find this entry
             if ln:
-                records_by_license[ln] = len(records)
-            records.append(entry)
-            added += 1
+                added_by_license[ln] = entry
+            entries.append(entry)
+
+    return entries, grants, skipped, updated
+
+
+def apply_grants(records: list[dict], grants: dict) -> None:
+    for record in records:
+        granted = grants.get(record.get("license_number"))
+        if granted:
+            record["status"] = "Granted"
+            record["application_expiration_date"] = None
+            record["granted_date"], record["granted_file"] = granted
+
+
+def load_licenses(licenses_json_path: str) -> list[dict]:
+    if not os.path.exists(licenses_json_path):
+        return []
+    with open(licenses_json_path, encoding="utf-8") as f:
+        content = f.read().strip()
+    return json.loads(content) if content else []
+
+
+def _write_atomic(path: str, write) -> None:
+    """Call write(f) on a temp file next to `path`, then rename it over
+    `path`, so a failed run never leaves a truncated file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+        # mkstemp files are owner-only; keep the data files world-readable
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_licenses(licenses_json_path: str, records: list[dict]) -> None:
+    _write_atomic(licenses_json_path, lambda f: json.dump(records, f, indent=4))
+
+
+def append_licenses(licenses_json_path: str, entries: list[dict]) -> bool:
+    """Append entries to a licenses.json written by write_licenses without
+    parsing it: the output equals json.dump of the extended list. Returns
+    False (nothing written) if the file isn't in that layout."""
+    with open(licenses_json_path, encoding="utf-8") as f:
+        content = f.read()
+    if not content.endswith("\n    }\n]"):
+        return False
+    items = json.dumps(entries, indent=4)[1:-2]  # "\n    {...},\n    {...}"
+    _write_atomic(
+        licenses_json_path, lambda f: f.write(content[:-2] + "," + items + "\n]")
+    )
+    return True
+
+
+def index_path(licenses_json_path: str) -> Path:
+    return Path(licenses_json_path).with_suffix(".index.json")
+
+
+def _source_stamp(licenses_json_path: str) -> dict:
+    """Size and SHA-256 of licenses.json; hashing is far cheaper than parsing."""
+    h = hashlib.sha256()
+    with open(licenses_json_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    return {"size": os.path.getsize(licenses_json_path), "sha256": h.hexdigest()}
+
+
+def build_index(records: list[dict]) -> dict:
+    """license_number -> {"status", "business_name"}, first occurrence wins,
+    plus the number of records (the last assigned index)."""
+    licenses: dict = {}
+    for record in records:
+        ln = record.get("license_number")
+        if ln and ln not in licenses:
+            licenses[ln] = {
+                "status": record.get("status"),
+                "business_name": record.get("business_name"),
+            }
+    return {"count": len(records), "licenses": licenses}
+
+
+def load_index(licenses_json_path: str) -> dict | None:
+    """The persistent index, if it was written for the current licenses.json."""
+    try:
+        with open(index_path(licenses_json_path), encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_FORMAT_VERSION and index.get(
+            "source"
+        ) == _source_stamp(licenses_json_path):
+            return index
+    except (OSError, json.JSONDecodeError, AttributeError):
+        pass
+    return None
+
+
+def save_index(licenses_json_path: str, index: dict) -> None:
+    index = {
+        **index,
+        "version": INDEX_FORMAT_VERSION,
+        "source": _source_stamp(licenses_json_path),
+    }
+    _write_atomic(
+        str(index_path(licenses_json_path)), lambda f: json.dump(index, f, indent=2)
+    )
+
+
+def merge_licenses(transform_json_path: str, licenses_json_path: str) -> int:
+    with open(transform_json_path, encoding="utf-8") as f:
+        new_records: list[dict] = json.load(f)
+
+    existing = load_licenses(licenses_json_path)
+
+    # Dedup existing records by license_number (keep first occurrence)
+    existing, dupes_removed = dedup_existing(existing)
+    if dupes_removed:
+        print(f"Removed {dupes_removed} duplicate records from existing data")
+
+    index = build_index(existing)
+    entries, grants, skipped, updated = plan_merge(new_records, index["licenses"])
+
+    records = existing
+    apply_grants(records, grants)
+    records.extend(entries)
 
     # Re-assign sequential indexes across the full list
     for i, record in enumerate(records, start=1):
         record["index"] = i
 
-    with open(licenses_json_path, "w", encoding="utf-8") as f:
-        json.dump(records, f, indent=4)
+    write_licenses(licenses_json_path, records)
+    save_index(licenses_json_path, build_index(records))
 
+    added = len(entries)
     print(f"Skipped {skipped} records (non-applicant or wrong alcohol type)")
     print(f"Updated {updated} existing records")
     print(f"Added {added} new licenses. Total: {len(records)}")
     return added + updated
 
 
+def merge_licenses_incremental(
+    transform_json_path: str, licenses_json_path: str, last_processed_path: str
+) -> int:
+    """Merge only the records from PDFs newer than the last processed date.
+
+    New licenses are appended to licenses.json with the next indexes; the
+    file is only parsed and rewritten when an already tracked license is
+    granted. Falls back to a full merge if licenses.json doesn't exist yet.
+    """
+    if not os.path.exists(licenses_json_path):
+        return merge_licenses(transform_json_path, licenses_json_path)
+
+    with open(transform_json_path, encoding="utf-8") as f:
+        new_records: list[dict] = json.load(f)
+    since = read_last_processed_date(last_processed_path)
+    if since:
+        total = len(new_records)
+        new_records = [r for r in new_records if pdf_date(r) > since]
+        print(f"Merging {len(new_records)} of {total} records from PDFs after {since}")
+    if not new_records:
+        print("Added 0 new licenses")
+        return 0
+
+    index = load_index(licenses_json_path) or build_index(
+        load_licenses(licenses_json_path)
+    )
+    entries, grants, skipped, updated = plan_merge(new_records, index["licenses"])
+
+    for i, entry in enumerate(entries, start=index["count"] + 1):
+        entry["index"] = i
+    if grants or (entries and not append_licenses(licenses_json_path, entries)):
+        records, _ = dedup_existing(load_licenses(licenses_json_path))
+        apply_grants(records, grants)
+        records.extend(entries)
+        for i, record in enumerate(records, start=1):
+            record["index"] = i
+        write_licenses(licenses_json_path, records)
+        index = build_index(records)
+    else:
+        index["count"] += len(entries)
+        for entry in entries:
+            if entry["license_number"]:
+                index["licenses"].setdefault(
+                    entry["license_number"],
+                    {
+                        "status": entry["status"],
+                        "business_name": entry["business_name"],
+                    },
+                )
+    if entries or grants:
+        save_index(licenses_json_path, index)
+
+    added = len(entries)
+    print(f"Skipped {skipped} records (non-applicant or wrong alcohol type)")
+    print(f"Updated {updated} existing records")
+    print(f"Added {added} new licenses. Total: {index['count']}")
+    return added + updated
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Merge transform pipeline JSON output into licenses.json"
@@ -243,20 +443,45 @@ def main() -> None:
         "--licenses",
         help="Path to licenses.json (defaults to LICENSES_JSON env var relative to repo root)",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only merge records from PDFs newer than the last processed date",
+    )
+    parser.add_argument(
+        "--last-processed",
+        help="Path to last_processed_date.json (defaults to "
+        "LAST_PROCESSED_DATE_JSON env var relative to repo root)",
+    )
     args = parser.parse_args()
 
     if args.licenses:
         licenses_path = args.licenses
     elif LICENSES_JSON:
         # Resolve relative to repo root (one level up from scripts/)
-        licenses_path = str(Path(__file__).resolve().parent.parent / LICENSES_JSON)
+        licenses_path = str(REPO_ROOT / LICENSES_JSON)
     else:
         print(
             "ERROR: No licenses path provided. Set LICENSES_JSON env var or use --licenses"
         )
         sys.exit(1)
 
-    count = merge_licenses(args.input, licenses_path)
+    if args.incremental:
+        if args.last_processed:
+            last_processed_path = args.last_processed
+        elif LAST_PROCESSED_DATE_JSON:
+            last_processed_path = str(REPO_ROOT / LAST_PROCESSED_DATE_JSON)
+        else:
+            print(
+                "ERROR: No last processed date path provided. Set "
+                "LAST_PROCESSED_DATE_JSON env var or use --last-processed"
+            )
+            sys.exit(1)
+        count = merge_licenses_incremental(
+            args.input, licenses_path, last_processed_path
+        )
+    else:
+        count = merge_licenses(args.input, licenses_path)
     if count == 0:
         print("WARNING: No records were added or updated")
 